@@ -0,0 +1,8 @@
+# batch.py
+
+import sys
+
+from wf_game_tracker.batch import main
+
+if __name__ == "__main__":
+    sys.exit(main())
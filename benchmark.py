@@ -0,0 +1,8 @@
+# benchmark.py
+
+import sys
+
+from wf_game_tracker.benchmark import main
+
+if __name__ == "__main__":
+    sys.exit(main())
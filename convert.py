@@ -0,0 +1,8 @@
+# convert.py
+
+import sys
+
+from wf_game_tracker.convert import main
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,7 +1,38 @@
 # run.py
 
+import argparse
+
+from wf_game_tracker.instrumentation import CAPTURE_MODES, DEFAULT_OUTPUT, PERF
 from wf_game_tracker.main_app import DeckTrackerApp
 
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="WF Game Tracker")
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="time load, merge, tab build, clicks, summaries and saves",
+    )
+    parser.add_argument(
+        "--profile-out",
+        default=DEFAULT_OUTPUT,
+        help="file the timings are written to on exit (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--capture",
+        metavar="OPERATION",
+        help="profile the first run of one operation, e.g. load or click",
+    )
+    parser.add_argument("--capture-mode", choices=CAPTURE_MODES, default="cprofile")
+    return parser.parse_args(argv)
+
+
 if __name__ == "__main__":
+    args = parse_args()
+    PERF.configure_from_env()
+    if args.profile or args.capture:
+        PERF.configure(
+            output=args.profile_out, capture=args.capture, mode=args.capture_mode
+        )
     app = DeckTrackerApp()
     app.mainloop()
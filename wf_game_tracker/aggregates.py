@@ -0,0 +1,158 @@
+# aggregates.py
+
+from wf_game_tracker.analytics import result_line
+from wf_game_tracker.archive import ArchiveDeck
+from wf_game_tracker.master_data import MASTER_TABLE, STAT_KEYS
+from wf_game_tracker.matchups import MatchupMatrix
+
+
+def _zero():
+    return dict.fromkeys(STAT_KEYS, 0)
+
+
+def _add(target, stats, sign=1):
+    for key in STAT_KEYS:
+        target[key] += sign * stats[key]
+
+
+def _record(name, stats):
+    """Leaderboard line: name, matches, wins, losses and win rate."""
+    wins = stats["off_wins"] + stats["def_wins"]
+    losses = stats["off_losses"] + stats["def_losses"]
+    return {"name": name, **result_line(wins, losses)}
+
+
+###############################################################################
+# Cross-deck aggregate cache
+#
+#   Totals per deck, per faction (across decks), per warlord (across decks)
+#   and overall, kept up to date by applying every counter change as it
+#   happens. Summaries and leaderboards read the cache instead of walking
+#   every deck, faction and warlord.
+#
+#   The first deck of a deck archive adds the whole archive at once, from
+#   sums over its counter section; its decks are then "unclaimed" until they
+#   are added themselves, which only records their deck totals. Whatever is
+#   still unclaimed after a rebuild (decks no longer in the session) is taken
+#   out again.
+#
+#   Results per opponent (deck vs faction or warlord) are kept alongside in a
+#   sparse MatchupMatrix, fed by the same add/remove/apply calls.
+###############################################################################
+class AggregateCache:
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self.totals = _zero()
+        self.deck_totals = {}  # id(deck) -> (deck, stats)
+        self.faction_totals = {}  # faction_name -> stats
+        self.warlord_totals = {}  # (faction_name, warlord_name) -> stats
+        # DeckArchive -> indexes of its decks counted but not added yet, or
+        # None if its layout differs from the MASTER_TABLE (decks are merged)
+        self.archives = {}
+        # Per-opponent results of every deck (sparse)
+        self.matchups = MatchupMatrix()
+
+    def rebuild(self, decks):
+        """Recompute everything from scratch (one pass over decks)."""
+        self.clear()
+        for deck in decks:
+            self.add_deck(deck)
+        for archive, unclaimed in self.archives.items():
+            for index in unclaimed or ():
+                self._add_deck(archive.deck(index), -1)
+            if unclaimed:
+                unclaimed.clear()
+
+    def _add_archive(self, archive):
+        if not archive.matches(MASTER_TABLE):
+            self.archives[archive] = None
+            return
+        for (faction_name, warlord_name), stats in archive.warlord_totals().items():
+            _add(
+                self.warlord_totals.setdefault((faction_name, warlord_name), _zero()),
+                stats,
+            )
+            _add(self.faction_totals.setdefault(faction_name, _zero()), stats)
+            _add(self.totals, stats)
+        self.archives[archive] = set(range(len(archive)))
+
+    def _add_deck(self, deck, sign):
+        deck_stats = _zero()
+        for faction_data in deck["factions"]:
+            faction_name = faction_data["faction_name"]
+            faction_stats = self.faction_totals.setdefault(faction_name, _zero())
+            for w in faction_data["warlords"]:
+                warlord_stats = self.warlord_totals.setdefault(
+                    (faction_name, w["warlord_name"]), _zero()
+                )
+                _add(warlord_stats, w, sign)
+                _add(faction_stats, w, sign)
+                _add(deck_stats, w)
+        _add(self.totals, deck_stats, sign)
+        return deck_stats
+
+    def add_deck(self, deck):
+        if isinstance(deck, ArchiveDeck):
+            self.matchups.add_deck(deck, lazy=not deck.decoded)
+            if deck.archive not in self.archives:
+                self._add_archive(deck.archive)
+            unclaimed = self.archives[deck.archive]
+            if unclaimed and deck.index in unclaimed:
+                unclaimed.discard(deck.index)
+                if not deck.decoded:
+                    stats = deck.archive.deck_totals(deck.index)
+                    self.deck_totals[id(deck)] = (deck, stats)
+                    return
+                # Changed since it was read: swap the archive's counters for its own
+                self._add_deck(deck.archive.deck(deck.index), -1)
+        else:
+            self.matchups.add_deck(deck)
+        self.deck_totals[id(deck)] = (deck, self._add_deck(deck, 1))
+
+    def remove_deck(self, deck):
+        if self.deck_totals.pop(id(deck), None) is not None:
+            self._add_deck(deck, -1)
+            self.matchups.remove_deck(deck)
+
+    def apply(self, deck, faction_name, warlord_name, key, delta):
+        """Account for one counter of deck changing by delta (O(1))."""
+        self.totals[key] += delta
+        self.deck_totals[id(deck)][1][key] += delta
+        self.faction_totals[faction_name][key] += delta
+        self.warlord_totals[(faction_name, warlord_name)][key] += delta
+        self.matchups.apply(deck, faction_name, warlord_name, key, delta)
+
+    def deck_stats(self, deck):
+        return self.deck_totals[id(deck)][1]
+
+    ###########################################################################
+    # Leaderboards
+    ###########################################################################
+    def leaderboard(self, kind, limit=10, min_matches=1):
+        """
+        Best entries by win rate (then matches played) across all decks.
+        kind is "deck", "faction" or "warlord"; warlords are named
+        "Warlord (Faction)".
+        """
+        if kind == "deck":
+            entries = [
+                _record(deck["deck_name"], stats)
+                for deck, stats in self.deck_totals.values()
+            ]
+        elif kind == "faction":
+            entries = [
+                _record(name, stats) for name, stats in self.faction_totals.items()
+            ]
+        elif kind == "warlord":
+            entries = [
+                _record(f"{warlord_name} ({faction_name})", stats)
+                for (faction_name, warlord_name), stats in self.warlord_totals.items()
+            ]
+        else:
+            raise ValueError(f"Unknown leaderboard kind: {kind}")
+
+        entries = [e for e in entries if e["matches"] >= min_matches]
+        entries.sort(key=lambda e: (-e["win_rate"], -e["matches"], e["name"]))
+        return entries[:limit]
@@ -0,0 +1,100 @@
+# analytics.py
+#
+# Matches, wins, losses and win rates computed from the deck data structures.
+# Pure Python with no tkinter import: the GUI calls into this module, and batch
+# jobs can use it on a headless server.
+
+from wf_game_tracker.master_data import STAT_KEYS
+
+
+def zero_totals():
+    return dict.fromkeys(STAT_KEYS, 0)
+
+
+def win_rate(wins, matches):
+    """Win rate in percent; 0.0 when no matches were played."""
+    return (100.0 * wins / matches) if matches > 0 else 0.0
+
+
+def result_line(wins, losses):
+    """matches / wins / losses / win_rate for a number of wins and losses."""
+    matches = wins + losses
+    return {
+        "matches": matches,
+        "wins": wins,
+        "losses": losses,
+        "win_rate": win_rate(wins, matches),
+    }
+
+
+def side_lines(totals):
+    """Going first (offense), going second (defense) and overall result lines."""
+    off_wins = totals["off_wins"]
+    off_losses = totals["off_losses"]
+    def_wins = totals["def_wins"]
+    def_losses = totals["def_losses"]
+    return {
+        "offense": result_line(off_wins, off_losses),
+        "defense": result_line(def_wins, def_losses),
+        "overall": result_line(off_wins + def_wins, off_losses + def_losses),
+    }
+
+
+def warlord_line(warlord):
+    """The four counters of a warlord plus matches, total wins/losses, win rate."""
+    line = {key: warlord[key] for key in STAT_KEYS}
+    overall = side_lines(warlord)["overall"]
+    line["matches"] = overall["matches"]
+    line["tot_wins"] = overall["wins"]
+    line["tot_losses"] = overall["losses"]
+    line["win_rate"] = overall["win_rate"]
+    return line
+
+
+def add_totals(target, counters):
+    for key in STAT_KEYS:
+        target[key] += counters[key]
+
+
+def deck_totals(deck):
+    """Sum every warlord counter of a deck."""
+    totals = zero_totals()
+    for faction_data in deck["factions"]:
+        for w in faction_data["warlords"]:
+            add_totals(totals, w)
+    return totals
+
+
+def faction_totals(deck):
+    """faction_name -> summed counters of that faction's warlords in deck."""
+    by_faction = {}
+    for faction_data in deck["factions"]:
+        totals = by_faction.setdefault(faction_data["faction_name"], zero_totals())
+        for w in faction_data["warlords"]:
+            add_totals(totals, w)
+    return by_faction
+
+
+###############################################################################
+# Aggregates over many decks
+#
+#   Sums whole array slices of a StatsStore (one C-level sum per column and
+#   slice); batch runs fill a store per file and aggregate it here. Returns
+#     {"global": totals, "decks": [totals, ...] (in deck order),
+#      "factions": {faction_name: totals},
+#      "warlords": {(faction_name, warlord_name): totals}}
+###############################################################################
+def aggregate_store(store):
+    """Totals overall, per deck, per faction and per warlord of a StatsStore."""
+    warlords = {
+        name: store.warlord_totals(ordinal) for ordinal, name in enumerate(store.names)
+    }
+    factions = {}
+    for (faction_name, _warlord_name), totals in warlords.items():
+        add_totals(factions.setdefault(faction_name, zero_totals()), totals)
+    return {
+        "global": store.totals(),
+        "decks": [store.deck_totals(i) for i in range(len(store))],
+        "factions": factions,
+        "warlords": warlords,
+    }
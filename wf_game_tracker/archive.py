@@ -0,0 +1,371 @@
+# archive.py
+
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from array import array
+from collections.abc import MutableMapping
+
+from wf_game_tracker.binary_format import (
+    BinaryFormatError,
+    pack_name_table,
+    read_name_table,
+)
+from wf_game_tracker.master_data import STAT_KEYS
+from wf_game_tracker.merge_engine import merge_deck
+from wf_game_tracker.stats_store import warlord_ordinals
+
+ARCHIVE_MAGIC = b"WFAR"
+ARCHIVE_VERSION = 1
+ARCHIVE_EXTENSIONS = (".wfa",)
+
+# magic, version, reserved, deck count, warlords per deck, and the offsets of
+# the deck index, the deck names and the counters
+_HEADER = struct.Struct("<4sHHIIQQQ")
+_STATS = len(STAT_KEYS)
+
+
+class ArchiveFormatError(BinaryFormatError):
+    """The file is not a (readable) deck archive."""
+
+
+###############################################################################
+# Deck archive
+#
+#   Random access for very large save files. Every deck uses the same layout:
+#   one int32 per counter of every warlord in the name table, so deck i's
+#   counters are a fixed-size row at a computed offset.
+#
+#     header    see _HEADER
+#     names     the name table (as in the binary format)
+#     index     u64 offsets of the deck names, deck count + 1 of them (the
+#               last one is the end of the names)
+#     names     the deck names, UTF-8, back to back
+#     counters  int32 rows, STAT_KEYS order one warlord after the other,
+#               starting at a multiple of 8
+#
+#   DeckArchive reads the file through mmap: opening it parses the header and
+#   name table only, a deck is decoded when it is asked for, and aggregates
+#   sum strided memoryviews of the counter section without copying it.
+#
+#   Writing decks that are still undecoded ArchiveDecks copies their rows as
+#   they are stored, so saving an archive does not decode it either.
+###############################################################################
+def _name_table(decks):
+    """name_table(decks); undecoded archive decks add their archive's table."""
+    table = {}
+    archives = set()
+    for deck in decks:
+        if isinstance(deck, ArchiveDeck) and not deck.decoded:
+            if deck.archive in archives:
+                continue
+            archives.add(deck.archive)
+            layout = deck.archive.table
+        else:
+            layout = [
+                (
+                    faction["faction_name"],
+                    [w["warlord_name"] for w in faction["warlords"]],
+                )
+                for faction in deck.get("factions", [])
+            ]
+        for faction_name, warlord_names in layout:
+            warlords = table.setdefault(faction_name, {})
+            for warlord_name in warlord_names:
+                warlords.setdefault(warlord_name, None)
+    return [(name, list(warlords)) for name, warlords in table.items()]
+
+
+def _row(deck, ordinals, width):
+    """deck's counters in archive order; warlords it does not have are zero."""
+    row = [0] * (width * _STATS)
+    for faction in deck.get("factions", []):
+        faction_name = faction["faction_name"]
+        for warlord in faction["warlords"]:
+            base = ordinals[(faction_name, warlord["warlord_name"])] * _STATS
+            for offset, key in enumerate(STAT_KEYS):
+                row[base + offset] = warlord[key]
+    return row
+
+
+def encode_archive(decks):
+    """decks (nested dict shape or ArchiveDecks) as a deck archive."""
+    table = _name_table(decks)
+    ordinals = warlord_ordinals(
+        [
+            {"faction_name": f, "warlords": [{"warlord_name": w} for w in names]}
+            for f, names in table
+        ]
+    )
+    width = len(ordinals)
+
+    table_data = pack_name_table(table)
+    names = [deck.get("deck_name", "Unnamed Deck").encode("utf-8") for deck in decks]
+    index_offset = _HEADER.size + len(table_data)
+    names_offset = index_offset + 8 * (len(decks) + 1)
+    offsets = [names_offset]
+    for name in names:
+        offsets.append(offsets[-1] + len(name))
+    counters_offset = (offsets[-1] + 7) // 8 * 8
+
+    parts = [
+        _HEADER.pack(
+            ARCHIVE_MAGIC,
+            ARCHIVE_VERSION,
+            0,
+            len(decks),
+            width,
+            index_offset,
+            names_offset,
+            counters_offset,
+        ),
+        table_data,
+        struct.pack(f"<{len(offsets)}Q", *offsets),
+        *names,
+        bytes(counters_offset - offsets[-1]),
+    ]
+    row_format = struct.Struct(f"<{width * _STATS}i")
+    warlords = list(ordinals)
+    padding = {}  # DeckArchive -> zeros after its rows, None if they do not fit
+    for deck in decks:
+        if isinstance(deck, ArchiveDeck) and not deck.decoded:
+            archive = deck.archive
+            if archive not in padding:
+                prefix = archive.width
+                fits = warlords[:prefix] == archive.names
+                padding[archive] = (
+                    bytes(4 * _STATS * (width - prefix)) if fits else None
+                )
+            if padding[archive] is not None:
+                parts.append(archive.row_bytes(deck.index))
+                parts.append(padding[archive])
+                continue
+            # The archive's own warlords: the merged ones may not be in table
+            deck = archive.deck(deck.index)
+        try:
+            parts.append(row_format.pack(*_row(deck, ordinals, width)))
+        except struct.error as e:
+            raise ValueError(f"{deck.get('deck_name')}: {e}") from None
+    return b"".join(parts)
+
+
+class DeckArchive:
+    def __init__(self, filename):
+        self.filename = filename
+        self.private = None  # the copy mapped after detach(), removed on close
+        self._map_file(filename)
+
+    def _map_file(self, path):
+        with open(path, "rb") as f:
+            try:
+                self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:  # empty file
+                raise ArchiveFormatError("Not a deck archive") from None
+        try:
+            self._parse()
+        except BaseException:
+            self.close()
+            raise
+
+    def _parse(self):
+        if len(self.map) < _HEADER.size:
+            raise ArchiveFormatError("Not a deck archive")
+        (
+            magic,
+            version,
+            _reserved,
+            self.deck_count,
+            self.width,
+            index_offset,
+            names_offset,
+            counters_offset,
+        ) = _HEADER.unpack_from(self.map)
+        if magic != ARCHIVE_MAGIC:
+            raise ArchiveFormatError("Not a deck archive")
+        if version > ARCHIVE_VERSION:
+            raise ArchiveFormatError(
+                f"Archive version {version} is newer than this program"
+                f" ({ARCHIVE_VERSION})"
+            )
+
+        self.table, _end = read_name_table(self.map, _HEADER.size)
+        self.names = [(f, w) for f, warlords in self.table for w in warlords]
+        if len(self.names) != self.width:
+            raise ArchiveFormatError("Name table does not match the deck width")
+
+        self.row_size = self.width * _STATS
+        self.counters_offset = counters_offset
+        counters_end = counters_offset + 4 * self.row_size * self.deck_count
+        index_end = index_offset + 8 * (self.deck_count + 1)
+        if counters_end != len(self.map) or index_end > names_offset:
+            raise ArchiveFormatError("Archive is truncated or damaged")
+        self.index = self._view(index_offset, index_end, "Q")
+        self.counters = self._view(counters_offset, counters_end, "i")
+
+    def _view(self, start, end, typecode):
+        """Little-endian numbers in map[start:end], without a copy if possible."""
+        data = memoryview(self.map)[start:end]
+        if sys.byteorder == "little":
+            return data.cast(typecode)
+        numbers = array(typecode, data)
+        numbers.byteswap()
+        return numbers
+
+    def close(self):
+        for name in ("index", "counters"):
+            view = self.__dict__.pop(name, None)
+            if isinstance(view, memoryview):
+                view.release()
+        try:
+            self.map.close()
+        except BufferError:
+            pass  # A view is still in use; the map closes when it is released
+        if self.private is not None:
+            try:
+                os.remove(self.private)
+            except OSError:
+                pass
+            self.private = None
+
+    def maps(self, filename):
+        """True if filename is the file mapped (replacing it needs detach())."""
+        if self.private is not None:
+            return False
+        try:
+            return os.path.samefile(self.filename, filename)
+        except OSError:
+            return False
+
+    def detach(self):
+        """
+        Map a private copy of the file instead, so that the file itself can be
+        replaced by a save (Windows refuses to replace a mapped file).
+        """
+        fd, private = tempfile.mkstemp(suffix=ARCHIVE_EXTENSIONS[0])
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(self.map)
+        except BaseException:
+            os.remove(private)
+            raise
+        self.close()
+        self.private = private
+        self._map_file(private)
+
+    def __len__(self):
+        return self.deck_count
+
+    def matches(self, master_table):
+        """True if decks are stored exactly in master_table's warlord order."""
+        return self.names == list(warlord_ordinals(master_table))
+
+    def deck_name(self, deck_index):
+        start, end = self.index[deck_index], self.index[deck_index + 1]
+        return str(self.map[start:end], "utf-8")
+
+    def row(self, deck_index):
+        """The counters of one deck (a view into the file)."""
+        start = deck_index * self.row_size
+        end = start + self.row_size
+        return self.counters[start:end]
+
+    def row_bytes(self, deck_index):
+        """The counters of one deck as stored in the file."""
+        start = self.counters_offset + 4 * deck_index * self.row_size
+        end = start + 4 * self.row_size
+        return self.map[start:end]
+
+    def deck(self, deck_index):
+        """Decode one deck into the nested dict shape."""
+        row = self.row(deck_index)
+        factions = []
+        ordinal = 0
+        for faction_name, warlords in self.table:
+            faction = {"faction_name": faction_name, "warlords": []}
+            for warlord_name in warlords:
+                start = ordinal * _STATS
+                end = start + _STATS
+                warlord = {"warlord_name": warlord_name}
+                warlord.update(zip(STAT_KEYS, row[start:end]))
+                faction["warlords"].append(warlord)
+                ordinal += 1
+            factions.append(faction)
+        return {"deck_name": self.deck_name(deck_index), "factions": factions}
+
+    ###########################################################################
+    # Aggregates (strided views over the counter section)
+    ###########################################################################
+    def deck_totals(self, deck_index):
+        row = self.row(deck_index)
+        return {key: sum(row[offset::_STATS]) for offset, key in enumerate(STAT_KEYS)}
+
+    def warlord_totals(self):
+        """{(faction_name, warlord_name): stats} summed across all decks."""
+        counters = self.counters
+        step = self.row_size
+        totals = {}
+        for ordinal, name in enumerate(self.names):
+            base = ordinal * _STATS
+            totals[name] = {
+                key: sum(counters[start::step])
+                for start, key in enumerate(STAT_KEYS, base)
+            }
+        return totals
+
+
+###############################################################################
+# Lazy decks
+#
+#   A deck of an open archive that is decoded (and merged with the
+#   MASTER_TABLE) the first time anything but its name is needed. Until then
+#   it costs a few bytes, so opening an archive only creates these.
+###############################################################################
+class ArchiveDeck(MutableMapping):
+    __slots__ = ("archive", "index", "_deck")
+
+    def __init__(self, archive, index):
+        self.archive = archive
+        self.index = index
+        self._deck = None
+
+    @property
+    def decoded(self):
+        return self._deck is not None
+
+    def _decoded(self):
+        if self._deck is None:
+            self._deck, _diff = merge_deck(self.archive.deck(self.index))
+        return self._deck
+
+    def plain(self):
+        """The deck as a dict, without keeping it decoded if it was not."""
+        if self._deck is not None:
+            return self._deck
+        return merge_deck(self.archive.deck(self.index))[0]
+
+    def __getitem__(self, key):
+        if key == "deck_name" and self._deck is None:
+            return self.archive.deck_name(self.index)
+        return self._decoded()[key]
+
+    def __setitem__(self, key, value):
+        self._decoded()[key] = value
+
+    def __delitem__(self, key):
+        del self._decoded()[key]
+
+    def __iter__(self):
+        return iter(self._decoded())
+
+    def __len__(self):
+        return len(self._decoded())
+
+    def __repr__(self):
+        return f"ArchiveDeck({self.archive.filename!r}, {self.index})"
+
+
+def plain_deck(deck):
+    """deck as a plain dict: ArchiveDecks through plain(), others as they are."""
+    return deck.plain() if isinstance(deck, ArchiveDeck) else deck
@@ -0,0 +1,223 @@
+# batch.py
+#
+# Headless batch mode: merge many save files against the MASTER_TABLE and
+# emit aggregated statistics as JSON or CSV. Files are processed by a pool of
+# worker processes; run it through the batch.py script next to run.py.
+
+import argparse
+import csv
+import glob
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from wf_game_tracker.analytics import add_totals, aggregate_store, result_line
+from wf_game_tracker.loader import DECK, ERROR, iter_load_steps
+from wf_game_tracker.master_data import STAT_KEYS
+from wf_game_tracker.stats_store import StatsStore
+from wf_game_tracker.storage import storage_for
+
+OUTPUT_FORMATS = ("json", "csv")
+
+CSV_COLUMNS = [
+    "scope",
+    "file",
+    "name",
+    *STAT_KEYS,
+    "matches",
+    "wins",
+    "losses",
+    "win_rate",
+]
+
+
+def expand_inputs(inputs):
+    """Save files named by inputs: files, directories (*.json) or glob patterns."""
+    files = []
+    for pattern in inputs:
+        if os.path.isdir(pattern):
+            files.extend(sorted(glob.glob(os.path.join(pattern, "*.json"))))
+        elif os.path.isfile(pattern):
+            files.append(pattern)
+        else:
+            files.extend(sorted(glob.glob(pattern, recursive=True)))
+    # Keep the first occurrence of files named twice
+    return list(dict.fromkeys(files))
+
+
+def process_file(filename):
+    """
+    Load one save file (plus its journal) with every deck merged against the
+    MASTER_TABLE, through the same load steps as the app. Each deck goes into
+    a StatsStore as it arrives, so a file costs its counters in arrays rather
+    than all of its decks as dicts. Runs in a worker process, so it returns
+    plain data:
+    {"file", "decks": [(deck_name, totals)], "factions", "warlords", "errors"}
+    """
+    result = {
+        "file": filename,
+        "decks": [],
+        "factions": {},
+        "warlords": {},
+        "errors": [],
+    }
+    store = StatsStore()
+    try:
+        storage = storage_for(filename)
+        if storage.live and os.path.exists(filename):
+            return _aggregate_database(storage, filename, result)
+        for step in iter_load_steps(filename):
+            if step[0] == DECK:
+                store.add_deck_dict(step[1])
+            elif step[0] == ERROR:
+                result["errors"].append(f"{filename}: {step[1]}")
+    except Exception as e:
+        result["errors"].append(f"{filename}: {e}")
+        return result
+
+    aggregates = aggregate_store(store)
+    result["decks"] = list(zip(store.deck_names, aggregates["decks"]))
+    result["factions"] = aggregates["factions"]
+    result["warlords"] = aggregates["warlords"]
+    return result
+
+
+def _aggregate_database(storage, filename, result):
+    """process_file for a database: indexed SQL aggregates, no decks loaded."""
+    storage.attach(filename)
+    try:
+        result["decks"] = list(storage.deck_totals())
+        result["factions"] = dict(storage.faction_totals())
+        result["warlords"] = {
+            (faction_name, warlord_name): stats
+            for faction_name, warlord_name, stats in storage.warlord_totals()
+        }
+    finally:
+        storage.close()
+    return result
+
+
+def merge_results(results):
+    """Combine per-file results into totals across all files."""
+    merged = {
+        "files": 0,
+        "global": dict.fromkeys(STAT_KEYS, 0),
+        "decks": [],
+        "factions": {},
+        "warlords": {},
+        "errors": [],
+    }
+    for result in results:
+        merged["files"] += 1
+        merged["errors"].extend(result["errors"])
+        for deck_name, totals in result["decks"]:
+            merged["decks"].append((result["file"], deck_name, totals))
+            add_totals(merged["global"], totals)
+        for field in ("factions", "warlords"):
+            for name, totals in result[field].items():
+                target = merged[field].setdefault(name, dict.fromkeys(STAT_KEYS, 0))
+                add_totals(target, totals)
+    return merged
+
+
+def run_batch(files, workers=None):
+    """
+    process_file every file and merge the results. workers is the number of
+    processes (default: one per core); with workers=1 everything runs here.
+    """
+    if workers == 1 or len(files) <= 1:
+        return merge_results(map(process_file, files))
+    workers = workers or os.cpu_count() or 1
+    # Hand out files in chunks so thousands of small files do not cost a
+    # round trip each
+    chunksize = max(1, len(files) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return merge_results(pool.map(process_file, files, chunksize=chunksize))
+
+
+###############################################################################
+# Output
+###############################################################################
+def _row(scope, name, totals, filename=""):
+    wins = totals["off_wins"] + totals["def_wins"]
+    losses = totals["off_losses"] + totals["def_losses"]
+    return {
+        "scope": scope,
+        "file": filename,
+        "name": name,
+        **totals,
+        **result_line(wins, losses),
+    }
+
+
+def report_rows(merged):
+    """Flat rows: the global line, then factions, warlords and decks."""
+    rows = [_row("global", "All decks", merged["global"])]
+    for faction_name, totals in merged["factions"].items():
+        rows.append(_row("faction", faction_name, totals))
+    for (faction_name, warlord_name), totals in merged["warlords"].items():
+        rows.append(_row("warlord", f"{warlord_name} ({faction_name})", totals))
+    for filename, deck_name, totals in merged["decks"]:
+        rows.append(_row("deck", deck_name, totals, filename))
+    return rows
+
+
+def write_json(merged, out):
+    rows = report_rows(merged)
+    report = {
+        "files": merged["files"],
+        "decks": len(merged["decks"]),
+        "errors": merged["errors"],
+    }
+    for scope in ("global", "faction", "warlord", "deck"):
+        report[scope] = [row for row in rows if row["scope"] == scope]
+    report["global"] = report["global"][0]
+    json.dump(report, out, indent=2)
+    out.write("\n")
+
+
+def write_csv(merged, out):
+    writer = csv.DictWriter(out, fieldnames=CSV_COLUMNS, lineterminator="\n")
+    writer.writeheader()
+    for row in report_rows(merged):
+        row["win_rate"] = f"{row['win_rate']:.1f}"
+        writer.writerow(row)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Aggregate deck statistics over many save files."
+    )
+    parser.add_argument(
+        "inputs", nargs="+", help="save files, directories or glob patterns"
+    )
+    parser.add_argument("-f", "--format", choices=OUTPUT_FORMATS, default="json")
+    parser.add_argument("-o", "--output", help="output file (default: stdout)")
+    parser.add_argument(
+        "-j",
+        "--workers",
+        type=int,
+        default=None,
+        help="worker processes (default: one per CPU core)",
+    )
+    args = parser.parse_args(argv)
+    if args.workers is not None and args.workers < 1:
+        parser.error("--workers must be at least 1")
+
+    files = expand_inputs(args.inputs)
+    if not files:
+        print("No save files found.", file=sys.stderr)
+        return 1
+
+    merged = run_batch(files, workers=args.workers)
+    write = write_csv if args.format == "csv" else write_json
+    if args.output:
+        with open(args.output, "w", encoding="utf-8", newline="") as out:
+            write(merged, out)
+    else:
+        write(merged, sys.stdout)
+
+    for error in merged["errors"]:
+        print(error, file=sys.stderr)
+    return 1 if merged["errors"] else 0
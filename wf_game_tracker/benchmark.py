@@ -0,0 +1,301 @@
+# benchmark.py
+#
+# Benchmarks for the load, merge, save, tab build and click paths, run on
+# synthetic deck files of configurable size. They drive a real DeckTrackerApp,
+# so they need a display: run them under xvfb with "make bench". Results are
+# written as JSON and compared with a stored baseline; a benchmark slower than
+# its threshold (a ratio to the baseline median) makes the run fail.
+
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+from wf_game_tracker.main_app import DeckTrackerApp
+from wf_game_tracker.master_data import MASTER_TABLE, STAT_KEYS, deep_copy_master_table
+
+BENCHMARKS = (
+    "merge_with_master_table",
+    "load_data",
+    "write_data",
+    "deep_copy_master_table",
+    "build_tab",
+    "update_warlord_row",
+    "update_summary_rows",
+)
+
+DEFAULT_BASELINE = "benchmark_baseline.json"
+DEFAULT_OUTPUT = "benchmark_results.json"
+
+# A benchmark regresses when its median exceeds the baseline median times
+# this ratio (a baseline file can set its own ratio per benchmark)
+DEFAULT_THRESHOLD = 1.25
+
+
+def synthetic_decks(decks, factions=None, warlords=None, nonzero=0.1, seed=0):
+    """
+    decks decks of factions factions with warlords warlords each. Names come
+    from the MASTER_TABLE first; beyond it synthetic names are used. Merging
+    drops those, so they make loading and merging slower but not the tab
+    build or the clicks (see merged_shape). Each counter is non-zero with probability nonzero. None
+    keeps the MASTER_TABLE's own number of factions or warlords.
+    """
+    rng = random.Random(seed)
+    faction_count = len(MASTER_TABLE) if factions is None else factions
+    layout = []
+    for f in range(faction_count):
+        master = MASTER_TABLE[f] if f < len(MASTER_TABLE) else None
+        master_names = [w["warlord_name"] for w in master["warlords"]] if master else []
+        count = len(master_names) if warlords is None else warlords
+        names = master_names[:count]
+        names += [f"Synthetic Warlord {w}" for w in range(len(names), count)]
+        faction_name = master["faction_name"] if master else f"Synthetic Faction {f}"
+        layout.append((faction_name, names))
+
+    def counter():
+        return rng.randint(1, 20) if rng.random() < nonzero else 0
+
+    return [
+        {
+            "deck_name": f"Deck {d + 1}",
+            "factions": [
+                {
+                    "faction_name": faction_name,
+                    "warlords": [
+                        {"warlord_name": name, **{key: counter() for key in STAT_KEYS}}
+                        for name in names
+                    ],
+                }
+                for faction_name, names in layout
+            ],
+        }
+        for d in range(decks)
+    ]
+
+
+def merged_shape(raw_decks):
+    """
+    What the merge leaves of the first of raw_decks: the warlord rows a tab
+    shows, and how many of its factions and warlords are not in the
+    MASTER_TABLE and so get dropped.
+    """
+    master = {f["faction_name"]: f for f in MASTER_TABLE}
+    dropped_factions = dropped_warlords = 0
+    for faction in raw_decks[0]["factions"] if raw_decks else []:
+        known = master.get(faction["faction_name"])
+        if known is None:
+            dropped_factions += 1
+            dropped_warlords += len(faction["warlords"])
+            continue
+        names = {w["warlord_name"] for w in known["warlords"]}
+        dropped_warlords += sum(
+            w["warlord_name"] not in names for w in faction["warlords"]
+        )
+    return {
+        "tab_rows": sum(len(f["warlords"]) for f in MASTER_TABLE),
+        "dropped_factions": dropped_factions,
+        "dropped_warlords": dropped_warlords,
+    }
+
+
+def measure(func, repeat, setup=None):
+    """Run func repeat times (after setup, which is not timed); seconds each."""
+    samples = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return {
+        "min": min(samples),
+        "median": statistics.median(samples),
+        "mean": statistics.fmean(samples),
+        "runs": repeat,
+    }
+
+
+def run_benchmarks(config, repeat=5):
+    """
+    Time every benchmark on a synthetic file described by config (the keyword
+    arguments of synthetic_decks). Returns the results document.
+    """
+    raw_decks = synthetic_decks(**config)
+    results = {}
+    with tempfile.TemporaryDirectory() as tmpdir:
+        filename = os.path.join(tmpdir, "decks.json")
+        with open(filename, "w", encoding="utf-8") as f:
+            json.dump(raw_decks, f, indent=2)
+
+        app = DeckTrackerApp()
+        try:
+            app.withdraw()
+            app.cancel_background_load()
+            app.autosave_enabled.set(False)
+
+            results["merge_with_master_table"] = measure(
+                lambda: app.merge_with_master_table(raw_decks), repeat
+            )
+            results["deep_copy_master_table"] = measure(deep_copy_master_table, repeat)
+            results["load_data"] = measure(lambda: app.load_data(filename), repeat)
+
+            # A full save: nothing is reused from the previous snapshot
+            saved = os.path.join(tmpdir, "saved.json")
+
+            def save():
+                app.write_data(saved, notify=False)
+                app.wait_for_save()
+
+            results["write_data"] = measure(
+                save, repeat, setup=app.snapshot_cache.clear
+            )
+
+            # A cold build: the grid is destroyed before every run
+            tab = app.deck_tabs[0]
+            results["build_tab"] = measure(
+                lambda: app.show_deck_tab(tab), repeat, setup=tab.release_ui
+            )
+
+            row, (faction_name, warlord_name) = next(iter(tab.row_keys.items()))
+            faction = next(
+                f for f in tab.deck_obj["factions"] if f["faction_name"] == faction_name
+            )
+            wlord = next(
+                w for w in faction["warlords"] if w["warlord_name"] == warlord_name
+            )
+
+            def click():
+                tab.on_counter_click(row, wlord, "off_wins", 1)
+                tab.flush_render()
+
+            def summary():
+                tab.update_summary_rows()
+                tab.flush_render()
+
+            results["update_warlord_row"] = measure(click, repeat)
+            results["update_summary_rows"] = measure(summary, repeat)
+        finally:
+            app.wait_for_save()
+            app.destroy()
+
+    return {
+        "config": config,
+        "repeat": repeat,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "shape": merged_shape(raw_decks),
+        "benchmarks": results,
+    }
+
+
+def compare(results, baseline, threshold=DEFAULT_THRESHOLD):
+    """
+    [(name, baseline median, median, ratio, limit)] for every benchmark in
+    both documents; ratio > limit is a regression.
+    """
+    limits = baseline.get("thresholds", {})
+    rows = []
+    for name, current in results["benchmarks"].items():
+        previous = baseline["benchmarks"].get(name)
+        if previous is None:
+            continue
+        ratio = current["median"] / previous["median"] if previous["median"] else 1.0
+        rows.append(
+            (
+                name,
+                previous["median"],
+                current["median"],
+                ratio,
+                limits.get(name, threshold),
+            )
+        )
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Time the load, merge, save, build and click paths."
+    )
+    parser.add_argument("--decks", type=int, default=200)
+    parser.add_argument("--factions", type=int, default=None, help="per deck")
+    parser.add_argument("--warlords", type=int, default=None, help="per faction")
+    parser.add_argument(
+        "--nonzero",
+        type=float,
+        default=0.1,
+        help="fraction of counters that are not zero (default: 0.1)",
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("-o", "--output", default=DEFAULT_OUTPUT)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="allowed ratio to the baseline median (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--update-baseline",
+        action="store_true",
+        help="store these results as the new baseline",
+    )
+    args = parser.parse_args(argv)
+
+    config = {
+        "decks": args.decks,
+        "factions": args.factions,
+        "warlords": args.warlords,
+        "nonzero": args.nonzero,
+    }
+    results = run_benchmarks(config, repeat=args.repeat)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    for name, stats in results["benchmarks"].items():
+        print(f"{name:<26} {stats['median'] * 1000:10.2f} ms (median)")
+    shape = results["shape"]
+    if shape["dropped_factions"] or shape["dropped_warlords"]:
+        print(
+            f"Note: merging drops {shape['dropped_factions']} faction(s) and "
+            f"{shape['dropped_warlords']} warlord(s) per deck that are not in the "
+            f"MASTER_TABLE; build_tab and the click benchmarks only cover its "
+            f"{shape['tab_rows']} rows"
+        )
+
+    if args.update_baseline:
+        baseline = {"thresholds": {}}
+        if os.path.exists(args.baseline):
+            with open(args.baseline, encoding="utf-8") as f:
+                baseline = json.load(f)
+        baseline.update(results)  # keeps the per-benchmark thresholds
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(baseline, f, indent=2)
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; create one with --update-baseline")
+        return 0
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    if baseline.get("config") != config:
+        print("Warning: the baseline was measured with a different configuration")
+
+    regressions = 0
+    for name, previous, current, ratio, limit in compare(
+        results, baseline, args.threshold
+    ):
+        status = "REGRESSION" if ratio > limit else "ok"
+        regressions += ratio > limit
+        print(
+            f"{name:<26} {previous * 1000:10.2f} -> {current * 1000:10.2f} ms"
+            f"  x{ratio:.2f} (limit x{limit:.2f})  {status}"
+        )
+    if regressions:
+        print(f"{regressions} benchmark(s) regressed", file=sys.stderr)
+        return 1
+    return 0
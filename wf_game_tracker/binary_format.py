@@ -0,0 +1,215 @@
+# binary_format.py
+
+import struct
+
+from wf_game_tracker.master_data import STAT_KEYS
+
+MAGIC = b"WFDK"
+FORMAT_VERSION = 1
+BINARY_EXTENSIONS = (".wfd",)
+
+# Deck layouts: FULL decks list every warlord of the name table in table
+# order (what every merged deck looks like); CUSTOM decks spell out their own
+# factions and warlords as indexes into the table.
+LAYOUT_FULL = 0
+LAYOUT_CUSTOM = 1
+
+_HEADER = struct.Struct("<4sHH")  # magic, version, reserved
+_U32 = struct.Struct("<I")
+_U8 = struct.Struct("<B")
+
+_INT32_MIN = -(2**31)
+_INT32_MAX = 2**31 - 1
+
+
+class BinaryFormatError(ValueError):
+    """The data is not a (readable) binary deck file."""
+
+
+###############################################################################
+# Binary deck format
+#
+#   Little-endian throughout; strings are a u32 byte length plus UTF-8.
+#
+#     header      "WFDK", u16 version, u16 reserved (0)
+#     name table  u32 faction count, then per faction its name, a u32 warlord
+#                 count and the warlord names
+#     decks       u32 deck count, then per deck: name, u8 layout, for CUSTOM
+#                 a u32 faction count and per faction (u32 faction index,
+#                 u32 warlord count, u32 warlord indexes); then the counters
+#                 as int32, STAT_KEYS order, one warlord after the other
+#
+#   Names are stored once in the table instead of once per deck, and the
+#   table travels with the file: a file written against an older MASTER_TABLE
+#   still reads back by name, and loading merges it like any JSON file. The
+#   version is bumped whenever the layout above changes.
+###############################################################################
+def _pack_str(text):
+    data = text.encode("utf-8")
+    return _U32.pack(len(data)) + data
+
+
+class _Reader:
+    def __init__(self, data):
+        self.data = memoryview(data)
+        self.pos = 0
+
+    def take(self, size):
+        start = self.pos
+        end = start + size
+        if end > len(self.data):
+            raise BinaryFormatError("Unexpected end of file")
+        self.pos = end
+        return self.data[start:end]
+
+    def u8(self):
+        return _U8.unpack(self.take(_U8.size))[0]
+
+    def u32(self):
+        return _U32.unpack(self.take(_U32.size))[0]
+
+    def text(self):
+        try:
+            return str(self.take(self.u32()), "utf-8")
+        except UnicodeDecodeError as e:
+            raise BinaryFormatError(f"Bad name: {e}") from None
+
+    def u32s(self, count):
+        return struct.unpack(f"<{count}I", self.take(4 * count))
+
+    def int32s(self, count):
+        return struct.unpack(f"<{count}i", self.take(4 * count))
+
+
+def name_table(decks):
+    """[(faction_name, [warlord_name])] of every warlord, in order of appearance."""
+    table = {}
+    for deck in decks:
+        for faction in deck.get("factions", []):
+            warlords = table.setdefault(faction["faction_name"], {})
+            for warlord in faction["warlords"]:
+                warlords.setdefault(warlord["warlord_name"], None)
+    return [(name, list(warlords)) for name, warlords in table.items()]
+
+
+def pack_name_table(table):
+    parts = [_U32.pack(len(table))]
+    for faction_name, warlords in table:
+        parts.append(_pack_str(faction_name))
+        parts.append(_U32.pack(len(warlords)))
+        parts.extend(_pack_str(name) for name in warlords)
+    return b"".join(parts)
+
+
+def _read_name_table(reader):
+    table = []
+    for _ in range(reader.u32()):
+        faction_name = reader.text()
+        table.append((faction_name, [reader.text() for _ in range(reader.u32())]))
+    return table
+
+
+def read_name_table(data, pos):
+    """The name table stored at pos in data, and the position after it."""
+    reader = _Reader(data)
+    reader.pos = pos
+    table = _read_name_table(reader)
+    return table, reader.pos
+
+
+def encode_decks(decks):
+    """decks (nested dict shape) as a binary deck file."""
+    table = name_table(decks)
+    faction_index = {name: i for i, (name, _warlords) in enumerate(table)}
+    warlord_index = [
+        {name: i for i, name in enumerate(warlords)} for _name, warlords in table
+    ]
+    full_layout = [
+        (i, list(range(len(warlords)))) for i, (_name, warlords) in enumerate(table)
+    ]
+
+    parts = [_HEADER.pack(MAGIC, FORMAT_VERSION, 0), pack_name_table(table)]
+
+    parts.append(_U32.pack(len(decks)))
+    for deck in decks:
+        parts.append(_pack_str(deck.get("deck_name", "Unnamed Deck")))
+        layout = []
+        counters = []
+        for faction in deck.get("factions", []):
+            f = faction_index[faction["faction_name"]]
+            names = warlord_index[f]
+            layout.append((f, [names[w["warlord_name"]] for w in faction["warlords"]]))
+            for warlord in faction["warlords"]:
+                counters.extend(warlord[key] for key in STAT_KEYS)
+        if layout == full_layout:
+            parts.append(_U8.pack(LAYOUT_FULL))
+        else:
+            parts.append(_U8.pack(LAYOUT_CUSTOM))
+            parts.append(_U32.pack(len(layout)))
+            for f, indexes in layout:
+                parts.append(
+                    struct.pack(f"<II{len(indexes)}I", f, len(indexes), *indexes)
+                )
+        for value in counters:
+            if not _INT32_MIN <= value <= _INT32_MAX:
+                raise ValueError(
+                    f"{deck.get('deck_name')}: counter {value} out of range"
+                )
+        parts.append(struct.pack(f"<{len(counters)}i", *counters))
+    return b"".join(parts)
+
+
+def iter_decks(data):
+    """
+    Yield every deck of a binary deck file (bytes) in the nested dict shape.
+    Raises BinaryFormatError if the data cannot be read.
+    """
+    reader = _Reader(data)
+    magic, version, _reserved = _HEADER.unpack(reader.take(_HEADER.size))
+    if magic != MAGIC:
+        raise BinaryFormatError("Not a binary deck file")
+    if version > FORMAT_VERSION:
+        raise BinaryFormatError(
+            f"File format version {version} is newer than this program"
+            f" ({FORMAT_VERSION})"
+        )
+
+    table = _read_name_table(reader)
+    full_layout = [
+        (f, range(len(warlords))) for f, (_name, warlords) in enumerate(table)
+    ]
+
+    stat_count = len(STAT_KEYS)
+    for _ in range(reader.u32()):
+        deck_name = reader.text()
+        kind = reader.u8()
+        if kind == LAYOUT_FULL:
+            layout = full_layout
+        elif kind == LAYOUT_CUSTOM:
+            layout = [
+                (reader.u32(), reader.u32s(reader.u32())) for _ in range(reader.u32())
+            ]
+        else:
+            raise BinaryFormatError(f"{deck_name}: unknown deck layout {kind}")
+
+        counters = reader.int32s(stat_count * sum(len(w) for _f, w in layout))
+        factions = []
+        start = 0
+        for f, indexes in layout:
+            if f >= len(table):
+                raise BinaryFormatError(f"{deck_name}: bad faction index {f}")
+            faction_name, names = table[f]
+            warlords = []
+            for w in indexes:
+                if w >= len(names):
+                    raise BinaryFormatError(f"{deck_name}: bad warlord index {w}")
+                end = start + stat_count
+                warlord = {"warlord_name": names[w]}
+                warlord.update(zip(STAT_KEYS, counters[start:end]))
+                warlords.append(warlord)
+                start = end
+            factions.append({"faction_name": faction_name, "warlords": warlords})
+        yield {"deck_name": deck_name, "factions": factions}
+
+    if reader.pos != len(reader.data):
+        raise BinaryFormatError("Unexpected data after the last deck")
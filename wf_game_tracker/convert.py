@@ -0,0 +1,75 @@
+# convert.py
+#
+# Convert save files between JSON, the binary deck format and deck archives,
+# e.g.
+#   python convert.py decks.json decks.wfd
+# Decks are converted as stored, without merging them with the MASTER_TABLE,
+# so converting JSON to binary and back gives the same decks. Archives store
+# every deck with the full name table, so missing warlords come back zeroed.
+
+import argparse
+import os
+import sys
+
+from wf_game_tracker.archive import ARCHIVE_EXTENSIONS, DeckArchive, encode_archive
+from wf_game_tracker.binary_format import BINARY_EXTENSIONS, encode_decks, iter_decks
+from wf_game_tracker.deck_stream import iter_decks as iter_json_decks
+from wf_game_tracker.storage import JsonStorage, atomic_write_text
+
+
+def _extension(filename):
+    return os.path.splitext(filename)[1].lower()
+
+
+def read_decks(filename):
+    """All decks stored in filename, unmerged; any bad deck raises ValueError."""
+    if _extension(filename) in BINARY_EXTENSIONS:
+        with open(filename, "rb") as f:
+            return list(iter_decks(f.read()))
+    if _extension(filename) in ARCHIVE_EXTENSIONS:
+        archive = DeckArchive(filename)
+        try:
+            return [archive.deck(index) for index in range(len(archive))]
+        finally:
+            archive.close()
+    decks = []
+    with open(filename, "r", encoding="utf-8") as f:
+        for index, deck, error in iter_json_decks(f):
+            if error is not None:
+                raise ValueError(f"Deck {index + 1}: {error}")
+            decks.append(deck)
+    return decks
+
+
+def convert_file(source, target):
+    """Write the decks of source to target in the format of target's extension."""
+    decks = read_decks(source)
+    if _extension(target) in BINARY_EXTENSIONS:
+        data = encode_decks(decks)
+    elif _extension(target) in ARCHIVE_EXTENSIONS:
+        data = encode_archive(decks)
+    else:
+        JsonStorage().write(target, decks)
+        return len(decks)
+    atomic_write_text(target, lambda f: f.write(data), binary=True)
+    return len(decks)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Convert a save file between JSON, binary and archive formats."
+    )
+    parser.add_argument("source", help="save file to read")
+    parser.add_argument(
+        "target",
+        help=f"file to write; {', '.join(BINARY_EXTENSIONS)} is binary,"
+        f" {', '.join(ARCHIVE_EXTENSIONS)} an archive, anything else JSON",
+    )
+    args = parser.parse_args(argv)
+    try:
+        count = convert_file(args.source, args.target)
+    except (OSError, ValueError) as e:
+        print(f"{args.source}: {e}", file=sys.stderr)
+        return 1
+    print(f"{count} deck(s) written to {args.target}")
+    return 0
@@ -0,0 +1,204 @@
+# deck_stream.py
+
+import json
+
+from wf_game_tracker.master_data import STAT_KEYS
+from wf_game_tracker.merge_engine import merge_deck
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+_WHITESPACE = " \t\n\r"
+
+
+class DeckStreamError(ValueError):
+    """The file is not a JSON array of decks; nothing after this can be read."""
+
+
+###############################################################################
+# Streaming deck reader
+#
+#   Save files are a top-level JSON array of decks. Instead of json.load-ing
+#   the whole document, the array is read chunk by chunk and each element is
+#   decoded on its own, so only the current deck (plus one chunk) is held in
+#   memory. A deck that fails to decode or validate is reported on its own
+#   and skipped; the rest of the file is still read.
+###############################################################################
+class _Buffer:
+    def __init__(self, fp, chunk_size):
+        self.fp = fp
+        self.chunk_size = chunk_size
+        self.text = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self, grow=False):
+        """
+        Read one more chunk, dropping text that was already consumed.
+        With grow=True, read at least as much as is still buffered so that an
+        element larger than a chunk is completed in a logarithmic number of reads.
+        """
+        if self.eof:
+            return False
+        pos = self.pos
+        size = self.chunk_size
+        if grow:
+            size = max(size, len(self.text) - pos)
+        chunk = self.fp.read(size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.text = self.text[pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self):
+        """Skip whitespace and return the next character ('' at end of file)."""
+        while True:
+            while self.pos < len(self.text) and self.text[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.text):
+                return self.text[self.pos]
+            if not self.fill():
+                return ""
+
+
+def _scan_element_end(text, pos):
+    """
+    Return the index just past the JSON value starting at text[pos], matching
+    brackets and skipping strings, or -1 if the value is not complete yet.
+    """
+    depth = 0
+    in_string = False
+    i = pos
+    n = len(text)
+    while i < n:
+        c = text[i]
+        if in_string:
+            if c == "\\":
+                i += 1
+            elif c == '"':
+                in_string = False
+                if depth == 0:
+                    return i + 1
+        elif c == '"':
+            in_string = True
+        elif c in "[{":
+            depth += 1
+        elif c in "]}":
+            if depth == 0:
+                return i
+            depth -= 1
+            if depth == 0:
+                return i + 1
+        elif depth == 0 and (c == "," or c in _WHITESPACE):
+            return i
+        i += 1
+    return -1
+
+
+def _decode_next(buf, decoder):
+    """
+    Decode the array element at buf.pos and advance past it.
+    Returns (value, error); error is a message if the element is malformed.
+    """
+    while True:
+        try:
+            value, end = decoder.raw_decode(buf.text, buf.pos)
+        except json.JSONDecodeError as e:
+            end = _scan_element_end(buf.text, buf.pos)
+            if end == -1:
+                if buf.fill(grow=True):
+                    continue
+                raise DeckStreamError(f"Unexpected end of file: {e}") from e
+            # Always consume at least one character, e.g. a stray '}'
+            end = max(end, buf.pos + 1)
+            try:
+                value, _ = decoder.raw_decode(buf.text[:end], buf.pos)
+            except json.JSONDecodeError as inner:
+                buf.pos = end
+                return None, str(inner)
+            buf.pos = end
+            return value, None
+        # A scalar may continue in the next chunk (e.g. a split number)
+        if end == len(buf.text) and buf.fill():
+            continue
+        buf.pos = end
+        return value, None
+
+
+def iter_decks(fp, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Yield (index, deck, error) for every element of the top-level deck array
+    read from the text file object fp. deck is None when error is set.
+    Raises DeckStreamError if the document itself is not a deck array.
+    """
+    buf = _Buffer(fp, chunk_size)
+    decoder = json.JSONDecoder()
+
+    if buf.peek() != "[":
+        raise DeckStreamError("Expected a JSON array of decks")
+    buf.pos += 1
+    if buf.peek() == "]":
+        return
+
+    index = 0
+    while True:
+        if buf.peek() == "":
+            raise DeckStreamError("Unexpected end of file")
+        deck, error = _decode_next(buf, decoder)
+        if error is None:
+            try:
+                validate_deck(deck)
+            except ValueError as e:
+                deck, error = None, str(e)
+        yield index, deck, error
+        index += 1
+
+        separator = buf.peek()
+        if separator == "]":
+            return
+        if separator != ",":
+            raise DeckStreamError(
+                f"Expected ',' or ']' after deck {index}, found {separator!r}"
+            )
+        buf.pos += 1
+
+
+def validate_deck(deck):
+    """Raise ValueError if deck does not have the shape of a saved deck."""
+    if not isinstance(deck, dict):
+        raise ValueError("deck is not an object")
+    if not isinstance(deck.get("deck_name", ""), str):
+        raise ValueError("deck_name is not a string")
+    factions = deck.get("factions", [])
+    if not isinstance(factions, list):
+        raise ValueError("factions is not a list")
+    for faction in factions:
+        if not isinstance(faction, dict) or "faction_name" not in faction:
+            raise ValueError("faction without a faction_name")
+        if not isinstance(faction.get("warlords"), list):
+            raise ValueError(f"{faction['faction_name']}: warlords is not a list")
+        for warlord in faction["warlords"]:
+            if not isinstance(warlord, dict) or "warlord_name" not in warlord:
+                raise ValueError(
+                    f"{faction['faction_name']}: warlord without a warlord_name"
+                )
+            for key in STAT_KEYS:
+                if not isinstance(warlord.get(key), int):
+                    raise ValueError(
+                        f"{faction['faction_name']} / {warlord['warlord_name']}: "
+                        f"{key} is not an integer"
+                    )
+
+
+def iter_merged_decks(fp, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Like iter_decks, but each valid deck is merged with the MASTER_TABLE.
+    Yields (index, merged_deck, diff, error).
+    """
+    for index, deck, error in iter_decks(fp, chunk_size):
+        if error is not None:
+            yield index, None, None, error
+            continue
+        merged_deck, diff = merge_deck(deck)
+        yield index, merged_deck, diff, None
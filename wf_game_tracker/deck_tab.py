@@ -1,45 +1,216 @@
 # deck_tab.py
 
+import os
 import tkinter as tk
 from tkinter import ttk
 
+from wf_game_tracker.analytics import (
+    deck_totals,
+    faction_totals,
+    result_line,
+    side_lines,
+    warlord_line,
+)
+from wf_game_tracker.instrumentation import timed
+from wf_game_tracker.stats_grid import StatsGrid
+
+# Re-check the running summary totals against a full rescan after every click
+DEBUG_CHECKS = os.environ.get("WF_TRACKER_DEBUG") == "1"
+
+# Decks with more warlord rows than this are drawn on a virtualized canvas
+# (StatsGrid) instead of one tk.Label per cell
+CANVAS_GRID_MIN_ROWS = 120
+
+HEADERS = [
+    "Faction",
+    "Warlord",
+    "Matches",
+    "Off. Wins",
+    "Off. Losses",
+    "Def. Wins",
+    "Def. Losses",
+    "Total Wins",
+    "Total Losses",
+    "Win Rate",
+]
+COLUMN_WIDTHS = [180, 160] + [110] * 8
+
+# label_refs key and background of the cells right of the warlord name
+STAT_COLUMNS = [
+    ("matches", "#fff"),
+    ("off_wins", "#bfb"),
+    ("off_losses", "#fbb"),
+    ("def_wins", "#bfb"),
+    ("def_losses", "#fbb"),
+    ("tot_wins", "#dfd"),
+    ("tot_losses", "#fdd"),
+    ("win_rate", "#eee"),
+]
+CLICKABLE_COLUMNS = {3: "off_wins", 4: "off_losses", 5: "def_wins", 6: "def_losses"}
+
+# Summary lines: title, title background, cell background
+SUMMARY_STYLES = [
+    ("Going First", "#888", "#999"),
+    ("Going Second", "#666", "#777"),
+    ("TOTAL", "#444", "#555"),
+]
+SUMMARY_COLUMNS = ["matches", "wins", "losses", "win_rate"]
+
+
+def format_cell(name, value):
+    return f"{value:.1f}%" if name == "win_rate" else str(value)
+
+
+def warlord_cells(wlord):
+    """Display texts of a warlord's stat cells, keyed like STAT_COLUMNS."""
+    line = warlord_line(wlord)
+    return {name: format_cell(name, line[name]) for name, _bg in STAT_COLUMNS}
+
+
+def summary_cells(result):
+    """Display texts of one summary line, keyed like SUMMARY_COLUMNS."""
+    return {name: format_cell(name, result[name]) for name in SUMMARY_COLUMNS}
+
 
 ###############################################################################
 # The DeckTab widget: displays a single deck (factions, warlords, summary).
-# We update cells in-place (no flicker).
+# We update cells in-place (no flicker). Changes only mark rows dirty; one
+# after_idle pass (flush_render) repaints them, so a burst of clicks costs a
+# single repaint and only labels whose text changed are reconfigured.
+#
+# Two renderers: one tk.Label per cell laid out with grid (default), or a
+# StatsGrid canvas that only draws the rows in view, for very large decks.
 ###############################################################################
 class DeckTab(tk.Frame):
-    def __init__(self, parent, deck_obj, app):
+    def __init__(self, parent, deck_obj, app, lazy=False, renderer=None):
         """
         parent: the ttk.Frame we attach to
         deck_obj: the deck dictionary (with "deck_name", "factions" list, etc.)
         app: reference to the main application (for saving, etc.)
+        lazy: if True, start as an empty placeholder; the grid is only built
+              by ensure_built() (e.g. when the tab is first selected)
+        renderer: "labels", "canvas" or None to pick by the number of warlords
         """
         super().__init__(parent)
+        if renderer not in (None, "labels", "canvas"):
+            raise ValueError(f"Unknown renderer: {renderer}")
         self.app = app
         self.deck_obj = deck_obj
+        self.renderer = renderer
+        self.built = False
+        self._reset_ui_state()
+
+        if not lazy:
+            self.ensure_built()
+
+    def _reset_ui_state(self):
         self.label_refs = {}
-        self.faction_wr_labels = {}
+        self.row_keys = {}  # row -> (faction_name, warlord_name)
+        self.row_warlords = {}  # labels renderer: row -> warlord dict
+        self.entry_title = None
+        self.totals = None
+        self.summary_row_total = None
+        self.faction_wr_labels = {}  # labels renderer: merged faction cells
+        self.canvas = None
+        self.stats_grid = None
+        self.grid_rows = []  # canvas renderer: row -> (faction_name, warlord)
+        self.faction_rows = {}  # canvas renderer: faction_name -> (row, rows)
+        self.summary_texts = None
+        self.dirty_rows = {}  # row -> warlord dict waiting to be repainted
+        self.summary_dirty = False
+        self.dirty_factions = set()  # faction cells waiting to be repainted
+        self.shown_texts = {}  # label -> text it currently displays
+        self.render_job = None
+
+    def ensure_built(self):
+        """Build the grid if this tab is still a placeholder."""
+        if self.built:
+            return
+        # Running per-deck counter totals behind the summary rows; the faction
+        # cells read the app's matchup matrix
+        self.totals = deck_totals(self.deck_obj)
 
-        # Build the UI
+        # Build the UI and paint it right away
         self.build_ui()
+        self.flush_render()
 
         # Now that canvas exists, bind scroll wheel
         self._bind_scroll_wheel()
+        self.built = True
+
+    def release_ui(self):
+        """Destroy the grid widgets, turning the tab back into a placeholder."""
+        if not self.built:
+            return
+        if self.render_job is not None:
+            self.after_cancel(self.render_job)
+        for child in self.winfo_children():
+            child.destroy()
+        self._reset_ui_state()
+        self.built = False
+
+    def rebind(self, deck_obj):
+        """
+        Show deck_obj in this tab instead. A built grid whose rows match
+        deck_obj's factions and warlords (as every merged deck's do) is kept:
+        its labels and bindings are repointed and every row is repainted.
+        Otherwise the tab goes back to being a placeholder.
+        """
+        if deck_obj is self.deck_obj:
+            return
+        if not self.built:
+            self.deck_obj = deck_obj
+            return
+        warlords = [w for f in deck_obj["factions"] for w in f["warlords"]]
+        keys = [
+            (f["faction_name"], w["warlord_name"])
+            for f in deck_obj["factions"]
+            for w in f["warlords"]
+        ]
+        if keys != list(self.row_keys.values()):
+            self.release_ui()
+            self.deck_obj = deck_obj
+            return
 
+        self.deck_obj = deck_obj
+        self.totals = deck_totals(deck_obj)
+        self.dirty_factions.update(f for f, _w in self.row_keys.values())
+        self.show_deck_name()
+        for row, wlord in zip(self.row_keys, warlords):
+            if self.stats_grid is not None:
+                self.grid_rows[row] = (self.grid_rows[row][0], wlord)
+            else:
+                self.row_warlords[row] = wlord
+            self.dirty_rows[row] = wlord
+        self.summary_dirty = True
+        self.schedule_render()
+
+    def show_deck_name(self):
+        """Put the deck's current name in the title entry, if it differs."""
+        name = self.deck_obj.get("deck_name", "Unnamed Deck")
+        if self.entry_title is not None and self.entry_title.get() != name:
+            self.entry_title.delete(0, tk.END)
+            self.entry_title.insert(0, name)
+
+    def uses_canvas(self):
+        """True if the grid is drawn by a StatsGrid instead of labels."""
+        if self.renderer is not None:
+            return self.renderer == "canvas"
+        n_rows = sum(len(f["warlords"]) for f in self.deck_obj["factions"])
+        return n_rows > CANVAS_GRID_MIN_ROWS
+
+    @timed("tab.build")
     def build_ui(self):
         title_frame = ttk.Frame(self)
         title_frame.pack(fill=tk.X, padx=5, pady=5)
 
         tk.Label(title_frame, text="Deck Title:").pack(side=tk.LEFT)
-        entry_title = ttk.Entry(title_frame, width=40)
+        self.entry_title = entry_title = ttk.Entry(title_frame, width=40)
         entry_title.insert(0, self.deck_obj.get("deck_name", "Unnamed Deck"))
         entry_title.pack(side=tk.LEFT, padx=5)
 
         def update_deck_name(*_):
-            self.deck_obj["deck_name"] = entry_title.get()
-            idx = self.app.notebook.index(self)
-            self.app.notebook.tab(idx, text=entry_title.get())
+            self.app.rename_deck(self.deck_obj, entry_title.get())
 
         entry_title.bind("<KeyRelease>", update_deck_name)
 
@@ -47,6 +218,10 @@ class DeckTab(tk.Frame):
         self.grid_rowconfigure(0, weight=1)  # Allow vertical expansion
         self.grid_columnconfigure(0, weight=1)
 
+        if self.uses_canvas():
+            self.build_stats_grid()
+            return
+
         # Scrollable container
         container = ttk.Frame(self)
         container.pack(fill=tk.BOTH, expand=True)
@@ -81,20 +256,81 @@ class DeckTab(tk.Frame):
         self.build_faction_rows()
         self.build_summary_rows()
 
-    def build_faction_rows(self):
-        headers = [
-            "Faction",
-            "Warlord",
-            "Matches",
-            "Off. Wins",
-            "Off. Losses",
-            "Def. Wins",
-            "Def. Losses",
-            "Total Wins",
-            "Total Losses",
-            "Win Rate",
+    def build_stats_grid(self):
+        """Canvas renderer: lay out the rows, then let StatsGrid draw them."""
+        self.grid_rows = [None]  # row 0 is the header
+        for faction_data in self.deck_obj["factions"]:
+            faction_name = faction_data["faction_name"]
+            warlords = faction_data["warlords"]
+            self.faction_rows[faction_name] = (len(self.grid_rows), len(warlords))
+            for wlord in warlords:
+                row = len(self.grid_rows)
+                self.row_keys[row] = (faction_name, wlord["warlord_name"])
+                self.grid_rows.append((faction_name, wlord))
+        self.summary_start_row = len(self.grid_rows)
+        self.summary_texts = self.summary_values()
+
+        self.stats_grid = StatsGrid(
+            self,
+            COLUMN_WIDTHS,
+            self.summary_start_row + len(SUMMARY_STYLES),
+            self.grid_row_cells,
+            on_click=self.on_grid_click,
+        )
+        self.stats_grid.pack(fill=tk.BOTH, expand=True)
+        self.canvas = self.stats_grid.canvas
+
+    def grid_row_cells(self, row):
+        """(text, bg, fg) of every cell of a canvas row."""
+        if row == 0:
+            return [(hdr, "#aaa", "black") for hdr in HEADERS]
+        if row >= self.summary_start_row:
+            line = row - self.summary_start_row
+            title, title_bg, bg = SUMMARY_STYLES[line]
+            texts = self.summary_texts[line]
+            cells = [(title, title_bg, "white"), ("", title_bg, "white")]
+            cells += [(texts[name], bg, "white") for name in SUMMARY_COLUMNS]
+            cells += [("", bg, "white")] * (len(HEADERS) - len(cells))
+            return cells
+
+        _faction_name, wlord = self.grid_rows[row]
+        texts = warlord_cells(wlord)
+        cells = [
+            (self.grid_faction_text(row), "#cce", "black"),
+            (wlord["warlord_name"], "#eef", "black"),
         ]
-        for col_idx, hdr in enumerate(headers):
+        cells += [(texts[name], bg, "black") for name, bg in STAT_COLUMNS]
+        return cells
+
+    def grid_faction_text(self, row):
+        """
+        Canvas faction column: a faction's name on its first row and the
+        deck's record against it on the second (next to the name if the
+        faction has a single warlord).
+        """
+        faction_name, _wlord = self.grid_rows[row]
+        first, count = self.faction_rows[faction_name]
+        if row == first and count > 1:
+            return faction_name
+        if row == first:
+            return f"{faction_name} {self.faction_record(faction_name)}"
+        if row == first + 1:
+            return self.faction_record(faction_name)
+        return ""
+
+    def faction_record(self, faction_name):
+        """One-line record of this deck against faction_name."""
+        stats = self.compute_deck_vs_faction(faction_name)
+        return f"vs: {stats['wins']}-{stats['losses']} ({stats['win_rate']:.1f}%)"
+
+    def on_grid_click(self, row, col, delta):
+        """Left/right click on a canvas cell: only counter cells react."""
+        key = CLICKABLE_COLUMNS.get(col)
+        if key is not None and row in self.row_keys:
+            self.on_counter_click(row, self.grid_rows[row][1], key, delta)
+
+    def build_faction_rows(self):
+        for col_idx, hdr in enumerate(HEADERS):
             lbl = tk.Label(
                 self.inner_frame,
                 text=hdr,
@@ -128,6 +364,8 @@ class DeckTab(tk.Frame):
                 padx=1,
                 pady=1,
             )
+            self.faction_wr_labels[faction_name] = faction_lbl
+            self.dirty_factions.add(faction_name)
 
             for i, wlord in enumerate(warlords):
                 current_row = row_counter + i
@@ -150,6 +388,8 @@ class DeckTab(tk.Frame):
 
     def create_stat_cells(self, row, wlord, faction_data):
         """Create labels for stats and store them for updating later."""
+        self.row_keys[row] = (faction_data["faction_name"], wlord["warlord_name"])
+        self.row_warlords[row] = wlord
 
         # Matches
         lbl_matches = tk.Label(
@@ -159,16 +399,16 @@ class DeckTab(tk.Frame):
         self.label_refs[(row, "matches")] = lbl_matches
 
         # Off. Wins
-        self.make_clickable_stat(row, 3, wlord, "off_wins", bg="#bfb")
+        self.make_clickable_stat(row, 3, "off_wins", bg="#bfb")
 
         # Off. Losses
-        self.make_clickable_stat(row, 4, wlord, "off_losses", bg="#fbb")
+        self.make_clickable_stat(row, 4, "off_losses", bg="#fbb")
 
         # Def. Wins
-        self.make_clickable_stat(row, 5, wlord, "def_wins", bg="#bfb")
+        self.make_clickable_stat(row, 5, "def_wins", bg="#bfb")
 
         # Def. Losses
-        self.make_clickable_stat(row, 6, wlord, "def_losses", bg="#fbb")
+        self.make_clickable_stat(row, 6, "def_losses", bg="#fbb")
 
         # Total Wins
         lbl_total_wins = tk.Label(
@@ -194,8 +434,11 @@ class DeckTab(tk.Frame):
         # Initial update
         self.update_warlord_row(row, wlord)
 
-    def make_clickable_stat(self, row, col, wlord_dict, key, bg):
-        """Create a clickable stat label that updates when clicked."""
+    def make_clickable_stat(self, row, col, key, bg):
+        """
+        Create a clickable stat label that updates when clicked. The warlord
+        is looked up when clicked, so rebind() can point the row elsewhere.
+        """
         lbl = tk.Label(self.inner_frame, bg=bg, relief=tk.RIDGE, borderwidth=1)
         lbl.grid(row=row, column=col, sticky="nsew", padx=1, pady=1)
 
@@ -205,43 +448,94 @@ class DeckTab(tk.Frame):
         # Left-click increases value, right-click decreases
         lbl.bind(
             "<Button-1>",
-            lambda _evt: self.update_warlord_row(row, wlord_dict, key, delta=1),
+            lambda _evt: self.on_counter_click(row, self.row_warlords[row], key, 1),
         )
         lbl.bind(
             "<Button-3>",
-            lambda _evt: self.update_warlord_row(row, wlord_dict, key, delta=-1),
+            lambda _evt: self.on_counter_click(row, self.row_warlords[row], key, -1),
         )
 
-        lbl.config(text=str(wlord_dict[key]))  # Set initial value
+    @timed("click")
+    def on_counter_click(self, row, wlord_dict, key, delta):
+        """A click on a counter cell (either renderer): change it by delta."""
+        self.update_warlord_row(row, wlord_dict, key, delta=delta)
 
     def update_warlord_row(self, row, wlord_dict, key=None, delta=0):
         """
         Updates a warlord's row stats and increments/decrements a value if key and delta are provided.
+        The row (and the summary lines) are repainted by the next flush_render().
         """
         if key is not None:
             # Apply change if key and delta are provided
             wlord_dict[key] += delta
+            self.totals[key] += delta
+            faction_name, warlord_name = self.row_keys[row]
+            self.dirty_factions.add(faction_name)
+            self.app.on_counter_changed(
+                self.deck_obj, faction_name, warlord_name, key, delta
+            )
+            self.summary_dirty = True
+            if DEBUG_CHECKS:
+                self.check_totals()
+
+        self.dirty_rows[row] = wlord_dict
+        self.schedule_render()
+
+    def schedule_render(self):
+        """Run flush_render() once Tk is idle, unless it is already queued."""
+        if self.render_job is None:
+            self.render_job = self.after_idle(self._on_idle_render)
+
+    def _on_idle_render(self):
+        self.render_job = None
+        self.flush_render()
+
+    @timed("render")
+    def flush_render(self):
+        """Repaint the dirty rows and summary lines now."""
+        if self.render_job is not None:
+            self.after_cancel(self.render_job)
+            self.render_job = None
+
+        dirty_rows, self.dirty_rows = self.dirty_rows, {}
+        summary_dirty, self.summary_dirty = self.summary_dirty, False
+        dirty_factions, self.dirty_factions = self.dirty_factions, set()
+        if summary_dirty:
+            self.summary_texts = self.summary_values()
+
+        if self.stats_grid is not None:
+            for row in dirty_rows:
+                self.stats_grid.refresh_row(row)
+            for faction_name in dirty_factions:
+                first, count = self.faction_rows[faction_name]
+                self.stats_grid.refresh_row(first + 1 if count > 1 else first)
+            if summary_dirty:
+                for line in range(len(SUMMARY_STYLES)):
+                    self.stats_grid.refresh_row(self.summary_start_row + line)
+            return
+
+        for row, wlord_dict in dirty_rows.items():
+            for name, text in warlord_cells(wlord_dict).items():
+                self.set_label_text(self.label_refs[(row, name)], text)
+
+        for faction_name in dirty_factions:
+            self.update_faction_wr_label(faction_name)
+
+        if summary_dirty:
+            summary_rows = (
+                self.summary_row_off,
+                self.summary_row_def,
+                self.summary_row_total,
+            )
+            for summary_row, texts in zip(summary_rows, self.summary_texts):
+                for name, text in texts.items():
+                    self.set_label_text(summary_row[name], text)
 
-        # Calculate updated values
-        ow = wlord_dict["off_wins"]
-        ol = wlord_dict["off_losses"]
-        dw = wlord_dict["def_wins"]
-        dl = wlord_dict["def_losses"]
-
-        matches = ow + ol + dw + dl
-        tot_wins = ow + dw
-        tot_losses = ol + dl
-        win_rate = (100.0 * tot_wins / matches) if matches > 0 else 0.0
-
-        # Update labels
-        self.label_refs[(row, "matches")].config(text=str(matches))
-        self.label_refs[(row, "off_wins")].config(text=str(ow))
-        self.label_refs[(row, "off_losses")].config(text=str(ol))
-        self.label_refs[(row, "def_wins")].config(text=str(dw))
-        self.label_refs[(row, "def_losses")].config(text=str(dl))
-        self.label_refs[(row, "tot_wins")].config(text=str(tot_wins))
-        self.label_refs[(row, "tot_losses")].config(text=str(tot_losses))
-        self.label_refs[(row, "win_rate")].config(text=f"{win_rate:.1f}%")
+    def set_label_text(self, label, text):
+        """config(text=...) only if the label does not already show text."""
+        if self.shown_texts.get(label) != text:
+            label.config(text=text)
+            self.shown_texts[label] = text
 
     def create_summary_line(self, row, summary_dict, highlight_bg):
         lbl_m = tk.Label(
@@ -284,50 +578,45 @@ class DeckTab(tk.Frame):
         lbl_wr.grid(row=row, column=5, columnspan=5, sticky="nsew")
         summary_dict["win_rate"] = lbl_wr
 
+    @timed("summary")
+    def summary_values(self):
+        """Texts of the Going First / Going Second / TOTAL lines."""
+        lines = side_lines(self.totals)
+        return [
+            summary_cells(lines["offense"]),
+            summary_cells(lines["defense"]),
+            summary_cells(lines["overall"]),
+        ]
+
     def update_summary_rows(self):
-        off_matches = off_wins = off_losses = 0
-        def_matches = def_wins = def_losses = 0
-        total_matches = total_wins = total_losses = 0
+        """Refresh the summary rows from the running totals (no rescan)."""
+        self.summary_dirty = True
+        self.schedule_render()
+
+    def check_totals(self):
+        """Raise AssertionError if the running totals drifted from the deck data."""
+        expected = deck_totals(self.deck_obj)
+        if self.totals != expected:
+            raise AssertionError(
+                f"Summary totals {self.totals} do not match deck data {expected}"
+            )
+        matchups = self.app.aggregates.matchups
+        for faction_name, expected in faction_totals(self.deck_obj).items():
+            stats = matchups.deck_vs_faction(self.deck_obj, faction_name)
+            if stats != expected:
+                raise AssertionError(
+                    f"Matchups against {faction_name} {stats} do not match deck"
+                    f" data {expected}"
+                )
 
-        for faction_data in self.deck_obj["factions"]:
-            for w in faction_data["warlords"]:
-                ow = w["off_wins"]
-                ol = w["off_losses"]
-                dw = w["def_wins"]
-                dl = w["def_losses"]
-
-                off_matches += ow + ol
-                off_wins += ow
-                off_losses += ol
-
-                def_matches += dw + dl
-                def_wins += dw
-                def_losses += dl
-
-        total_matches = off_matches + def_matches
-        total_wins = off_wins + def_wins
-        total_losses = off_losses + def_losses
-
-        # Going First
-        self.summary_row_off["matches"].config(text=str(off_matches))
-        self.summary_row_off["wins"].config(text=str(off_wins))
-        self.summary_row_off["losses"].config(text=str(off_losses))
-        off_wr = (100.0 * off_wins / off_matches) if off_matches > 0 else 0.0
-        self.summary_row_off["win_rate"].config(text=f"{off_wr:.1f}%")
-
-        # Going Second
-        self.summary_row_def["matches"].config(text=str(def_matches))
-        self.summary_row_def["wins"].config(text=str(def_wins))
-        self.summary_row_def["losses"].config(text=str(def_losses))
-        def_wr = (100.0 * def_wins / def_matches) if def_matches > 0 else 0.0
-        self.summary_row_def["win_rate"].config(text=f"{def_wr:.1f}%")
-
-        # Overall
-        self.summary_row_total["matches"].config(text=str(total_matches))
-        self.summary_row_total["wins"].config(text=str(total_wins))
-        self.summary_row_total["losses"].config(text=str(total_losses))
-        total_wr = (100.0 * total_wins / total_matches) if total_matches > 0 else 0.0
-        self.summary_row_total["win_rate"].config(text=f"{total_wr:.1f}%")
+    def compute_deck_vs_faction(self, faction_name):
+        """This deck's results against faction_name (from the matchup matrix)."""
+        matchups = self.app.aggregates.matchups
+        totals = matchups.deck_vs_faction(self.deck_obj, faction_name)
+        return result_line(
+            totals["off_wins"] + totals["def_wins"],
+            totals["off_losses"] + totals["def_losses"],
+        )
 
     def build_summary_rows(self):
         """Create summary rows for going first, going second, and total results."""
@@ -392,28 +681,24 @@ class DeckTab(tk.Frame):
         self.update_summary_rows()
 
     def update_faction_wr_label(self, faction_name):
-        faction_data = next(
-            (f for f in self.deck_obj["factions"] if f["faction_name"] == faction_name),
-            None,
-        )
-        if not faction_data:
+        merged_lbl = self.faction_wr_labels.get(faction_name)
+        if merged_lbl is None:
             return
 
-        stats = self.compute_deck_vs_faction(faction_data)
-        merged_lbl = self.faction_wr_labels[faction_name]
-        merged_lbl.config(
-            text=(
+        stats = self.compute_deck_vs_faction(faction_name)
+        self.set_label_text(
+            merged_lbl,
+            (
                 f"(vs {faction_name})\n"
                 f"Matches: {stats['matches']}\n"
                 f"Wins: {stats['wins']}\n"
                 f"Losses: {stats['losses']}\n"
-                f"WR: {stats['wr']:.1f}%"
-            )
+                f"WR: {stats['win_rate']:.1f}%"
+            ),
         )
 
     def _on_canvas_resize(self, event):
         """Ensures the canvas resizes properly to fit the content."""
-        self.inner_frame.update_idletasks()
         self.canvas.itemconfig(
             self.inner_frame_id,
             height=self.inner_frame.winfo_reqheight(),  # Only adjust height
@@ -424,6 +709,8 @@ class DeckTab(tk.Frame):
 
     def _on_mousewheel(self, event):
         """Handles mouse wheel scrolling for both Windows and Linux/Mac."""
+        if not self.built:
+            return
         if event.num == 4:  # Linux/macOS scroll up
             self.canvas.yview_scroll(-1, "units")
         elif event.num == 5:  # Linux/macOS scroll down
@@ -441,7 +728,7 @@ class DeckTab(tk.Frame):
 
     def _on_frame_configure(self, event=None):
         """Ensures the inner frame expands correctly within the canvas."""
-        self.inner_frame.update_idletasks()  # Ensure content sizes are updated
+        # Requested sizes are already current when <Configure> is delivered
         inner_width = self.inner_frame.winfo_reqwidth()  # Get required width
         inner_height = self.inner_frame.winfo_reqheight()  # Get required height
 
@@ -0,0 +1,328 @@
+# event_log.py
+
+import bisect
+import os
+import shutil
+import struct
+import time
+from array import array
+from collections import namedtuple
+
+EVENTS_SUFFIX = ".events"
+
+OFFENSE = "offense"
+DEFENSE = "defense"
+
+# Binary layout: MAGIC once at the start of the file, then tagged records
+#   b"B"                          batch start, resets the name table
+#   b"N" <H length> <utf-8 bytes> next name of the batch's name table
+#   b"E" <_EVENT>                 one match event, names given as table ids
+# Every flush appends one batch, so appending never needs to read the file.
+MAGIC = b"WFEV\x01"
+BATCH = b"B"
+NAME = b"N"
+EVENT = b"E"
+
+_NAME_LENGTH = struct.Struct("<H")
+# timestamp, deck id, faction id, warlord id, flags, delta
+_EVENT = struct.Struct("<dIIIBb")
+_FLAG_DEFENSE = 1
+_FLAG_WIN = 2
+
+MatchEvent = namedtuple(
+    "MatchEvent",
+    ["timestamp", "deck_name", "faction_name", "warlord_name", "side", "won", "delta"],
+)
+
+
+def events_path(filename):
+    """Path of the event log that belongs to the save file at filename."""
+    return filename + EVENTS_SUFFIX
+
+
+def event_for_counter(deck_name, faction_name, warlord_name, key, delta, timestamp):
+    """MatchEvent for a click on the counter key ("off_wins", ...)."""
+    side = OFFENSE if key.startswith("off_") else DEFENSE
+    return MatchEvent(
+        timestamp,
+        deck_name,
+        faction_name,
+        warlord_name,
+        side,
+        key.endswith("_wins"),
+        delta,
+    )
+
+
+def encode_events(events):
+    """One batch (bytes) holding events."""
+    names = {}
+    out = [BATCH]
+
+    def name_id(name):
+        if name not in names:
+            data = name.encode("utf-8")
+            out.append(NAME + _NAME_LENGTH.pack(len(data)) + data)
+            names[name] = len(names)
+        return names[name]
+
+    for e in events:
+        flags = (_FLAG_DEFENSE if e.side == DEFENSE else 0) | (
+            _FLAG_WIN if e.won else 0
+        )
+        ids = (name_id(e.deck_name), name_id(e.faction_name), name_id(e.warlord_name))
+        out.append(EVENT + _EVENT.pack(e.timestamp, *ids, flags, e.delta))
+    return b"".join(out)
+
+
+def decode_events(data):
+    """
+    Decode an event log. Returns (events, good_end): good_end is the offset
+    after the last complete record, len(data) unless a crash tore the last
+    record (which is skipped).
+    """
+    if not data.startswith(MAGIC):
+        raise ValueError("Not a match event log")
+    events = []
+    names = []
+    pos = len(MAGIC)
+    end = len(data)
+    while pos < end:
+        good_end = pos
+        tag_end = pos + 1
+        tag = data[pos:tag_end]
+        pos = tag_end
+        if tag == BATCH:
+            names = []
+        elif tag == NAME and pos + _NAME_LENGTH.size <= end:
+            (length,) = _NAME_LENGTH.unpack_from(data, pos)
+            start = pos + _NAME_LENGTH.size
+            if start + length > end:
+                return events, good_end
+            stop = start + length
+            names.append(data[start:stop].decode("utf-8"))
+            pos = stop
+        elif tag == EVENT and pos + _EVENT.size <= end:
+            timestamp, deck_id, faction_id, warlord_id, flags, delta = (
+                _EVENT.unpack_from(data, pos)
+            )
+            pos += _EVENT.size
+            events.append(
+                MatchEvent(
+                    timestamp,
+                    names[deck_id],
+                    names[faction_id],
+                    names[warlord_id],
+                    DEFENSE if flags & _FLAG_DEFENSE else OFFENSE,
+                    bool(flags & _FLAG_WIN),
+                    delta,
+                )
+            )
+        else:
+            return events, good_end
+    return events, end
+
+
+def read_events(path):
+    """All events stored at path (see decode_events)."""
+    with open(path, "rb") as f:
+        return decode_events(f.read())
+
+
+###############################################################################
+# Rolling time series
+#
+#   Outcomes of one slice (a warlord, optionally restricted to a deck and/or a
+#   side) in the order they were played, with a running prefix sum of wins.
+#   Wins over the last N games or since a time are two prefix lookups, never a
+#   rescan of the log. Retracting an event (a right-click correction) only
+#   recomputes the prefix sums after it, which is normally the last few games.
+###############################################################################
+class RollingSeries:
+    def __init__(self):
+        self.seqs = array("q")  # event sequence number, to match retractions
+        self.timestamps = array("d")
+        self.outcomes = array("b")  # 1 = win, 0 = loss
+        self.win_prefix = array("l", [0])  # wins among the first i outcomes
+
+    def __len__(self):
+        return len(self.outcomes)
+
+    def append(self, seq, timestamp, won):
+        self.seqs.append(seq)
+        self.timestamps.append(timestamp)
+        self.outcomes.append(1 if won else 0)
+        self.win_prefix.append(self.win_prefix[-1] + (1 if won else 0))
+
+    def last_seq(self, won):
+        """Sequence number of the most recent outcome equal to won, or None."""
+        outcome = 1 if won else 0
+        for i in range(len(self.outcomes) - 1, -1, -1):
+            if self.outcomes[i] == outcome:
+                return self.seqs[i]
+        return None
+
+    def remove(self, seq):
+        """Drop the outcome recorded under seq and fix the prefix sums."""
+        for i in range(len(self.seqs) - 1, -1, -1):
+            if self.seqs[i] == seq:
+                break
+        else:
+            return
+        del self.seqs[i]
+        del self.timestamps[i]
+        del self.outcomes[i]
+        kept = i + 1
+        del self.win_prefix[kept:]
+        wins = self.win_prefix[i]
+        for outcome in self.outcomes[i:]:
+            wins += outcome
+            self.win_prefix.append(wins)
+
+    def window(self, n):
+        """(wins, matches) over the last n games."""
+        matches = min(n, len(self.outcomes))
+        return self.win_prefix[-1] - self.win_prefix[-1 - matches], matches
+
+    def since(self, timestamp):
+        """(wins, matches) over the games played at or after timestamp."""
+        first = bisect.bisect_left(self.timestamps, timestamp)
+        return self.win_prefix[-1] - self.win_prefix[first], len(self.outcomes) - first
+
+    def win_rate(self, n=None):
+        """Win rate in percent over the last n games (all games if n is None)."""
+        wins, matches = self.window(len(self.outcomes) if n is None else n)
+        return (100.0 * wins / matches) if matches > 0 else 0.0
+
+
+class EventHistory:
+    """RollingSeries for every warlord, per deck and side and across them."""
+
+    def __init__(self, events=()):
+        # (deck_name or None, faction_name, warlord_name, side or None) -> series
+        self.series = {}
+        self.next_seq = 0
+        for event in events:
+            self.add(event)
+
+    def _keys(self, event):
+        for deck_name in (event.deck_name, None):
+            for side in (event.side, None):
+                yield (deck_name, event.faction_name, event.warlord_name, side)
+
+    def add(self, event):
+        keys = list(self._keys(event))
+        for _ in range(abs(event.delta)):
+            if event.delta > 0:
+                seq = self.next_seq
+                self.next_seq += 1
+                for key in keys:
+                    self.series.setdefault(key, RollingSeries()).append(
+                        seq, event.timestamp, event.won
+                    )
+                continue
+            # A decrement takes back the most recent matching game
+            exact = self.series.get(keys[0])
+            seq = exact.last_seq(event.won) if exact is not None else None
+            if seq is None:
+                continue
+            for key in keys:
+                self.series[key].remove(seq)
+
+    def get(self, faction_name, warlord_name, deck_name=None, side=None):
+        """The series of a warlord; empty if it has no recorded games."""
+        key = (deck_name, faction_name, warlord_name, side)
+        return self.series.get(key) or RollingSeries()
+
+    def win_rate_last(self, n, faction_name, warlord_name, deck_name=None, side=None):
+        """Win rate in percent of a warlord over its last n games."""
+        return self.get(faction_name, warlord_name, deck_name, side).win_rate(n)
+
+
+###############################################################################
+# Event log attached to a save file
+###############################################################################
+class EventLog:
+    """Events recorded this session, appended to "<save file>.events" on save."""
+
+    def __init__(self):
+        self.path = None
+        self.pending = []
+        self.bad_bytes = 0
+        self._history = None
+        self._repaired = None  # path whose torn tail (if any) was cut off
+
+    def attach(self, path):
+        """Use the event log at path (history is reloaded on next use)."""
+        if path != self.path:
+            self.path = path
+            self._history = None
+
+    def rebase(self, path):
+        """Carry the stored events over to path (e.g. on Save As)."""
+        if path == self.path:
+            return
+        if self.path is not None and os.path.exists(self.path):
+            shutil.copyfile(self.path, path)
+        elif os.path.exists(path):
+            os.remove(path)
+        self.path = path
+
+    def clear(self):
+        self.path = None
+        self.pending = []
+        self._history = None
+
+    def record_counter(self, deck_name, faction_name, warlord_name, key, delta):
+        event = event_for_counter(
+            deck_name, faction_name, warlord_name, key, delta, time.time()
+        )
+        self.pending.append(event)
+        if self._history is not None:
+            self._history.add(event)
+
+    def repair(self):
+        """
+        Cut a record torn by a crash off the end of the attached file, so the
+        events appended after it stay readable. Returns the bytes removed.
+        """
+        self._repaired = self.path
+        if self.path is None or not os.path.exists(self.path):
+            return 0
+        with open(self.path, "r+b") as f:
+            data = f.read()
+            if MAGIC.startswith(data):
+                good_end = 0  # empty, or torn within the header
+            else:
+                _events, good_end = decode_events(data)
+            if good_end < len(data):
+                f.truncate(good_end)
+        return len(data) - good_end
+
+    def flush(self):
+        """Append pending events to the attached file. Returns the count."""
+        count = len(self.pending)
+        if not count or self.path is None:
+            return 0
+        if self._repaired != self.path:
+            self.repair()
+        with open(self.path, "ab") as f:
+            if f.tell() == 0:
+                f.write(MAGIC)
+            f.write(encode_events(self.pending))
+        self.pending = []
+        return count
+
+    def history(self):
+        """EventHistory of the stored and pending events (loaded once)."""
+        if self._history is None:
+            events = []
+            if self.path is not None and os.path.exists(self.path):
+                with open(self.path, "rb") as f:
+                    data = f.read()
+                events, good_end = decode_events(data)
+                self.bad_bytes = len(data) - good_end
+            self._history = EventHistory(events)
+            for event in self.pending:
+                self._history.add(event)
+        return self._history
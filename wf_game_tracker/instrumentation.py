@@ -0,0 +1,218 @@
+# instrumentation.py
+
+import bisect
+import cProfile
+import functools
+import io
+import json
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+
+# Opt-in through the environment (or run.py --profile):
+#   WF_TRACKER_PROFILE=1            time the instrumented operations
+#   WF_TRACKER_PROFILE_OUT=file     where the report is dumped on exit
+#   WF_TRACKER_CAPTURE=op[:mode]    profile the first run of one operation
+#                                   (mode: cprofile, the default, or tracemalloc)
+PROFILE_ENV = "WF_TRACKER_PROFILE"
+PROFILE_OUT_ENV = "WF_TRACKER_PROFILE_OUT"
+CAPTURE_ENV = "WF_TRACKER_CAPTURE"
+
+DEFAULT_OUTPUT = "wf_tracker_perf.json"
+CAPTURE_MODES = ("cprofile", "tracemalloc")
+
+# Upper bounds of the latency buckets in milliseconds (the last one is open)
+BUCKET_BOUNDS_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+BUCKET_LABELS = [f"<={bound}" for bound in BUCKET_BOUNDS_MS] + [
+    f">{BUCKET_BOUNDS_MS[-1]}"
+]
+
+# Lines of profile output kept per capture
+CAPTURE_LINES = 30
+
+
+class Histogram:
+    """Latencies of one operation: count, total, extremes and bucket counts."""
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+        self.buckets = [0] * (len(BUCKET_BOUNDS_MS) + 1)
+
+    def record(self, seconds):
+        ms = seconds * 1000
+        self.count += 1
+        self.total += ms
+        self.min = ms if self.min is None else min(self.min, ms)
+        self.max = ms if self.max is None else max(self.max, ms)
+        self.buckets[bisect.bisect_left(BUCKET_BOUNDS_MS, ms)] += 1
+
+    def percentile(self, p):
+        """Upper bound (ms) of the bucket holding the p-th percentile."""
+        if not self.count:
+            return None
+        rank = p / 100 * self.count
+        seen = 0
+        for index, count in enumerate(self.buckets):
+            seen += count
+            if seen >= rank and count:
+                if index < len(BUCKET_BOUNDS_MS):
+                    return BUCKET_BOUNDS_MS[index]
+                return self.max
+        return self.max
+
+    def as_dict(self):
+        return {
+            "count": self.count,
+            "total_ms": self.total,
+            "mean_ms": self.total / self.count if self.count else None,
+            "min_ms": self.min,
+            "max_ms": self.max,
+            "p50_ms": self.percentile(50),
+            "p95_ms": self.percentile(95),
+            "buckets_ms": {
+                label: count
+                for label, count in zip(BUCKET_LABELS, self.buckets)
+                if count
+            },
+        }
+
+
+###############################################################################
+# Instrumentation
+#
+#   Operations decorated with @timed(name) report their latency to PERF.
+#   While it is disabled the wrapper only checks a flag, so the hooks stay in
+#   place in normal runs. Histograms live in memory; report() feeds the
+#   Help -> Performance dialog and dump() writes them as JSON on exit. One
+#   operation can additionally be captured once with cProfile or tracemalloc.
+###############################################################################
+class Instrumentation:
+    def __init__(self):
+        self.enabled = False
+        self.output = None
+        self.capture = None  # operation to capture once
+        self.capture_mode = "cprofile"
+        self.captures = {}  # operation -> profile text
+        self.histograms = {}
+        self.lock = threading.Lock()  # saves are timed on the worker thread
+
+    def configure(
+        self, enabled=True, output=DEFAULT_OUTPUT, capture=None, mode="cprofile"
+    ):
+        if mode not in CAPTURE_MODES:
+            raise ValueError(f"Unknown capture mode: {mode}")
+        self.enabled = enabled
+        self.output = output
+        self.capture = capture
+        self.capture_mode = mode
+
+    def configure_from_env(self, environ=os.environ):
+        """Apply the WF_TRACKER_PROFILE* / WF_TRACKER_CAPTURE settings, if any."""
+        capture = environ.get(CAPTURE_ENV)
+        if environ.get(PROFILE_ENV, "0") in ("", "0") and not capture:
+            return
+        name, _sep, mode = (capture or "").partition(":")
+        self.configure(
+            output=environ.get(PROFILE_OUT_ENV, DEFAULT_OUTPUT),
+            capture=name or None,
+            mode=mode or "cprofile",
+        )
+
+    def reset(self):
+        with self.lock:
+            self.histograms = {}
+            self.captures = {}
+
+    def record(self, name, seconds):
+        with self.lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = Histogram()
+            histogram.record(seconds)
+
+    def call(self, name, func, *args, **kwargs):
+        """func(*args, **kwargs), timed as name (and captured if asked to)."""
+        if name == self.capture and name not in self.captures:
+            return self._capture(name, func, *args, **kwargs)
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def _capture(self, name, func, *args, **kwargs):
+        self.captures[name] = ""  # capture once, even if func re-enters
+        start = time.perf_counter()
+        if self.capture_mode == "tracemalloc":
+            tracemalloc.start()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                snapshot = tracemalloc.take_snapshot()
+                tracemalloc.stop()
+                self.record(name, time.perf_counter() - start)
+                stats = snapshot.statistics("lineno")[:CAPTURE_LINES]
+                self.captures[name] = "\n".join(str(stat) for stat in stats)
+        profile = cProfile.Profile()
+        try:
+            return profile.runcall(func, *args, **kwargs)
+        finally:
+            self.record(name, time.perf_counter() - start)
+            text = io.StringIO()
+            stats = pstats.Stats(profile, stream=text).sort_stats("cumulative")
+            stats.print_stats(CAPTURE_LINES)
+            self.captures[name] = text.getvalue()
+
+    def as_dict(self):
+        with self.lock:
+            return {
+                "operations": {
+                    name: histogram.as_dict()
+                    for name, histogram in sorted(self.histograms.items())
+                },
+                "captures": dict(self.captures),
+            }
+
+    def report(self):
+        """Plain-text table of the histograms, for the Performance dialog."""
+        if not self.histograms:
+            return "No operations recorded yet."
+        lines = []
+        for name, stats in self.as_dict()["operations"].items():
+            lines.append(
+                f"{name}: {stats['count']}x, mean {stats['mean_ms']:.1f} ms,"
+                f" p95 <= {stats['p95_ms']:.1f} ms, max {stats['max_ms']:.1f} ms"
+            )
+        return "\n".join(lines)
+
+    def dump(self, extra=None):
+        """Write the histograms (plus extra) to self.output as JSON."""
+        if not self.enabled or not self.output:
+            return
+        document = self.as_dict()
+        document.update(extra or {})
+        with open(self.output, "w", encoding="utf-8") as f:
+            json.dump(document, f, indent=2)
+
+
+PERF = Instrumentation()
+
+
+def timed(name):
+    """Decorator: report calls of the function to PERF as operation name."""
+
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not PERF.enabled:
+                return func(*args, **kwargs)
+            return PERF.call(name, func, *args, **kwargs)
+
+        return wrapper
+
+    return decorate
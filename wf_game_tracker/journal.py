@@ -0,0 +1,148 @@
+# journal.py
+
+import json
+import os
+
+from wf_game_tracker.master_data import new_deck
+
+JOURNAL_SUFFIX = ".journal"
+
+# Record tags, one compact JSON array per line:
+#   ["c", deck_index, faction_name, warlord_name, key, delta]  counter change
+#   ["r", deck_index, deck_name]                               deck renamed
+#   ["a", deck_name]                                           deck appended
+COUNTER = "c"
+RENAME = "r"
+ADD_DECK = "a"
+
+_RECORD_LENGTHS = {COUNTER: 6, RENAME: 3, ADD_DECK: 2}
+
+
+def journal_path(filename):
+    """Path of the journal that belongs to the snapshot at filename."""
+    return filename + JOURNAL_SUFFIX
+
+
+###############################################################################
+# Append-only match journal
+#
+#   Instead of rewriting the whole save file, changes made since the last
+#   snapshot are appended to "<snapshot>.journal". Loading replays the journal
+#   onto the snapshot; compacting writes a new snapshot and drops the journal.
+###############################################################################
+class MatchJournal:
+    """Changes made since the last snapshot, waiting to be appended."""
+
+    def __init__(self):
+        self.pending = []
+
+    def record_counter(self, deck_index, faction_name, warlord_name, key, delta):
+        self.pending.append(
+            [COUNTER, deck_index, faction_name, warlord_name, key, delta]
+        )
+
+    def record_rename(self, deck_index, deck_name):
+        # Typing a name renames on every key press; keep only the last one
+        if (
+            self.pending
+            and self.pending[-1][0] == RENAME
+            and self.pending[-1][1] == deck_index
+        ):
+            self.pending[-1][2] = deck_name
+        else:
+            self.pending.append([RENAME, deck_index, deck_name])
+
+    def record_new_deck(self, deck_name):
+        self.pending.append([ADD_DECK, deck_name])
+
+    def clear(self):
+        self.pending = []
+
+    def flush(self, path):
+        """Append pending records to path and fsync. Returns the record count."""
+        count = len(self.pending)
+        if count:
+            lines = "".join(
+                json.dumps(record, separators=(",", ":")) + "\n"
+                for record in self.pending
+            )
+            with open(path, "a", encoding="utf-8") as f:
+                f.write(lines)
+                f.flush()
+                os.fsync(f.fileno())
+        self.pending = []
+        return count
+
+
+class JournalReplay:
+    """Journal records grouped by deck, ready to be applied while loading."""
+
+    def __init__(self, records=()):
+        self.ops_by_deck = {}
+        self.new_deck_names = []
+        self.bad_records = 0
+        for record in records:
+            self.add(record)
+
+    def add(self, record):
+        tag = record[0] if isinstance(record[0], str) else None
+        if _RECORD_LENGTHS.get(tag) != len(record):
+            self.bad_records += 1
+        elif tag == ADD_DECK:
+            self.new_deck_names.append(record[1])
+        else:
+            self.ops_by_deck.setdefault(record[1], []).append(record)
+
+    def apply(self, deck_index, deck):
+        """Apply the records for the snapshot deck at deck_index to deck."""
+        ops = self.ops_by_deck.get(deck_index)
+        if not ops:
+            return
+        warlords = {
+            (f["faction_name"], w["warlord_name"]): w
+            for f in deck["factions"]
+            for w in f["warlords"]
+        }
+        for op in ops:
+            if op[0] == RENAME:
+                deck["deck_name"] = op[2]
+                continue
+            warlord = warlords.get((op[2], op[3]))
+            if warlord is None or op[4] not in warlord:
+                self.bad_records += 1
+                continue
+            warlord[op[4]] += op[5]
+
+    def new_decks(self, first_index):
+        """
+        Build the decks appended by the journal. first_index is the number of
+        decks in the snapshot, i.e. the index of the first appended deck.
+        """
+        decks = []
+        for offset, deck_name in enumerate(self.new_deck_names):
+            deck = new_deck(deck_name)
+            self.apply(first_index + offset, deck)
+            decks.append(deck)
+        return decks
+
+
+def read_journal(path):
+    """
+    Read the journal at path into a JournalReplay. Lines that cannot be
+    decoded (e.g. a record torn by a crash) are counted in bad_records.
+    """
+    replay = JournalReplay()
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                replay.bad_records += 1
+                continue
+            if not isinstance(record, list) or not record:
+                replay.bad_records += 1
+                continue
+            replay.add(record)
+    return replay
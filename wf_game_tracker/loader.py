@@ -0,0 +1,95 @@
+# loader.py
+
+import os
+import queue
+import threading
+
+from wf_game_tracker.journal import journal_path, read_journal
+from wf_game_tracker.storage import storage_for
+
+# Load steps, as tuples whose first item is the kind:
+#   (START, storage)       the file opened; drop the old decks, attach storage
+#   (DECK, deck, diff)     a merged deck (diff is None for journal-added decks)
+#   (ERROR, message)       a deck or journal records that could not be loaded
+# BackgroundLoad adds (FAILED, exception) and a final (DONE,).
+START = "start"
+DECK = "deck"
+ERROR = "error"
+FAILED = "failed"
+DONE = "done"
+
+
+def iter_load_steps(filename):
+    """
+    Stream filename (plus its journal) as load steps. START comes with the
+    first deck, so a file that cannot be opened at all raises before it.
+    """
+    storage = storage_for(filename)
+    replay = None
+    if storage.supports_journal and os.path.exists(journal_path(filename)):
+        replay = read_journal(journal_path(filename))
+
+    started = False
+    snapshot_count = 0
+    for index, merged_deck, diff, error in storage.iter_merged_decks(filename):
+        if not started:
+            yield (START, storage)
+            started = True
+        snapshot_count = index + 1
+        if error is not None:
+            yield (ERROR, f"Deck {index + 1}: {error}")
+            continue
+        if replay is not None:
+            replay.apply(index, merged_deck)
+        yield (DECK, merged_deck, diff)
+    if not started:
+        yield (START, storage)
+
+    if replay is not None:
+        for deck_obj in replay.new_decks(snapshot_count):
+            yield (DECK, deck_obj, None)
+        if replay.bad_records:
+            yield (
+                ERROR,
+                f"Journal: {replay.bad_records} record(s) could not be replayed",
+            )
+
+
+###############################################################################
+# Background load
+#
+#   Reading, parsing and merging run on a worker thread that queues the load
+#   steps; the Tk thread takes them a few at a time (take() never blocks) and
+#   creates the tabs itself, since Tk widgets must stay on the Tk thread.
+###############################################################################
+class BackgroundLoad:
+    def __init__(self, filename):
+        self.filename = filename
+        self.steps = queue.Queue()
+        self.cancelled = threading.Event()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def _run(self):
+        try:
+            for step in iter_load_steps(self.filename):
+                if self.cancelled.is_set():
+                    return
+                self.steps.put(step)
+        except Exception as e:
+            self.steps.put((FAILED, e))
+        self.steps.put((DONE,))
+
+    def cancel(self):
+        """Stop the worker after its current step; queued steps are dropped."""
+        self.cancelled.set()
+
+    def take(self, limit):
+        """Up to limit steps that are ready, in order."""
+        steps = []
+        while len(steps) < limit:
+            try:
+                steps.append(self.steps.get_nowait())
+            except queue.Empty:
+                break
+        return steps
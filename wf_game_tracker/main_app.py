@@ -2,26 +2,111 @@
 
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
-import json
+from collections import OrderedDict
 import os
+import time
 
 # Import our local modules
-from wf_game_tracker.master_data import MASTER_TABLE, deep_copy_master_table
+from wf_game_tracker.aggregates import AggregateCache
+from wf_game_tracker.analytics import deck_totals, side_lines
+from wf_game_tracker.event_log import EventLog, events_path
+from wf_game_tracker.instrumentation import PERF, timed
+from wf_game_tracker.journal import MatchJournal, journal_path
+from wf_game_tracker.loader import (
+    DECK,
+    DONE,
+    ERROR,
+    FAILED,
+    START,
+    BackgroundLoad,
+    iter_load_steps,
+)
+from wf_game_tracker.master_data import new_deck
+from wf_game_tracker.merge_engine import add_to_summary, merge_decks, summarize_diffs
+from wf_game_tracker.save_pipeline import SavePipeline, SnapshotCache, copy_deck
+from wf_game_tracker.storage import FILE_TYPES, JsonStorage, storage_for
 from wf_game_tracker.deck_tab import DeckTab
 
+# Number of per-deck load errors listed in the warning dialog
+MAX_REPORTED_DECK_ERRORS = 10
+
+# Entries listed per leaderboard
+LEADERBOARD_SIZE = 10
+
+# Deck tabs whose grid is kept built; the least recently viewed are released
+MAX_BUILT_TABS = 8
+
+# Tabs taken out of the notebook that are kept for reuse (built ones first);
+# any others are destroyed
+MAX_POOLED_TABS = 8
+
+# Background load: load steps (tabs) handled per Tk callback, and the pause
+# between callbacks so the window stays responsive
+LOAD_STEPS_PER_CHUNK = 25
+LOAD_POLL_MS = 15
+
+# How often the Tk thread checks whether a background save has finished
+SAVE_POLL_MS = 50
+
+# Autosave writes at most once per interval (seconds, overridable through the
+# environment), and only after clicks have paused for AUTOSAVE_QUIET_S
+AUTOSAVE_INTERVAL_S = float(os.environ.get("WF_TRACKER_AUTOSAVE_SECONDS", 60))
+AUTOSAVE_QUIET_S = 2
+
 
 class DeckTrackerApp(tk.Tk):
     def __init__(self):
+        self.started_at = time.perf_counter()
+        # Seconds since started_at: "first_paint" (first idle pass after the
+        # window was laid out) and "interactive" (default decks fully loaded)
+        self.startup_timings = {}
         super().__init__()
         self.title("Deck Tracker V1.1")
 
         # Set minimum size (adjust these values as needed)
         self.minsize(800, 400)
 
+        # Cross-deck totals, kept current on every counter change
+        self.aggregates = AggregateCache()
         self.decks = []
+        self.deck_positions = {}  # id(deck) -> index in self.decks, see deck_position
         self.deck_tabs = []
+        self.built_tabs = OrderedDict()  # built DeckTabs, least recently viewed first
+        self.tab_pool = []  # DeckTabs out of the notebook, waiting to be reused
         self.current_file = None
+        self.last_merge_report = {}  # added/kept/orphaned counts of the last load
+        self.storage = JsonStorage()
+
+        # Changes since the last snapshot, appended on save in journal mode
+        self.journal = MatchJournal()
+        self.journal_saves = tk.BooleanVar(self, value=False)
+        self.journal_needs_snapshot = False
+
+        # Timestamped match events, appended to "<save file>.events" on save
+        self.events = EventLog()
+        self.background_load = None
+        self.load_status = None
+
+        # Snapshots are written on a worker thread; a save requested while one
+        # is running is remembered in pending_save and runs right after it
+        self.save_pipeline = SavePipeline()
+        self.pending_save = None  # (filename, notify)
+        self.save_notify = True
+        self.saved_journal = []
+
+        # Decks changed since the last snapshot are copied again; the others
+        # reuse the copy from the previous save
+        self.snapshot_cache = SnapshotCache()
+        self.unsaved_changes = False
+        self.autosave_enabled = tk.BooleanVar(self, value=True)
+        self.autosave_interval = AUTOSAVE_INTERVAL_S
+        self.autosave_job = None
+        self.last_autosave = time.monotonic()
+        # Set when the last load skipped decks or did not finish: saving would
+        # drop decks from the file, so that is left to an explicit Save
+        self.autosave_suspended = False
         self.create_menu()
+        self.protocol("WM_DELETE_WINDOW", self.exit_app)
 
         self.notebook = ttk.Notebook(self)
         self.notebook.pack(fill=tk.BOTH, expand=True)  # Ensure notebook fills space
@@ -35,9 +120,26 @@ class DeckTrackerApp(tk.Tk):
             self, text="Create New Deck", command=self.handle_add_new_deck
         )
         new_deck_btn.pack(side=tk.BOTTOM, pady=5)
+        # Show the window first; the default decks are loaded in the background
+        self.after_idle(self.record_startup_timing, "first_paint")
         default_save = "default_decks.json"
         if os.path.exists(default_save):
-            self.load_data(default_save)
+            self.load_data_in_background(default_save)
+        else:
+            self.after_idle(self.record_startup_timing, "interactive")
+
+    def record_startup_timing(self, name):
+        """Remember how long after startup name was reached (first time only)."""
+        self.startup_timings.setdefault(name, time.perf_counter() - self.started_at)
+
+    @property
+    def decks(self):
+        return self._decks
+
+    @decks.setter
+    def decks(self, decks):
+        self._decks = decks
+        self.aggregates.rebuild(decks)
 
     def _on_mousewheel_windows(self, event):
         # Figure out which tab is active
@@ -49,6 +151,8 @@ class DeckTrackerApp(tk.Tk):
 
         # Otherwise, get the corresponding DeckTab
         deck_tab_obj = self.deck_tabs[current_tab_idx]
+        if not deck_tab_obj.built:
+            return
         deck_tab_obj.canvas.yview_scroll(int(-1 * (event.delta / 120)), "units")
         return "break"
 
@@ -58,6 +162,8 @@ class DeckTrackerApp(tk.Tk):
             return
 
         deck_tab_obj = self.deck_tabs[current_tab_idx]
+        if not deck_tab_obj.built:
+            return
         if event.num == 4:
             deck_tab_obj.canvas.yview_scroll(-1, "units")
         elif event.num == 5:
@@ -66,14 +172,15 @@ class DeckTrackerApp(tk.Tk):
 
     def _update_scroll_binding(self, event):
         """Ensure mouse scrolling affects the currently selected tab."""
-        current_tab_idx = self.notebook.index("current")
-
         # If no tabs exist, do nothing
         if len(self.deck_tabs) == 0:
             return
 
-        # Get the currently selected DeckTab
+        current_tab_idx = self.notebook.index("current")
+
+        # Get the currently selected DeckTab, building its grid on first view
         deck_tab_obj = self.deck_tabs[current_tab_idx]
+        self.show_deck_tab(deck_tab_obj)
 
         # Rebind scrolling to the active tab's canvas
         self.unbind_all("<MouseWheel>")
@@ -95,157 +202,709 @@ class DeckTrackerApp(tk.Tk):
         filemenu.add_command(label="Save", command=self.save_file)
         filemenu.add_command(label="Save As", command=self.save_file_as)
         filemenu.add_separator()
-        filemenu.add_command(label="Exit", command=self.quit)
+        filemenu.add_checkbutton(label="Journal Saves", variable=self.journal_saves)
+        filemenu.add_checkbutton(
+            label="Autosave",
+            variable=self.autosave_enabled,
+            command=self.schedule_autosave,
+        )
+        filemenu.add_command(label="Compact Journal", command=self.compact_journal)
+        filemenu.add_separator()
+        filemenu.add_command(label="Exit", command=self.exit_app)
         menubar.add_cascade(label="File", menu=filemenu)
+
+        deckmenu = tk.Menu(menubar, tearoff=0)
+        deckmenu.add_command(label="New Deck", command=self.add_new_deck)
+        deckmenu.add_command(
+            label="Duplicate Deck", command=self.duplicate_current_deck
+        )
+        deckmenu.add_command(label="Delete Deck", command=self.delete_current_deck)
+        deckmenu.add_separator()
+        deckmenu.add_command(
+            label="Move Left", command=lambda: self.move_current_deck(-1)
+        )
+        deckmenu.add_command(
+            label="Move Right", command=lambda: self.move_current_deck(1)
+        )
+        menubar.add_cascade(label="Deck", menu=deckmenu)
+
+        summarymenu = tk.Menu(menubar, tearoff=0)
+        summarymenu.add_command(
+            label="Overall Summary", command=self.show_overall_summary
+        )
+        summarymenu.add_command(label="Leaderboards", command=self.show_leaderboards)
+        summarymenu.add_command(label="Matchups", command=self.show_matchups)
+        menubar.add_cascade(label="Summary", menu=summarymenu)
+
+        helpmenu = tk.Menu(menubar, tearoff=0)
+        helpmenu.add_command(label="Performance", command=self.show_performance)
+        menubar.add_cascade(label="Help", menu=helpmenu)
         self.config(menu=menubar)
 
+    @timed("merge")
     def merge_with_master_table(self, loaded_decks):
         """
         Merge the loaded deck data with the MASTER_TABLE, ensuring that
         new factions/warlords from the MASTER_TABLE are included.
+        The added/kept/orphaned counts are kept in self.last_merge_report
+        (the per-deck diffs are not: they name every warlord of every deck).
         """
-        updated_decks = []
-        for loaded_deck in loaded_decks:
-            merged_deck = {
-                "deck_name": loaded_deck.get("deck_name", "Unnamed Deck"),
-                "factions": [],
-            }
-
-            # Merge each faction in MASTER_TABLE
-            for master_faction in MASTER_TABLE:
-                # Check if this faction exists in the loaded deck
-                matching_faction = next(
-                    (
-                        f
-                        for f in loaded_deck["factions"]
-                        if f["faction_name"] == master_faction["faction_name"]
-                    ),
-                    None,
-                )
-                if matching_faction:
-                    # Merge warlords
-                    merged_faction = {
-                        "faction_name": matching_faction["faction_name"],
-                        "warlords": [],
-                    }
-                    for master_warlord in master_faction["warlords"]:
-                        # Check if this warlord exists in the loaded faction
-                        matching_warlord = next(
-                            (
-                                w
-                                for w in matching_faction["warlords"]
-                                if w["warlord_name"] == master_warlord["warlord_name"]
-                            ),
-                            None,
-                        )
-                        if matching_warlord:
-                            # Use the existing warlord's stats
-                            merged_faction["warlords"].append(matching_warlord)
-                        else:
-                            # Add new warlord with zeroed stats
-                            merged_faction["warlords"].append(master_warlord)
-                    merged_deck["factions"].append(merged_faction)
-                else:
-                    # Add the entire new faction from MASTER_TABLE
-                    merged_deck["factions"].append(master_faction)
-
-            updated_decks.append(merged_deck)
-
+        updated_decks, diffs = merge_decks(loaded_decks)
+        self.last_merge_report = summarize_diffs(diffs)
         return updated_decks
 
     def handle_add_new_deck(self):
-        self.create_new_deck()
+        self.add_new_deck()
         # tkinter not threadsafe
-        # thread = threading.Thread(target=self.create_new_deck)
+        # thread = threading.Thread(target=self.add_new_deck)
         # thread.start()
 
     def create_new_deck(self):
-        new_deck = {"deck_name": "New Deck", "factions": deep_copy_master_table()}
-        self.decks.append(new_deck)
-        self.after(0, lambda: self.finalize_new_tab(new_deck))
+        """Same as add_new_deck: the deck and its tab are added together."""
+        return self.add_new_deck()
+
+    def finalize_new_tab(self, deck_obj, position=None):
+        """Add the tab of deck_obj, at position in the notebook (default: last)."""
+        new_tab = self.acquire_tab(deck_obj)
+        if position is None or position >= len(self.deck_tabs):
+            self.notebook.add(new_tab, text=deck_obj["deck_name"])
+            self.deck_tabs.append(new_tab)
+        else:
+            self.notebook.insert(position, new_tab, text=deck_obj["deck_name"])
+            self.deck_tabs.insert(position, new_tab)
+        if self.notebook.select() == str(new_tab):
+            self.show_deck_tab(new_tab)
+
+    def show_deck_tab(self, deck_tab):
+        """
+        Build deck_tab's grid if needed and mark it most recently viewed,
+        releasing the grids of the least recently viewed tabs over the limit.
+        """
+        deck_tab.ensure_built()
+        self.built_tabs[deck_tab] = None
+        self.built_tabs.move_to_end(deck_tab)
+        self.limit_built_tabs()
+
+    def limit_built_tabs(self):
+        while len(self.built_tabs) > MAX_BUILT_TABS:
+            old_tab, _ = self.built_tabs.popitem(last=False)
+            old_tab.release_ui()
+
+    def acquire_tab(self, deck_obj):
+        """
+        A DeckTab (not yet in the notebook) showing deck_obj: a pooled one,
+        preferably built so its grid is only repainted, or a new placeholder.
+        """
+        if not self.tab_pool:
+            return DeckTab(self.notebook, deck_obj, self, lazy=True)
+        built = [tab for tab in self.tab_pool if tab.built]
+        deck_tab = built[-1] if built else self.tab_pool[-1]
+        self.tab_pool.remove(deck_tab)
+        deck_tab.rebind(deck_obj)
+        if deck_tab.built:
+            # Not viewed yet, so it is the first to be released
+            self.built_tabs[deck_tab] = None
+            self.built_tabs.move_to_end(deck_tab, last=False)
+            self.limit_built_tabs()
+        return deck_tab
+
+    def release_tab(self, deck_tab):
+        """
+        Take deck_tab out of the notebook and pool it for reuse, or destroy it
+        if the pool is full (a built tab displaces a placeholder).
+        """
+        self.notebook.forget(deck_tab)
+        self.built_tabs.pop(deck_tab, None)
+        if len(self.tab_pool) >= MAX_POOLED_TABS:
+            spare = None
+            if deck_tab.built:
+                spare = next((tab for tab in self.tab_pool if not tab.built), None)
+            if spare is None:
+                self.destroy_tab(deck_tab)
+                return
+            self.tab_pool.remove(spare)
+            self.destroy_tab(spare)
+        self.tab_pool.append(deck_tab)
 
-    def finalize_new_tab(self, deck_obj):
-        new_tab = DeckTab(self.notebook, deck_obj, self)
-        self.notebook.add(new_tab, text=deck_obj["deck_name"])
-        self.deck_tabs.append(new_tab)
+    def destroy_tab(self, deck_tab):
+        deck_tab.release_ui()
+        deck_tab.destroy()
 
     ###########################################################################
-    # JSON file operations
+    # File operations
     ###########################################################################
     def open_file(self):
         filename = filedialog.askopenfilename(
             title="Open Save File",
-            filetypes=[("JSON files", "*.json"), ("All files", "*.*")],
+            filetypes=FILE_TYPES,
         )
         if filename:
             self.load_data(filename)
 
+    @timed("load")
     def load_data(self, filename):
+        """
+        Stream decks from filename one at a time: each deck is merged with the
+        MASTER_TABLE and gets its tab as soon as it is read, so the first tab
+        shows up before the rest of the file is parsed. Malformed decks are
+        skipped and reported together once the load finishes.
+        """
+        self.cancel_background_load()
+        self.wait_for_save()
+        deck_errors = []
         try:
-            with open(filename, "r", encoding="utf-8") as f:
-                loaded_decks = json.load(f)
-
-            # Merge loaded data with MASTER_TABLE
-            self.decks = self.merge_with_master_table(loaded_decks)
-            self.current_file = filename
-            self.build_tabs()
+            for step in iter_load_steps(filename):
+                self.apply_load_step(step, filename, deck_errors)
         except Exception as e:
+            self.finish_load([], failed=True)
             messagebox.showerror("Load Error", str(e))
+            return
+        self.finish_load(deck_errors)
 
-    def save_file(self):
-        if self.current_file:
-            self.write_data(self.current_file)
-        else:
+    def apply_load_step(self, step, filename, deck_errors):
+        """Apply one step of loader.iter_load_steps to the session."""
+        kind = step[0]
+        if kind == START:
+            self.clear_decks()
+            self.attach_storage(step[1], filename)
+        elif kind == DECK:
+            _kind, deck_obj, diff = step
+            if diff is not None:
+                add_to_summary(self.last_merge_report, diff)
+            self.add_loaded_deck(deck_obj)
+        elif kind == ERROR:
+            deck_errors.append(step[1])
+
+    def finish_load(self, deck_errors, failed=False):
+        """
+        Report the decks that could not be loaded. failed means the load
+        stopped part-way: the session may hold only some of the file's decks.
+        """
+        # Skipped decks shift deck indices, so the journal cannot be appended
+        # to, and autosaving an incomplete session would drop decks from the file
+        if deck_errors or failed:
+            self.journal_needs_snapshot = True
+            self.autosave_suspended = True
+
+        if deck_errors:
+            shown = deck_errors[:MAX_REPORTED_DECK_ERRORS]
+            if len(deck_errors) > len(shown):
+                shown.append(f"... and {len(deck_errors) - len(shown)} more")
+            messagebox.showwarning(
+                "Load Warnings",
+                f"{len(deck_errors)} deck(s) could not be loaded:\n" + "\n".join(shown),
+            )
+
+    ###########################################################################
+    # Background load
+    ###########################################################################
+    def load_data_in_background(self, filename):
+        """
+        Like load_data, but parsing and merging run on a worker thread while
+        the window stays responsive; tabs are added in small chunks from
+        after() callbacks, with a progress indicator at the bottom.
+        """
+        self.cancel_background_load()
+        self.wait_for_save()
+        self.background_load = BackgroundLoad(filename)
+        self.background_errors = []
+        self.background_load_started = time.perf_counter()
+
+        self.load_status = ttk.Frame(self)
+        self.load_status.pack(side=tk.BOTTOM, fill=tk.X, padx=5)
+        self.load_label = ttk.Label(
+            self.load_status, text=f"Loading {os.path.basename(filename)}..."
+        )
+        self.load_label.pack(side=tk.LEFT)
+        self.load_progress = ttk.Progressbar(self.load_status, mode="indeterminate")
+        self.load_progress.pack(side=tk.RIGHT, fill=tk.X, expand=True, padx=5)
+        self.load_progress.start()
+
+        self.after(LOAD_POLL_MS, self.poll_background_load)
+
+    @timed("load.chunk")
+    def poll_background_load(self):
+        """Apply the load steps the worker has ready, then check back later."""
+        load = self.background_load
+        if load is None:
+            return
+        for step in load.take(LOAD_STEPS_PER_CHUNK):
+            kind = step[0]
+            if kind == DONE:
+                self.end_background_load()
+                self.finish_load(self.background_errors)
+                self.record_startup_timing("interactive")
+                if self.autosave_suspended:
+                    self.pending_save = None  # asked for before the warnings
+                if self.pending_save is not None:
+                    (filename, notify), self.pending_save = self.pending_save, None
+                    self.write_data(filename, notify)
+                return
+            if kind == FAILED:
+                self.background_errors = []
+                # Only part of the file arrived: do not let a save replace it
+                self.finish_load([], failed=True)
+                self.pending_save = None
+                messagebox.showerror("Load Error", str(step[1]))
+            else:
+                self.apply_load_step(step, load.filename, self.background_errors)
+        self.load_label.config(
+            text=f"Loading {os.path.basename(load.filename)}: "
+            f"{len(self.decks)} deck(s)"
+        )
+        self.after(LOAD_POLL_MS, self.poll_background_load)
+
+    def end_background_load(self):
+        if PERF.enabled and self.background_load is not None:
+            elapsed = time.perf_counter() - self.background_load_started
+            PERF.record("load.background", elapsed)
+        self.background_load = None
+        if self.load_status is not None:
+            self.load_progress.stop()
+            self.load_status.destroy()
+            self.load_status = None
+
+    def cancel_background_load(self):
+        """Abandon a background load (e.g. another file is being opened)."""
+        if self.background_load is not None:
+            self.background_load.cancel()
+            self.end_background_load()
+            self.pending_save = None  # it would save the next file's decks
+            # The decks that arrived are only part of the file
+            self.finish_load([], failed=True)
+
+    def clear_decks(self):
+        """Drop all decks and their tabs, and close the archives they came from."""
+        archives = list(self.aggregates.archives)
+        self.decks = []
+        self.deck_positions = {}
+        self.last_merge_report = {}
+        self.journal.clear()
+        self.journal_needs_snapshot = False
+        self.events.clear()
+        self.snapshot_cache.clear()
+        self.unsaved_changes = False
+        self.autosave_suspended = False
+        self.build_tabs()
+        for archive in archives:
+            archive.close()
+
+    def add_loaded_deck(self, deck_obj):
+        """Append a deck and its tab; the first tab is painted right away."""
+        self.decks.append(deck_obj)
+        self.aggregates.add_deck(deck_obj)
+        self.finalize_new_tab(deck_obj)
+        if len(self.decks) == 1:
+            self.update_idletasks()
+
+    def save_file(self, notify=True):
+        """Save to the current file; notify=False skips the "Saved" popups."""
+        if notify:
+            self.autosave_suspended = False  # the user chose to save
+        if not self.current_file:
             self.save_file_as()
+        elif self.storage.live:
+            try:
+                self.events.flush()
+            except Exception as e:
+                messagebox.showerror("Save Error", str(e))
+                return
+            self.unsaved_changes = False
+            if notify:
+                messagebox.showinfo(
+                    "Saved", f"All changes are saved in {self.current_file}"
+                )
+        elif self.save_pipeline.busy or self.background_load is not None:
+            self.write_data(self.current_file, notify)
+        elif self.journal_saves.get() and self.can_append_journal():
+            self.append_journal(notify)
+        else:
+            self.write_data(self.current_file, notify)
 
     def save_file_as(self):
         filename = filedialog.asksaveasfilename(
             title="Save File As",
             defaultextension=".json",
-            filetypes=[("JSON files", "*.json"), ("All files", "*.*")],
+            filetypes=FILE_TYPES,
         )
         if filename:
+            self.autosave_suspended = False
             self.write_data(filename)
             self.current_file = filename
 
-    def write_data(self, filename):
+    @timed("save.snapshot")
+    def write_data(self, filename, notify=True):
+        """
+        Write a full snapshot; it supersedes any journal next to filename.
+        The snapshot is taken now and written on a worker thread; finish_save
+        reports the outcome (a live database is waited for, so that no edit
+        falls between the snapshot and attaching it). Requests made while a
+        save runs are coalesced into one more save of the latest data once it
+        is done; requests made while a background load runs wait for all of
+        its decks.
+        """
         try:
-            with open(filename, "w", encoding="utf-8") as f:
-                json.dump(self.decks, f, indent=2)
-            messagebox.showinfo("Saved", f"Data saved to {filename}")
+            storage = storage_for(filename, self.snapshot_cache.fragments)
+            if storage.live and self.storage.live and filename == self.current_file:
+                # Already written row by row; reattaching would reopen the file
+                self.finish_save(self.storage, filename, notify)
+                return
+            if self.save_pipeline.busy or self.background_load is not None:
+                self.pending_save = (filename, notify)
+                return
+            # Open decks may be mapped from the very archive being replaced
+            for archive in self.aggregates.archives:
+                if archive.maps(filename):
+                    archive.detach()
+            # Journal records up to now are covered by the snapshot
+            self.saved_journal = self.journal.pending
+            self.journal.pending = []
+            snapshot = self.snapshot_cache.snapshot(self.decks)
+            self.unsaved_changes = False
+            self.save_pipeline.start(storage, filename, snapshot)
+            self.save_notify = notify
+            if storage.live:
+                # Edits go to the storage attached once the save lands; any
+                # made before then would never reach the new database
+                self.poll_save(wait=True)
+            else:
+                self.after(SAVE_POLL_MS, self.poll_save)
         except Exception as e:
             messagebox.showerror("Save Error", str(e))
 
+    def poll_save(self, wait=False):
+        """Handle a finished background save, or check again later."""
+        result = self.save_pipeline.poll(wait=wait)
+        if result is None:
+            if self.save_pipeline.busy:
+                self.after(SAVE_POLL_MS, self.poll_save)
+            return
+        storage, filename, error = result
+        if error is None:
+            self.events.rebase(events_path(filename))
+            self.attach_storage(storage, filename)
+            self.finish_save(storage, filename, self.save_notify)
+        else:
+            # Nothing was saved: the snapshot's journal records are still due
+            self.journal.pending = self.saved_journal + self.journal.pending
+            self.unsaved_changes = True
+            messagebox.showerror("Save Error", str(error))
+        self.saved_journal = []
+
+        if self.pending_save is not None:
+            (filename, notify), self.pending_save = self.pending_save, None
+            self.write_data(filename, notify)
+
+    def wait_for_save(self):
+        """Block until background saves (including a coalesced one) are done."""
+        while self.save_pipeline.busy:
+            self.poll_save(wait=True)
+
+    def finish_save(self, storage, filename, notify=True):
+        """Bookkeeping once filename holds a full snapshot."""
+        try:
+            self.events.flush()
+            if storage.supports_journal and os.path.exists(journal_path(filename)):
+                os.remove(journal_path(filename))
+            self.journal_needs_snapshot = False
+            if notify:
+                messagebox.showinfo("Saved", f"Data saved to {filename}")
+        except Exception as e:
+            messagebox.showerror("Save Error", str(e))
+
+    def exit_app(self):
+        """
+        Quit once unsaved changes are saved and any background save has
+        landed. Changes are saved quietly where autosave would have written
+        them; otherwise the user is asked first.
+        """
+        self.cancel_background_load()
+        if self.autosave_job is not None:
+            self.after_cancel(self.autosave_job)
+            self.autosave_job = None
+        if self.unsaved_changes:
+            if (
+                self.autosave_enabled.get()
+                and self.current_file
+                and not self.autosave_suspended
+            ):
+                self.save_file(notify=False)
+            else:
+                answer = messagebox.askyesnocancel(
+                    "Quit", "Save changes before quitting?"
+                )
+                if answer is None:
+                    return
+                if answer:
+                    self.save_file()
+                else:
+                    self.unsaved_changes = False
+        self.wait_for_save()
+        if self.unsaved_changes:
+            return  # The save failed or was cancelled; keep the window open
+        try:
+            PERF.dump({"startup": self.startup_timings})
+        except OSError as e:
+            messagebox.showerror("Performance", f"Could not write {PERF.output}: {e}")
+        self.quit()
+
+    ###########################################################################
+    # Autosave
+    #
+    #   Changes mark their deck dirty and (re)schedule one autosave: it runs
+    #   once clicks have paused for AUTOSAVE_QUIET_S, but never sooner than
+    #   autosave_interval after the previous one. A save with nothing changed
+    #   is skipped, and so is every autosave after a load that skipped
+    #   malformed decks, failed part-way or was cancelled, until the user
+    #   saves explicitly.
+    ###########################################################################
+    def mark_changed(self, deck_obj):
+        """Note that deck_obj differs from the last saved snapshot."""
+        self.snapshot_cache.mark_dirty(deck_obj)
+        self.unsaved_changes = True
+        self.schedule_autosave()
+
+    def schedule_autosave(self):
+        """(Re)arm the autosave timer: every change pushes it back."""
+        if self.autosave_job is not None:
+            self.after_cancel(self.autosave_job)
+            self.autosave_job = None
+        if not self.unsaved_changes:
+            return
+        if not self.autosave_enabled.get() or self.autosave_suspended:
+            return
+        due = self.last_autosave + self.autosave_interval - time.monotonic()
+        delay = max(AUTOSAVE_QUIET_S, due)
+        self.autosave_job = self.after(int(delay * 1000), self.autosave)
+
+    def autosave(self):
+        """Save quietly to the current file if anything changed."""
+        self.autosave_job = None
+        if not self.autosave_enabled.get() or not self.unsaved_changes:
+            return
+        if self.autosave_suspended or not self.current_file:
+            return  # Nowhere to save yet; Save As is up to the user
+        self.last_autosave = time.monotonic()
+        self.save_file(notify=False)
+
+    def attach_storage(self, storage, filename):
+        """Make storage the backend of the session for filename."""
+        if storage is not self.storage:
+            self.storage.close()
+            self.storage = storage
+        storage.attach(filename)
+        self.events.attach(events_path(filename))
+        self.current_file = filename
+
+    ###########################################################################
+    # Journal
+    ###########################################################################
+    def can_append_journal(self):
+        """True if the current file is a snapshot the journal lines up with."""
+        return not self.journal_needs_snapshot and os.path.exists(self.current_file)
+
+    @timed("save.journal")
+    def append_journal(self, notify=True):
+        """Save by appending the changes since the last save to the journal."""
+        filename = journal_path(self.current_file)
+        try:
+            count = self.journal.flush(filename)
+            self.events.flush()
+            self.unsaved_changes = False
+            if notify:
+                messagebox.showinfo(
+                    "Saved", f"{count} change(s) appended to {filename}"
+                )
+        except Exception as e:
+            messagebox.showerror("Save Error", str(e))
+
+    def compact_journal(self):
+        """Fold the journal into a new snapshot of the current file."""
+        if self.current_file:
+            self.write_data(self.current_file)
+        else:
+            self.save_file_as()
+
+    def deck_position(self, deck_obj):
+        """
+        Index of deck_obj in self.decks (by identity). Looked up on every
+        click, so the indexes are cached; a stale entry (after decks were
+        inserted, removed or moved) rebuilds the cache.
+        """
+        index = self.deck_positions.get(id(deck_obj))
+        if index is not None and index < len(self.decks):
+            if self.decks[index] is deck_obj:
+                return index
+        self.deck_positions = {id(deck): i for i, deck in enumerate(self.decks)}
+        index = self.deck_positions.get(id(deck_obj))
+        if index is None:
+            raise ValueError("deck is not part of this session")
+        return index
+
+    def on_counter_changed(self, deck_obj, faction_name, warlord_name, key, delta):
+        """Called by a DeckTab after a warlord counter was changed by delta."""
+        self.aggregates.apply(deck_obj, faction_name, warlord_name, key, delta)
+        self.events.record_counter(
+            deck_obj["deck_name"], faction_name, warlord_name, key, delta
+        )
+        position = self.deck_position(deck_obj)
+        if self.storage.supports_journal:
+            self.journal.record_counter(
+                position, faction_name, warlord_name, key, delta
+            )
+        self.storage.record_counter(position, faction_name, warlord_name, key, delta)
+        self.mark_changed(deck_obj)
+
+    def on_deck_renamed(self, deck_obj):
+        """Called by a DeckTab after the deck title was edited."""
+        position = self.deck_position(deck_obj)
+        if self.storage.supports_journal:
+            self.journal.record_rename(position, deck_obj["deck_name"])
+        self.storage.record_rename(position, deck_obj["deck_name"])
+        self.mark_changed(deck_obj)
+
+    def record_new_deck(self, deck_obj, position=None):
+        """
+        Record that deck_obj was inserted into self.decks at position (by
+        default it was appended). The journal only knows appended blank
+        decks; anything else is left to the next full snapshot.
+        """
+        last = len(self.decks) - 1
+        if position is None:
+            position = last
+        self.aggregates.add_deck(deck_obj)
+        if position != last or any(deck_totals(deck_obj).values()):
+            self.mark_structure_changed()
+        elif self.storage.supports_journal:
+            self.journal.record_new_deck(deck_obj["deck_name"])
+        self.storage.record_new_deck(position, deck_obj)
+        self.mark_changed(deck_obj)
+
+    def mark_structure_changed(self):
+        """
+        Decks were inserted, deleted or moved in a way the journal cannot
+        replay: the next save writes a full snapshot instead.
+        """
+        self.journal_needs_snapshot = True
+        self.unsaved_changes = True
+        self.schedule_autosave()
+
     ###########################################################################
     # Deck & Tabs Management
     ###########################################################################
+    @timed("tabs.rebuild")
     def build_tabs(self):
-        """Remove existing tabs and build them from self.decks."""
-        # Clear old tabs
-        for tab_id in self.notebook.tabs():
-            self.notebook.forget(tab_id)
-
-        # Also clear your deck_tabs list, so we don't mix old references
-        self.deck_tabs.clear()
+        """
+        Make the tabs match self.decks. Existing tabs are rebound to the deck
+        at their position (a built grid is reused when the layout matches),
+        missing ones come from the pool, and surplus ones go back to it.
+        """
+        while len(self.deck_tabs) > len(self.decks):
+            self.release_tab(self.deck_tabs.pop())
 
         for deck_index, deck_obj in enumerate(self.decks):
             deck_name = deck_obj.get("deck_name", f"Deck {deck_index+1}")
 
-            # Create a DeckTab directly in the notebook
-            deck_tab = DeckTab(self.notebook, deck_obj, self)
+            if deck_index < len(self.deck_tabs):
+                deck_tab = self.deck_tabs[deck_index]
+                deck_tab.rebind(deck_obj)
+                if not deck_tab.built:
+                    self.built_tabs.pop(deck_tab, None)
+                self.notebook.tab(deck_tab, text=deck_name)
+                continue
 
-            # Add DeckTab as a new tab
+            # A pooled or new placeholder DeckTab; its grid is built when selected
+            deck_tab = self.acquire_tab(deck_obj)
             self.notebook.add(deck_tab, text=deck_name)
             self.deck_tabs.append(deck_tab)
 
+        if self.deck_tabs:
+            self.show_deck_tab(self.deck_tabs[self.notebook.index("current")])
+
+    ###########################################################################
+    # Deck operations
+    #
+    #   Each one updates self.decks, the affected tab only, the aggregates and
+    #   the storage backend, so the cost does not grow with the session.
+    ###########################################################################
     def add_new_deck(self):
         """
         Create a new deck with a copy of the MASTER_TABLE structure,
-        set default name, then rebuild tabs to display it.
+        set default name, and add its tab at the end.
         """
-        new_deck = {"deck_name": "New Deck", "factions": deep_copy_master_table()}
-        self.decks.append(new_deck)
-        self.build_tabs()
+        deck_obj = new_deck()
+        self.decks.append(deck_obj)
+        self.record_new_deck(deck_obj)
+        self.finalize_new_tab(deck_obj)
+        return deck_obj
+
+    def current_deck(self):
+        """The deck of the selected tab, or None if there are no tabs."""
+        if not self.deck_tabs:
+            return None
+        return self.decks[self.notebook.index("current")]
+
+    def duplicate_deck(self, deck_obj):
+        """Insert a copy of deck_obj (counters included) right after it."""
+        position = self.deck_position(deck_obj) + 1
+        copy = copy_deck(deck_obj)
+        copy["deck_name"] = f"{deck_obj['deck_name']} (copy)"
+        self.decks.insert(position, copy)
+        self.record_new_deck(copy, position)
+        self.finalize_new_tab(copy, position)
+        return copy
+
+    def delete_deck(self, deck_obj):
+        """Remove deck_obj and its tab."""
+        position = self.deck_position(deck_obj)
+        del self.decks[position]
+        self.release_tab(self.deck_tabs.pop(position))
+        self.aggregates.remove_deck(deck_obj)
+        self.storage.record_delete_deck(position)
+        self.mark_structure_changed()
+
+    def move_deck(self, deck_obj, new_position):
+        """Move deck_obj (and its tab) to new_position in the deck order."""
+        position = self.deck_position(deck_obj)
+        new_position = max(0, min(new_position, len(self.decks) - 1))
+        if new_position == position:
+            return
+        self.decks.insert(new_position, self.decks.pop(position))
+        deck_tab = self.deck_tabs.pop(position)
+        self.deck_tabs.insert(new_position, deck_tab)
+        self.notebook.insert(new_position, deck_tab)
+        self.storage.record_move_deck(position, new_position)
+        self.mark_structure_changed()
+
+    def rename_deck(self, deck_obj, deck_name):
+        """Rename deck_obj, updating its tab and title."""
+        if deck_name == deck_obj["deck_name"]:
+            return
+        deck_obj["deck_name"] = deck_name
+        deck_tab = self.deck_tabs[self.deck_position(deck_obj)]
+        self.notebook.tab(deck_tab, text=deck_name)
+        deck_tab.show_deck_name()
+        self.on_deck_renamed(deck_obj)
+
+    def duplicate_current_deck(self):
+        deck_obj = self.current_deck()
+        if deck_obj is not None:
+            copy = self.duplicate_deck(deck_obj)
+            self.notebook.select(self.deck_tabs[self.deck_position(copy)])
+
+    def delete_current_deck(self):
+        deck_obj = self.current_deck()
+        if deck_obj is None:
+            return
+        if messagebox.askyesno(
+            "Delete Deck", f"Delete {deck_obj['deck_name']} and all its results?"
+        ):
+            self.delete_deck(deck_obj)
+
+    def move_current_deck(self, offset):
+        deck_obj = self.current_deck()
+        if deck_obj is not None:
+            self.move_deck(deck_obj, self.deck_position(deck_obj) + offset)
 
     ###########################################################################
     # Summary
@@ -254,34 +913,129 @@ class DeckTrackerApp(tk.Tk):
         """
         Summarize across all decks: total matches, total wins, total losses, overall WR.
         """
-        total_matches = 0
-        total_wins = 0
-        total_losses = 0
-
-        for deck in self.decks:
-            for faction_data in deck["factions"]:
-                for wlord in faction_data["warlords"]:
-                    ow = wlord["off_wins"]
-                    ol = wlord["off_losses"]
-                    dw = wlord["def_wins"]
-                    dl = wlord["def_losses"]
-                    matches = ow + ol + dw + dl
-                    wins = ow + dw
-                    losses = ol + dl
-
-                    total_matches += matches
-                    total_wins += wins
-                    total_losses += losses
-
-        if total_matches > 0:
-            rate = 100.0 * total_wins / total_matches
-        else:
-            rate = 0.0
-
+        overall = side_lines(self.aggregates.totals)["overall"]
         msg = (
-            f"Overall Matches: {total_matches}\n"
-            f"Overall Wins: {total_wins}\n"
-            f"Overall Losses: {total_losses}\n"
-            f"Overall Win Rate: {rate:.1f}%\n"
+            f"Overall Matches: {overall['matches']}\n"
+            f"Overall Wins: {overall['wins']}\n"
+            f"Overall Losses: {overall['losses']}\n"
+            f"Overall Win Rate: {overall['win_rate']:.1f}%\n"
         )
         messagebox.showinfo("Overall Summary", msg)
+
+    def show_performance(self):
+        """Help -> Performance: startup timings and operation latencies."""
+        lines = [
+            f"Startup {name.replace('_', ' ')}: {seconds * 1000:.0f} ms"
+            for name, seconds in self.startup_timings.items()
+        ]
+        if PERF.enabled:
+            lines += ["", PERF.report()]
+            if PERF.output:
+                lines += ["", f"Written to {PERF.output} on exit."]
+        else:
+            lines += [
+                "",
+                "Operation timings are off. Start the tracker with"
+                " run.py --profile (or WF_TRACKER_PROFILE=1) to record them.",
+            ]
+        messagebox.showinfo("Performance", "\n".join(lines))
+
+    def show_leaderboards(self):
+        """Best warlords, factions and decks across all decks, by win rate."""
+        sections = []
+        for title, kind in (
+            ("Warlords", "warlord"),
+            ("Factions", "faction"),
+            ("Decks", "deck"),
+        ):
+            lines = [f"{title}:"]
+            for rank, entry in enumerate(
+                self.aggregates.leaderboard(kind, limit=LEADERBOARD_SIZE), start=1
+            ):
+                lines.append(
+                    f"  {rank}. {entry['name']} - {entry['win_rate']:.1f}% "
+                    f"({entry['wins']}W/{entry['losses']}L)"
+                )
+            if len(lines) == 1:
+                lines.append("  No matches recorded")
+            sections.append("\n".join(lines))
+        messagebox.showinfo("Leaderboards", "\n\n".join(sections))
+
+    def matchup_report(self, faction_name, warlord_name=None):
+        """
+        Every deck's results against one opponent (a warlord, or a whole
+        faction if warlord_name is None), best win rate first.
+        """
+        if warlord_name is None:
+            opponent = faction_name
+        else:
+            opponent = f"{warlord_name} ({faction_name})"
+        rows = [
+            (deck["deck_name"], side_lines(stats))
+            for deck, stats in self.aggregates.matchups.results_against(
+                faction_name, warlord_name
+            )
+        ]
+        if not rows:
+            return f"No results against {opponent}."
+        rows.sort(
+            key=lambda row: (
+                -row[1]["overall"]["win_rate"],
+                -row[1]["overall"]["matches"],
+                row[0],
+            )
+        )
+
+        lines = [f"Decks against {opponent}:"]
+        for rank, (deck_name, sides) in enumerate(rows, start=1):
+            overall, first, second = (
+                sides["overall"],
+                sides["offense"],
+                sides["defense"],
+            )
+            lines.append(
+                f"  {rank}. {deck_name} - {overall['win_rate']:.1f}% "
+                f"({overall['wins']}W/{overall['losses']}L); going first "
+                f"{first['wins']}W/{first['losses']}L, going second "
+                f"{second['wins']}W/{second['losses']}L"
+            )
+        return "\n".join(lines)
+
+    def show_matchups(self):
+        """Summary -> Matchups: pick an opponent, see every deck against it."""
+        opponents = []
+        for faction_name in self.aggregates.faction_totals:
+            opponents.append((faction_name, None))
+            opponents += [
+                name
+                for name in self.aggregates.warlord_totals
+                if name[0] == faction_name
+            ]
+        labels = [
+            (
+                f"{faction_name} (all warlords)"
+                if warlord_name is None
+                else f"    {warlord_name} ({faction_name})"
+            )
+            for faction_name, warlord_name in opponents
+        ]
+
+        dialog = tk.Toplevel(self)
+        dialog.title("Matchups")
+        selector = ttk.Combobox(dialog, values=labels, state="readonly", width=60)
+        selector.pack(fill=tk.X, padx=5, pady=5)
+        report = tk.Text(dialog, width=100, height=20)
+        report.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+
+        def show_opponent(*_):
+            opponent = opponents[labels.index(selector.get())]
+            report.config(state=tk.NORMAL)
+            report.delete("1.0", tk.END)
+            report.insert(tk.END, self.matchup_report(*opponent))
+            report.config(state=tk.DISABLED)
+
+        selector.bind("<<ComboboxSelected>>", show_opponent)
+        if labels:
+            selector.set(labels[0])
+            show_opponent()
+        return dialog
@@ -2,6 +2,9 @@
 
 import copy
 
+# Per-warlord counters, in the column order used by the deck tabs.
+STAT_KEYS = ("off_wins", "off_losses", "def_wins", "def_losses")
+
 ###############################################################################
 # 1) Master Factions/Warlords Table (Blank)
 #
@@ -368,9 +371,39 @@ MASTER_TABLE = [
 ]
 
 
+def compile_deck_template(master_table=MASTER_TABLE):
+    """
+    Precompile master_table into a constructor for fresh faction lists.
+
+    The nested structure is walked once here; each call then only copies the
+    small flat warlord dicts, which is an order of magnitude faster than
+    copy.deepcopy (no memo bookkeeping, no type dispatch per value).
+    """
+    layout = tuple(
+        (faction["faction_name"], tuple(dict(w) for w in faction["warlords"]))
+        for faction in copy.deepcopy(master_table)
+    )
+
+    def new_factions():
+        return [
+            {"faction_name": faction_name, "warlords": [dict(w) for w in warlords]}
+            for faction_name, warlords in layout
+        ]
+
+    return new_factions
+
+
+_new_factions = compile_deck_template()
+
+
 def deep_copy_master_table():
     """
     Return a fresh deep copy of MASTER_TABLE
     so that each new deck starts with 0 in all stats.
     """
-    return copy.deepcopy(MASTER_TABLE)
+    return _new_factions()
+
+
+def new_deck(deck_name="New Deck"):
+    """Return a new deck with every MASTER_TABLE faction/warlord at 0."""
+    return {"deck_name": deck_name, "factions": _new_factions()}
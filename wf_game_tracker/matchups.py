@@ -0,0 +1,112 @@
+# matchups.py
+
+from wf_game_tracker.master_data import STAT_KEYS
+
+
+def _bump(table, name, deck_key, key, delta):
+    """Add delta to one counter of table[name][deck_key], dropping zero cells."""
+    cells = table.setdefault(name, {})
+    stats = cells.get(deck_key)
+    if stats is None:
+        stats = cells[deck_key] = dict.fromkeys(STAT_KEYS, 0)
+    stats[key] += delta
+    if not any(stats.values()):
+        del cells[deck_key]
+        if not cells:
+            del table[name]
+
+
+###############################################################################
+# Sparse matchup matrix
+#
+#   Results of every deck against every opponent warlord and faction, split by
+#   side (the four STAT_KEYS counters). Only (deck, opponent) pairs with
+#   results are stored, so memory follows the matchups actually played rather
+#   than decks x warlords:
+#
+#     warlords  (faction_name, warlord_name) -> {id(deck): stats}
+#     factions  faction_name -> {id(deck): stats}
+#
+#   Both are updated on every counter change, so a deck-vs-faction lookup or
+#   an opponent's results across decks never rescan the decks. Decks that are
+#   still undecoded (archive decks) wait in pending until they are queried or
+#   changed, so opening an archive does not decode it.
+###############################################################################
+class MatchupMatrix:
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self.decks = {}  # id(deck) -> deck
+        self.pending = {}  # id(deck) -> deck not indexed yet
+        self.warlords = {}
+        self.factions = {}
+
+    def _index(self, deck, sign):
+        deck_key = id(deck)
+        for faction in deck["factions"]:
+            faction_name = faction["faction_name"]
+            for warlord in faction["warlords"]:
+                name = (faction_name, warlord["warlord_name"])
+                for key in STAT_KEYS:
+                    delta = sign * warlord[key]
+                    if delta:
+                        _bump(self.warlords, name, deck_key, key, delta)
+                        _bump(self.factions, faction_name, deck_key, key, delta)
+
+    def _flush(self, deck_key=None):
+        """Index the pending decks (or only the one with deck_key)."""
+        if deck_key is None:
+            pending, self.pending = self.pending, {}
+            for deck in pending.values():
+                self._index(deck, 1)
+        elif deck_key in self.pending:
+            self._index(self.pending.pop(deck_key), 1)
+
+    def add_deck(self, deck, lazy=False):
+        """Add deck's results; lazy defers reading them until needed."""
+        self.decks[id(deck)] = deck
+        if lazy:
+            self.pending[id(deck)] = deck
+        else:
+            self._index(deck, 1)
+
+    def remove_deck(self, deck):
+        deck_key = id(deck)
+        if self.decks.pop(deck_key, None) is None:
+            return
+        if self.pending.pop(deck_key, None) is None:
+            self._index(deck, -1)
+
+    def apply(self, deck, faction_name, warlord_name, key, delta):
+        """Account for one counter of deck (already changed) moving by delta."""
+        deck_key = id(deck)
+        if deck_key in self.pending:
+            self._flush(deck_key)  # reads the deck, change included
+            return
+        _bump(self.warlords, (faction_name, warlord_name), deck_key, key, delta)
+        _bump(self.factions, faction_name, deck_key, key, delta)
+
+    def deck_vs_faction(self, deck, faction_name):
+        """deck's counters against faction_name's warlords (zeros if none)."""
+        self._flush(id(deck))
+        stats = self.factions.get(faction_name, {}).get(id(deck))
+        return dict(stats) if stats else dict.fromkeys(STAT_KEYS, 0)
+
+    def results_against(self, faction_name, warlord_name=None):
+        """
+        [(deck, stats)] of every deck with results against the opponent: one
+        warlord, or the whole faction if warlord_name is None.
+        """
+        self._flush()
+        if warlord_name is None:
+            cells = self.factions.get(faction_name, {})
+        else:
+            cells = self.warlords.get((faction_name, warlord_name), {})
+        return [
+            (self.decks[deck_key], dict(stats)) for deck_key, stats in cells.items()
+        ]
+
+    def cell_count(self):
+        """Stored (deck, warlord) cells: the matrix's size."""
+        return sum(len(cells) for cells in self.warlords.values())
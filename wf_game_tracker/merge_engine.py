@@ -0,0 +1,126 @@
+# merge_engine.py
+
+from wf_game_tracker.master_data import MASTER_TABLE
+
+
+###############################################################################
+# Merge engine: reconcile loaded decks with the MASTER_TABLE.
+#
+#   Every loaded deck is indexed once (faction name -> faction, warlord name
+#   -> warlord), so merging costs O(size of the deck) instead of a nested
+#   linear search per faction and warlord. Alongside the merged decks the
+#   engine reports, per deck, what was added, kept and orphaned.
+###############################################################################
+def _index_by(records, key):
+    """Map record[key] -> record, keeping the first record for duplicate names."""
+    index = {}
+    for record in records:
+        index.setdefault(record[key], record)
+    return index
+
+
+def _new_diff(deck_name):
+    return {
+        "deck_name": deck_name,
+        "added_factions": [],
+        "kept_factions": [],
+        "orphaned_factions": [],
+        "added_warlords": [],
+        "kept_warlords": [],
+        "orphaned_warlords": [],
+    }
+
+
+def merge_deck(loaded_deck, master_table=MASTER_TABLE):
+    """
+    Merge one loaded deck with master_table.
+
+    Returns (merged_deck, diff). Factions and warlords follow the master_table
+    order; loaded stats are kept, missing entries are added with zeroed stats
+    and entries unknown to master_table are dropped and reported as orphaned.
+    Warlords in the diff are (faction_name, warlord_name) pairs.
+    """
+    deck_name = loaded_deck.get("deck_name", "Unnamed Deck")
+    merged_deck = {"deck_name": deck_name, "factions": []}
+    diff = _new_diff(deck_name)
+
+    loaded_factions = _index_by(loaded_deck.get("factions", []), "faction_name")
+
+    for master_faction in master_table:
+        faction_name = master_faction["faction_name"]
+        matching_faction = loaded_factions.get(faction_name)
+
+        if matching_faction is None:
+            # Add the entire faction with fresh zeroed warlords
+            merged_deck["factions"].append(
+                {
+                    "faction_name": faction_name,
+                    "warlords": [dict(w) for w in master_faction["warlords"]],
+                }
+            )
+            diff["added_factions"].append(faction_name)
+            diff["added_warlords"].extend(
+                (faction_name, w["warlord_name"]) for w in master_faction["warlords"]
+            )
+            continue
+
+        diff["kept_factions"].append(faction_name)
+        loaded_warlords = _index_by(matching_faction["warlords"], "warlord_name")
+        merged_faction = {"faction_name": faction_name, "warlords": []}
+
+        for master_warlord in master_faction["warlords"]:
+            warlord_name = master_warlord["warlord_name"]
+            matching_warlord = loaded_warlords.pop(warlord_name, None)
+            if matching_warlord is not None:
+                # Use the existing warlord's stats
+                merged_faction["warlords"].append(matching_warlord)
+                diff["kept_warlords"].append((faction_name, warlord_name))
+            else:
+                merged_faction["warlords"].append(dict(master_warlord))
+                diff["added_warlords"].append((faction_name, warlord_name))
+
+        diff["orphaned_warlords"].extend(
+            (faction_name, warlord_name) for warlord_name in loaded_warlords
+        )
+        merged_deck["factions"].append(merged_faction)
+
+    master_names = {f["faction_name"] for f in master_table}
+    for faction_name, faction in loaded_factions.items():
+        if faction_name not in master_names:
+            diff["orphaned_factions"].append(faction_name)
+            diff["orphaned_warlords"].extend(
+                (faction_name, w["warlord_name"]) for w in faction["warlords"]
+            )
+
+    return merged_deck, diff
+
+
+def merge_decks(loaded_decks, master_table=MASTER_TABLE):
+    """
+    Merge a list of loaded decks with master_table.
+
+    Returns (merged_decks, diffs) where diffs holds one diff per deck, in order.
+    """
+    merged_decks = []
+    diffs = []
+    for loaded_deck in loaded_decks:
+        merged_deck, diff = merge_deck(loaded_deck, master_table)
+        merged_decks.append(merged_deck)
+        diffs.append(diff)
+    return merged_decks, diffs
+
+
+def add_to_summary(summary, diff):
+    """Add the added/kept/orphaned counts of one diff to summary, in place."""
+    for key, value in diff.items():
+        if key != "deck_name":
+            summary[key] = summary.get(key, 0) + len(value)
+    return summary
+
+
+def summarize_diffs(diffs):
+    """Count added/kept/orphaned factions and warlords over a list of diffs."""
+    summary = {}
+    for diff in diffs:
+        add_to_summary(summary, diff)
+    return summary
@@ -0,0 +1,128 @@
+# save_pipeline.py
+
+import threading
+
+from wf_game_tracker.archive import ArchiveDeck
+from wf_game_tracker.instrumentation import timed
+from wf_game_tracker.storage import FragmentCache
+
+
+def copy_deck(deck):
+    """
+    Copy of deck that later clicks and renames cannot reach: new deck,
+    faction and warlord dicts, sharing only the immutable names and counts.
+    """
+    return {
+        **deck,
+        "factions": [
+            {**faction, "warlords": [dict(w) for w in faction["warlords"]]}
+            for faction in deck["factions"]
+        ],
+    }
+
+
+def snapshot_deck(deck):
+    """
+    copy_deck(deck), except that an undecoded ArchiveDeck is only what its
+    archive holds: it gets a fresh undecoded ArchiveDeck of the same row,
+    which nothing else touches, so snapshots never decode archives.
+    """
+    if isinstance(deck, ArchiveDeck) and not deck.decoded:
+        return ArchiveDeck(deck.archive, deck.index)
+    return copy_deck(deck)
+
+
+def snapshot_decks(decks):
+    return [snapshot_deck(deck) for deck in decks]
+
+
+class SnapshotCache:
+    """
+    Snapshot copies of decks, reused by later snapshots until the deck is
+    marked dirty (a counter or its name changed). A snapshot after one click
+    copies one deck (see snapshot_deck); the copies are never modified, so a
+    worker thread can keep reading them, and fragments keeps their encoded
+    JSON for the next save. Take snapshots only while no save is running: the worker fills
+    fragments as it writes.
+    """
+
+    def __init__(self):
+        self.copies = {}  # id(deck) -> (deck, copy); holding deck pins its id
+        self.dirty = set()  # id(deck) of decks changed since they were copied
+        self.fragments = FragmentCache()
+
+    def clear(self):
+        self.copies = {}
+        self.dirty = set()
+        self.fragments.clear()
+
+    def mark_dirty(self, deck):
+        self.dirty.add(id(deck))
+
+    def snapshot(self, decks):
+        """Copies of decks, in order; only dirty or new decks are copied."""
+        copies = {}
+        snapshot = []
+        for deck in decks:
+            key = id(deck)
+            entry = self.copies.get(key)
+            if entry is None or key in self.dirty:
+                entry = (deck, snapshot_deck(deck))
+            copies[key] = entry
+            snapshot.append(entry[1])
+        # Dropping the old mapping also releases decks that were removed
+        self.copies = copies
+        self.dirty = set()
+        self.fragments.retain(snapshot)
+        return snapshot
+
+
+###############################################################################
+# Save pipeline
+#
+#   The Tk thread takes a snapshot of the decks and hands it to a worker
+#   thread, which serializes it with the storage backend (JSON files are
+#   written to a temporary file, fsynced and renamed into place). One save
+#   runs at a time; the Tk thread picks up the outcome with poll().
+###############################################################################
+class SavePipeline:
+    def __init__(self):
+        self.thread = None
+        self.result = None
+
+    @property
+    def busy(self):
+        return self.thread is not None
+
+    def start(self, storage, filename, snapshot):
+        """Write snapshot to filename with storage on a worker thread."""
+        if self.busy:
+            raise RuntimeError("A save is already running")
+
+        def run():
+            error = None
+            try:
+                timed("save.write")(storage.write)(filename, snapshot)
+            except Exception as e:
+                error = e
+            self.result = (storage, filename, error)
+
+        # Not a daemon: the interpreter waits for a save to land before exiting
+        self.thread = threading.Thread(target=run, name="save")
+        self.thread.start()
+
+    def poll(self, wait=False):
+        """
+        (storage, filename, error) of the running save once it finished
+        (error is None on success), else None. wait=True blocks until then.
+        """
+        if self.thread is None:
+            return None
+        if wait:
+            self.thread.join()
+        elif self.thread.is_alive():
+            return None
+        self.thread.join()
+        self.thread = None
+        result, self.result = self.result, None
+        return result
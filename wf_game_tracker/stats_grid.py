@@ -0,0 +1,148 @@
+# stats_grid.py
+
+import bisect
+import tkinter as tk
+from tkinter import ttk
+
+ROW_HEIGHT = 22
+# Extra rows drawn above and below the viewport so small scrolls need no redraw
+OVERSCAN_ROWS = 5
+
+
+###############################################################################
+# StatsGrid: a virtualized table drawn on a single Canvas.
+#
+#   Cells are canvas rectangles and text items instead of one tk.Label each.
+#   Only the rows inside the visible viewport (plus a small overscan) exist as
+#   canvas items; rows are created and deleted as the view scrolls or resizes.
+#   Clicks are hit-tested from the event coordinates.
+###############################################################################
+class StatsGrid(tk.Frame):
+    def __init__(self, parent, column_widths, row_count, row_fn, on_click=None):
+        """
+        column_widths: pixel width of each column
+        row_count: number of rows (including any header row)
+        row_fn: row_fn(row) -> [(text, bg, fg), ...], one tuple per column
+        on_click: on_click(row, col, delta) with delta +1 (left) / -1 (right)
+        """
+        super().__init__(parent)
+        self.column_widths = list(column_widths)
+        self.column_edges = [0]
+        for width in self.column_widths:
+            self.column_edges.append(self.column_edges[-1] + width)
+        self.row_count = row_count
+        self.row_fn = row_fn
+        self.on_click = on_click
+        self.drawn_rows = {}  # row -> [(rect_id, text_id), ...] per column
+        self.drawn_cells = {}  # row -> [(text, bg, fg), ...] as last drawn
+
+        self.canvas = tk.Canvas(self, highlightthickness=0, bg="white")
+        self.vsb = ttk.Scrollbar(self, orient="vertical", command=self._yview)
+        self.hsb = ttk.Scrollbar(self, orient="horizontal", command=self._xview)
+        self.canvas.configure(
+            yscrollcommand=self._on_yscroll, xscrollcommand=self.hsb.set
+        )
+
+        self.vsb.pack(side=tk.RIGHT, fill=tk.Y)
+        self.hsb.pack(side=tk.BOTTOM, fill=tk.X)
+        self.canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        self.canvas.bind("<Button-1>", lambda event: self._click(event, 1))
+        self.canvas.bind("<Button-3>", lambda event: self._click(event, -1))
+        self.canvas.bind("<Configure>", lambda _event: self.render())
+
+        self._update_scrollregion()
+        self.render()
+
+    ###########################################################################
+    # Geometry
+    ###########################################################################
+    def _update_scrollregion(self):
+        self.canvas.configure(
+            scrollregion=(0, 0, self.column_edges[-1], self.row_count * ROW_HEIGHT)
+        )
+
+    def visible_rows(self):
+        """range of rows inside the viewport, including the overscan."""
+        top = self.canvas.canvasy(0)
+        height = max(self.canvas.winfo_height(), ROW_HEIGHT)
+        first = max(int(top // ROW_HEIGHT) - OVERSCAN_ROWS, 0)
+        last = min(
+            int((top + height) // ROW_HEIGHT) + 1 + OVERSCAN_ROWS, self.row_count
+        )
+        return range(first, last)
+
+    def cell_at(self, x, y):
+        """(row, col) under canvas coordinates x, y, or None."""
+        row = int(y // ROW_HEIGHT)
+        col = bisect.bisect_right(self.column_edges, x) - 1
+        if 0 <= row < self.row_count and 0 <= col < len(self.column_widths):
+            return row, col
+        return None
+
+    ###########################################################################
+    # Drawing
+    ###########################################################################
+    def render(self):
+        """Create items for rows entering the viewport, delete the others."""
+        visible = self.visible_rows()
+        for row in [r for r in self.drawn_rows if r not in visible]:
+            for rect_id, text_id in self.drawn_rows.pop(row):
+                self.canvas.delete(rect_id, text_id)
+            del self.drawn_cells[row]
+        for row in visible:
+            if row not in self.drawn_rows:
+                self._draw_row(row)
+
+    def _draw_row(self, row):
+        y0 = row * ROW_HEIGHT
+        items = []
+        cells = self.row_fn(row)
+        for col, (text, bg, fg) in enumerate(cells):
+            x0 = self.column_edges[col]
+            width = self.column_widths[col]
+            rect_id = self.canvas.create_rectangle(
+                x0, y0, x0 + width, y0 + ROW_HEIGHT, fill=bg, outline="#999"
+            )
+            text_id = self.canvas.create_text(
+                x0 + width / 2, y0 + ROW_HEIGHT / 2, text=text, fill=fg
+            )
+            items.append((rect_id, text_id))
+        self.drawn_rows[row] = items
+        self.drawn_cells[row] = cells
+
+    def refresh_row(self, row):
+        """Redraw the cells of row that changed, if the row is currently drawn."""
+        items = self.drawn_rows.get(row)
+        if items is None:
+            return
+        cells = self.row_fn(row)
+        for (rect_id, text_id), new, old in zip(items, cells, self.drawn_cells[row]):
+            if new == old:
+                continue
+            text, bg, fg = new
+            if bg != old[1]:
+                self.canvas.itemconfig(rect_id, fill=bg)
+            self.canvas.itemconfig(text_id, text=text, fill=fg)
+        self.drawn_cells[row] = cells
+
+    ###########################################################################
+    # Scrolling & clicks
+    ###########################################################################
+    def _yview(self, *args):
+        self.canvas.yview(*args)
+
+    def _xview(self, *args):
+        self.canvas.xview(*args)
+
+    def _on_yscroll(self, first, last):
+        """Called by the canvas whenever its vertical view changes."""
+        self.vsb.set(first, last)
+        self.render()
+
+    def _click(self, event, delta):
+        if self.on_click is None:
+            return
+        cell = self.cell_at(self.canvas.canvasx(event.x), self.canvas.canvasy(event.y))
+        if cell is not None:
+            self.on_click(cell[0], cell[1], delta)
@@ -0,0 +1,203 @@
+# stats_store.py
+
+from array import array
+from collections.abc import MutableMapping
+
+from wf_game_tracker.master_data import MASTER_TABLE, STAT_KEYS
+
+# Counters are stored as signed 32-bit integers (right-click can go below 0)
+COUNTER_TYPECODE = "i"
+
+
+def warlord_ordinals(master_table=MASTER_TABLE):
+    """Map (faction_name, warlord_name) -> fixed ordinal in master_table order."""
+    ordinals = {}
+    for faction in master_table:
+        for warlord in faction["warlords"]:
+            key = (faction["faction_name"], warlord["warlord_name"])
+            ordinals.setdefault(key, len(ordinals))
+    return ordinals
+
+
+###############################################################################
+# Columnar stats store
+#
+#   One flat integer array per counter (off_wins, off_losses, def_wins,
+#   def_losses). Deck d, warlord ordinal w lives at d * width + w, so a deck
+#   costs 4 * width machine integers instead of width dicts. Aggregates are
+#   sums over array slices. WarlordView and deck_view() expose the familiar
+#   nested dict shape on top of the arrays.
+#
+#   Batch runs (batch.process_file) stream every deck of a file into a store
+#   and aggregate it with analytics.aggregate_store, so a worker holds one
+#   file's counters in arrays instead of its decks as dicts. The app keeps
+#   plain deck dicts: the tabs, the journal, the save snapshots and the
+#   storage backends all edit them in place (lazy ArchiveDecks keep very
+#   large files out of memory there).
+###############################################################################
+class WarlordView(MutableMapping):
+    """Live dict-like view of one warlord's counters in a StatsStore."""
+
+    __slots__ = ("store", "deck_index", "ordinal")
+
+    def __init__(self, store, deck_index, ordinal):
+        self.store = store
+        self.deck_index = deck_index
+        self.ordinal = ordinal
+
+    def __getitem__(self, key):
+        if key == "warlord_name":
+            return self.store.names[self.ordinal][1]
+        if key not in self.store.columns:
+            raise KeyError(key)
+        return self.store.get(self.deck_index, self.ordinal, key)
+
+    def __setitem__(self, key, value):
+        if key not in self.store.columns:
+            raise KeyError(f"{key} cannot be set on a stored warlord")
+        self.store.columns[key][
+            self.store.offset(self.deck_index, self.ordinal)
+        ] = value
+
+    def __delitem__(self, key):
+        raise KeyError(f"{key} cannot be removed from a stored warlord")
+
+    def __iter__(self):
+        yield "warlord_name"
+        yield from STAT_KEYS
+
+    def __len__(self):
+        return 1 + len(STAT_KEYS)
+
+    def __repr__(self):
+        return f"WarlordView({dict(self)!r})"
+
+
+class StatsStore:
+    """Counters of many decks, one array per counter, indexed by ordinal."""
+
+    def __init__(self, master_table=MASTER_TABLE):
+        self.ordinals = warlord_ordinals(master_table)
+        self.names = list(self.ordinals)
+        self.width = len(self.names)
+        # faction_name -> (first ordinal, one past the last ordinal)
+        self.faction_ranges = {}
+        for ordinal, (faction_name, _warlord_name) in enumerate(self.names):
+            start, _end = self.faction_ranges.get(faction_name, (ordinal, ordinal))
+            self.faction_ranges[faction_name] = (start, ordinal + 1)
+        self.deck_names = []
+        self.columns = {key: array(COUNTER_TYPECODE) for key in STAT_KEYS}
+        self._zero_row = array(COUNTER_TYPECODE, [0]) * self.width
+
+    @classmethod
+    def from_decks(cls, decks, master_table=MASTER_TABLE):
+        """Build a store from decks in the nested dict shape."""
+        store = cls(master_table)
+        for deck in decks:
+            store.add_deck_dict(deck)
+        return store
+
+    def __len__(self):
+        return len(self.deck_names)
+
+    def offset(self, deck_index, ordinal):
+        return deck_index * self.width + ordinal
+
+    ###########################################################################
+    # Decks
+    ###########################################################################
+    def add_deck(self, deck_name="New Deck"):
+        """Append a deck with all counters at zero; returns its index."""
+        for column in self.columns.values():
+            column.extend(self._zero_row)
+        self.deck_names.append(deck_name)
+        return len(self.deck_names) - 1
+
+    def add_deck_dict(self, deck):
+        """
+        Append a deck given in the nested dict shape; returns its index.
+        Warlords unknown to the store's MASTER_TABLE are ignored.
+        """
+        deck_index = self.add_deck(deck.get("deck_name", "Unnamed Deck"))
+        base = deck_index * self.width
+        for faction in deck.get("factions", []):
+            faction_name = faction["faction_name"]
+            for warlord in faction["warlords"]:
+                ordinal = self.ordinals.get((faction_name, warlord["warlord_name"]))
+                if ordinal is None:
+                    continue
+                for key, column in self.columns.items():
+                    column[base + ordinal] = warlord[key]
+        return deck_index
+
+    def get(self, deck_index, ordinal, key):
+        return self.columns[key][self.offset(deck_index, ordinal)]
+
+    def increment(self, deck_index, ordinal, key, delta=1):
+        self.columns[key][self.offset(deck_index, ordinal)] += delta
+
+    def warlord(self, deck_index, faction_name, warlord_name):
+        """WarlordView for one warlord of a deck."""
+        return WarlordView(
+            self, deck_index, self.ordinals[(faction_name, warlord_name)]
+        )
+
+    def _deck_shape(self, deck_index, make_warlord):
+        factions = []
+        by_name = {}
+        for ordinal, (faction_name, _warlord_name) in enumerate(self.names):
+            faction = by_name.get(faction_name)
+            if faction is None:
+                faction = {"faction_name": faction_name, "warlords": []}
+                by_name[faction_name] = faction
+                factions.append(faction)
+            faction["warlords"].append(make_warlord(ordinal))
+        return {"deck_name": self.deck_names[deck_index], "factions": factions}
+
+    def deck_view(self, deck_index):
+        """The deck in the nested dict shape, with live WarlordViews."""
+        return self._deck_shape(
+            deck_index, lambda ordinal: WarlordView(self, deck_index, ordinal)
+        )
+
+    def deck_dict(self, deck_index):
+        """A plain nested dict copy of the deck (e.g. for json.dump)."""
+        return self._deck_shape(
+            deck_index,
+            lambda ordinal: dict(WarlordView(self, deck_index, ordinal)),
+        )
+
+    def to_decks(self):
+        return [self.deck_dict(i) for i in range(len(self))]
+
+    ###########################################################################
+    # Aggregates
+    ###########################################################################
+    def _sum(self, start, stop, step=1):
+        return {
+            key: sum(column[start:stop:step]) for key, column in self.columns.items()
+        }
+
+    def totals(self):
+        """Counters summed over every deck and warlord."""
+        return {key: sum(column) for key, column in self.columns.items()}
+
+    def deck_totals(self, deck_index):
+        base = deck_index * self.width
+        return self._sum(base, base + self.width)
+
+    def faction_totals(self, faction_name, deck_index=None):
+        """Counters of one faction, in one deck or summed across all decks."""
+        start, end = self.faction_ranges[faction_name]
+        if deck_index is not None:
+            base = deck_index * self.width
+            return self._sum(base + start, base + end)
+        totals = dict.fromkeys(STAT_KEYS, 0)
+        for ordinal in range(start, end):
+            for key, value in self.warlord_totals(ordinal).items():
+                totals[key] += value
+        return totals
+
+    def warlord_totals(self, ordinal):
+        """Counters of one warlord ordinal summed across all decks."""
+        return self._sum(ordinal, None, self.width)
@@ -0,0 +1,553 @@
+# storage.py
+
+import json
+from abc import ABC, abstractmethod
+import os
+import sqlite3
+import tempfile
+
+from wf_game_tracker.archive import (
+    ARCHIVE_EXTENSIONS,
+    ArchiveDeck,
+    DeckArchive,
+    encode_archive,
+    plain_deck,
+)
+from wf_game_tracker.binary_format import BINARY_EXTENSIONS, encode_decks, iter_decks
+from wf_game_tracker.deck_stream import iter_merged_decks
+from wf_game_tracker.master_data import STAT_KEYS
+from wf_game_tracker.merge_engine import merge_deck
+
+SQLITE_EXTENSIONS = (".db", ".sqlite", ".sqlite3")
+
+FILE_TYPES = [
+    ("JSON files", "*.json"),
+    ("SQLite databases", " ".join("*" + ext for ext in SQLITE_EXTENSIONS)),
+    ("Binary deck files", " ".join("*" + ext for ext in BINARY_EXTENSIONS)),
+    ("Deck archives", " ".join("*" + ext for ext in ARCHIVE_EXTENSIONS)),
+    ("All files", "*.*"),
+]
+
+
+def storage_for(filename, fragments=None):
+    """
+    Pick the storage backend for filename from its extension. fragments is
+    an optional FragmentCache the JSON backend reuses encoded decks from.
+    """
+    extension = os.path.splitext(filename)[1].lower()
+    if extension in SQLITE_EXTENSIONS:
+        return SqliteStorage()
+    if extension in BINARY_EXTENSIONS:
+        return BinaryStorage()
+    if extension in ARCHIVE_EXTENSIONS:
+        return ArchiveStorage()
+    return JsonStorage(fragments)
+
+
+def _fsync_directory(directory):
+    """Make a rename inside directory durable (not possible on Windows)."""
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def atomic_write_text(filename, write, binary=False):
+    """
+    Crash-safe replacement of filename: write(f) fills a temporary file in the
+    same directory, which is fsynced and then renamed over filename. A crash
+    leaves either the old or the new file, never a torn one. f is a UTF-8 text
+    file, or a binary file if binary is set.
+    """
+    directory = os.path.dirname(os.path.abspath(filename))
+    fd, tmp_path = tempfile.mkstemp(
+        dir=directory, prefix=os.path.basename(filename) + ".", suffix=".tmp"
+    )
+    try:
+        if binary:
+            f = os.fdopen(fd, "wb")
+        else:
+            f = os.fdopen(fd, "w", encoding="utf-8")
+        with f:
+            write(f)
+            f.flush()
+            os.fsync(f.fileno())
+        if os.path.exists(filename):
+            os.chmod(tmp_path, os.stat(filename).st_mode & 0o777)
+        else:
+            os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, filename)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    _fsync_directory(directory)
+
+
+###############################################################################
+# Storage interface
+#
+#   load_data/write_data talk to a backend instead of json directly. Every
+#   backend streams merged decks and can write a full snapshot. "Live"
+#   backends additionally persist each change as it happens once attached
+#   to a file, so saving them does not rewrite anything.
+###############################################################################
+class DeckStorage(ABC):
+    # True if changes are written as they happen (Save has nothing to write)
+    live = False
+    # True if the "<file>.journal" append-only save mode applies
+    supports_journal = False
+
+    @abstractmethod
+    def iter_merged_decks(self, filename):
+        """Yield (index, merged_deck, diff, error) for each deck in filename."""
+
+    @abstractmethod
+    def write(self, filename, decks):
+        """Write all decks to filename, replacing its contents."""
+
+    def attach(self, filename):
+        """Start tracking filename as the current file."""
+
+    def close(self):
+        """Release anything held open by attach."""
+
+    def record_counter(self, position, faction_name, warlord_name, key, delta):
+        """A warlord counter of the deck at position changed by delta."""
+
+    def record_rename(self, position, deck_name):
+        """The deck at position was renamed."""
+
+    def record_new_deck(self, position, deck):
+        """deck was inserted at position (the decks after it moved up one)."""
+
+    def record_delete_deck(self, position):
+        """The deck at position was deleted (the decks after it moved down one)."""
+
+    def record_move_deck(self, old_position, new_position):
+        """The deck at old_position was moved to new_position."""
+
+
+###############################################################################
+# JSON backend
+#
+#   The file is json.dump(decks, indent=2). Each deck is encoded on its own as
+#   a fragment (the deck's lines inside the array, indented one level) and the
+#   fragments are stitched together, which gives byte for byte the same file.
+#   Save snapshots keep the copies of unchanged decks, so with a FragmentCache
+#   only the decks changed since the last save are encoded again.
+###############################################################################
+JSON_INDENT = 2
+
+
+def encode_deck(deck):
+    """deck as it appears inside the JSON deck array."""
+    pad = " " * JSON_INDENT
+    return pad + json.dumps(plain_deck(deck), indent=JSON_INDENT).replace(
+        "\n", "\n" + pad
+    )
+
+
+def write_fragments(f, fragments):
+    """Write the deck array made of encoded decks to f."""
+    if not fragments:
+        f.write("[]")
+        return
+    f.write("[\n")
+    for index, fragment in enumerate(fragments):
+        if index:
+            f.write(",\n")
+        f.write(fragment)
+    f.write("\n]")
+
+
+class FragmentCache:
+    """
+    Encoded decks by identity. Only for decks that are never modified once
+    encoded, such as save snapshots; holding the deck keeps its id unique.
+    """
+
+    def __init__(self):
+        self.entries = {}  # id(deck) -> (deck, fragment)
+
+    def encode(self, deck):
+        entry = self.entries.get(id(deck))
+        if entry is None or entry[0] is not deck:
+            entry = (deck, encode_deck(deck))
+            self.entries[id(deck)] = entry
+        return entry[1]
+
+    def retain(self, decks):
+        """Forget the fragments of every deck not in decks."""
+        keep = {id(deck) for deck in decks}
+        self.entries = {
+            key: entry for key, entry in self.entries.items() if key in keep
+        }
+
+    def clear(self):
+        self.entries = {}
+
+
+class JsonStorage(DeckStorage):
+    """The pretty-printed JSON deck array (optionally with a journal)."""
+
+    supports_journal = True
+
+    def __init__(self, fragments=None):
+        self.fragments = fragments
+
+    def iter_merged_decks(self, filename):
+        with open(filename, "r", encoding="utf-8") as f:
+            yield from iter_merged_decks(f)
+
+    def write(self, filename, decks):
+        encode = encode_deck if self.fragments is None else self.fragments.encode
+        fragments = [encode(deck) for deck in decks]
+        atomic_write_text(filename, lambda f: write_fragments(f, fragments))
+
+
+class BinaryStorage(DeckStorage):
+    """The compact binary deck format (see binary_format)."""
+
+    supports_journal = True
+
+    def iter_merged_decks(self, filename):
+        with open(filename, "rb") as f:
+            data = f.read()
+        for index, deck in enumerate(iter_decks(data)):
+            yield (index,) + merge_deck(deck) + (None,)
+
+    def write(self, filename, decks):
+        data = encode_decks([plain_deck(deck) for deck in decks])
+        atomic_write_text(filename, lambda f: f.write(data), binary=True)
+
+
+class ArchiveStorage(DeckStorage):
+    """
+    A memory-mapped deck archive (see archive). Loading yields ArchiveDecks,
+    which are only decoded when their tab is built or they are changed.
+    """
+
+    supports_journal = True
+
+    def iter_merged_decks(self, filename):
+        archive = DeckArchive(filename)
+        for index in range(len(archive)):
+            yield index, ArchiveDeck(archive, index), None, None
+
+    def write(self, filename, decks):
+        data = encode_archive(decks)
+        atomic_write_text(filename, lambda f: f.write(data), binary=True)
+
+
+###############################################################################
+# SQLite backend
+#
+#   Decks, factions and warlords are rows; counters hold one row per
+#   (deck, faction, warlord). Once attached, every click is a single-row
+#   UPDATE committed in WAL mode. Loading reads one deck at a time in
+#   position order, and cross-deck aggregates are indexed GROUP BY queries,
+#   so neither needs the whole database in memory (batch runs aggregate
+#   .db files with them without loading a single deck).
+###############################################################################
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS decks (
+    deck_id INTEGER PRIMARY KEY,
+    position INTEGER NOT NULL UNIQUE,
+    deck_name TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS factions (
+    faction_id INTEGER PRIMARY KEY,
+    faction_name TEXT NOT NULL UNIQUE,
+    position INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS warlords (
+    warlord_id INTEGER PRIMARY KEY,
+    faction_id INTEGER NOT NULL REFERENCES factions (faction_id),
+    warlord_name TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    UNIQUE (faction_id, warlord_name)
+);
+CREATE TABLE IF NOT EXISTS counters (
+    deck_id INTEGER NOT NULL REFERENCES decks (deck_id) ON DELETE CASCADE,
+    faction_id INTEGER NOT NULL REFERENCES factions (faction_id),
+    warlord_id INTEGER NOT NULL REFERENCES warlords (warlord_id),
+    off_wins INTEGER NOT NULL DEFAULT 0,
+    off_losses INTEGER NOT NULL DEFAULT 0,
+    def_wins INTEGER NOT NULL DEFAULT 0,
+    def_losses INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (deck_id, faction_id, warlord_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS decks_by_position ON decks (position);
+CREATE INDEX IF NOT EXISTS counters_by_warlord
+    ON counters (faction_id, warlord_id);
+"""
+
+_STAT_COLUMNS = ", ".join(STAT_KEYS)
+
+# Where a deck being moved waits while the others shift (out of their range)
+_PARKED_POSITION = -(2**62)
+_STAT_SUMS = ", ".join(f"SUM(c.{key})" for key in STAT_KEYS)
+
+
+def _stats(row):
+    """Map the trailing STAT_KEYS columns of a result row to a stats dict."""
+    start = len(row) - len(STAT_KEYS)
+    return dict(zip(STAT_KEYS, (value or 0 for value in row[start:])))
+
+
+class SqliteStorage(DeckStorage):
+    """Decks stored in an SQLite database, updated row by row."""
+
+    live = True
+
+    def __init__(self):
+        self.conn = None
+        self._ids = {}  # (faction_name, warlord_name) -> (faction_id, warlord_id)
+
+    def _connect(self, filename):
+        conn = sqlite3.connect(filename)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA foreign_keys=ON")
+        conn.executescript(_SCHEMA)
+        return conn
+
+    def _load_ids(self, conn):
+        self._ids = {
+            (faction_name, warlord_name): (faction_id, warlord_id)
+            for faction_name, warlord_name, faction_id, warlord_id in conn.execute(
+                "SELECT f.faction_name, w.warlord_name, f.faction_id, w.warlord_id"
+                " FROM warlords w JOIN factions f USING (faction_id)"
+            )
+        }
+
+    def _warlord_ids(self, conn, faction_name, warlord_name, position):
+        """Return (faction_id, warlord_id), creating the rows if needed."""
+        ids = self._ids.get((faction_name, warlord_name))
+        if ids is not None:
+            return ids
+        conn.execute(
+            "INSERT OR IGNORE INTO factions (faction_name, position)"
+            " VALUES (?, (SELECT COUNT(*) FROM factions))",
+            (faction_name,),
+        )
+        (faction_id,) = conn.execute(
+            "SELECT faction_id FROM factions WHERE faction_name = ?", (faction_name,)
+        ).fetchone()
+        conn.execute(
+            "INSERT OR IGNORE INTO warlords (faction_id, warlord_name, position)"
+            " VALUES (?, ?, ?)",
+            (faction_id, warlord_name, position),
+        )
+        (warlord_id,) = conn.execute(
+            "SELECT warlord_id FROM warlords WHERE faction_id = ? AND warlord_name = ?",
+            (faction_id, warlord_name),
+        ).fetchone()
+        self._ids[(faction_name, warlord_name)] = (faction_id, warlord_id)
+        return faction_id, warlord_id
+
+    def _insert_deck(self, conn, position, deck):
+        cursor = conn.execute(
+            "INSERT INTO decks (position, deck_name) VALUES (?, ?)",
+            (position, deck.get("deck_name", "Unnamed Deck")),
+        )
+        deck_id = cursor.lastrowid
+        rows = []
+        for faction in deck["factions"]:
+            for warlord_position, warlord in enumerate(faction["warlords"]):
+                faction_id, warlord_id = self._warlord_ids(
+                    conn,
+                    faction["faction_name"],
+                    warlord["warlord_name"],
+                    warlord_position,
+                )
+                rows.append(
+                    (deck_id, faction_id, warlord_id)
+                    + tuple(warlord[key] for key in STAT_KEYS)
+                )
+        conn.executemany(
+            f"INSERT INTO counters (deck_id, faction_id, warlord_id, {_STAT_COLUMNS})"
+            " VALUES (?, ?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+
+    def iter_merged_decks(self, filename):
+        if not os.path.exists(filename):
+            raise FileNotFoundError(f"No such database: {filename}")
+        conn = self._connect(filename)
+        try:
+            decks = conn.execute(
+                "SELECT deck_id, deck_name FROM decks ORDER BY position"
+            )
+            for index, (deck_id, deck_name) in enumerate(decks):
+                deck = {"deck_name": deck_name, "factions": []}
+                factions = {}
+                for row in conn.execute(
+                    "SELECT f.faction_name, w.warlord_name,"
+                    f" {', '.join('c.' + key for key in STAT_KEYS)}"
+                    " FROM counters c"
+                    " JOIN factions f USING (faction_id)"
+                    " JOIN warlords w USING (warlord_id)"
+                    " WHERE c.deck_id = ? ORDER BY f.position, w.position",
+                    (deck_id,),
+                ):
+                    faction_name, warlord_name = row[:2]
+                    faction = factions.get(faction_name)
+                    if faction is None:
+                        faction = {"faction_name": faction_name, "warlords": []}
+                        factions[faction_name] = faction
+                        deck["factions"].append(faction)
+                    warlord = {"warlord_name": warlord_name}
+                    warlord.update(_stats(row))
+                    faction["warlords"].append(warlord)
+                yield (index,) + merge_deck(deck) + (None,)
+        finally:
+            conn.close()
+
+    def write(self, filename, decks):
+        # One transaction: a crash rolls back to the previous contents
+        conn = self._connect(filename)
+        try:
+            with conn:
+                conn.execute("DELETE FROM counters")
+                conn.execute("DELETE FROM decks")
+                self._load_ids(conn)
+                for position, deck in enumerate(decks):
+                    self._insert_deck(conn, position, plain_deck(deck))
+        finally:
+            conn.close()
+
+    def attach(self, filename):
+        self.close()
+        self.conn = self._connect(filename)
+        self._load_ids(self.conn)
+
+    def close(self):
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+    def record_counter(self, position, faction_name, warlord_name, key, delta):
+        if self.conn is None or key not in STAT_KEYS:
+            return
+        ids = self._ids.get((faction_name, warlord_name))
+        if ids is None:
+            return
+        with self.conn:
+            self.conn.execute(
+                f"UPDATE counters SET {key} = {key} + ?"
+                " WHERE deck_id = (SELECT deck_id FROM decks WHERE position = ?)"
+                " AND faction_id = ? AND warlord_id = ?",
+                (delta, position) + ids,
+            )
+
+    def record_rename(self, position, deck_name):
+        if self.conn is None:
+            return
+        with self.conn:
+            self.conn.execute(
+                "UPDATE decks SET deck_name = ? WHERE position = ?",
+                (deck_name, position),
+            )
+
+    def _shift(self, conn, start, stop, step):
+        """Move the decks at positions start..stop (inclusive) by step."""
+        # Flip them negative first: position is UNIQUE, and rows are updated
+        # one at a time
+        conn.execute(
+            "UPDATE decks SET position = -1 - position"
+            " WHERE position >= ? AND position <= ?",
+            (start, stop),
+        )
+        conn.execute(
+            "UPDATE decks SET position = -1 - position + ?"
+            " WHERE position >= -1 - ? AND position <= -1 - ?",
+            (step, stop, start),
+        )
+
+    def _last_position(self, conn):
+        (last,) = conn.execute("SELECT MAX(position) FROM decks").fetchone()
+        return -1 if last is None else last
+
+    def record_new_deck(self, position, deck):
+        if self.conn is None:
+            return
+        with self.conn:
+            self._shift(self.conn, position, self._last_position(self.conn), 1)
+            self._insert_deck(self.conn, position, deck)
+
+    def record_delete_deck(self, position):
+        if self.conn is None:
+            return
+        with self.conn:
+            self.conn.execute("DELETE FROM decks WHERE position = ?", (position,))
+            self._shift(self.conn, position + 1, self._last_position(self.conn), -1)
+
+    def record_move_deck(self, old_position, new_position):
+        if self.conn is None or old_position == new_position:
+            return
+        with self.conn:
+            row = self.conn.execute(
+                "SELECT deck_id FROM decks WHERE position = ?", (old_position,)
+            ).fetchone()
+            if row is None:
+                return
+            self.conn.execute(
+                "UPDATE decks SET position = ? WHERE deck_id = ?",
+                (_PARKED_POSITION, row[0]),
+            )
+            if old_position < new_position:
+                self._shift(self.conn, old_position + 1, new_position, -1)
+            else:
+                self._shift(self.conn, new_position, old_position - 1, 1)
+            self.conn.execute(
+                "UPDATE decks SET position = ? WHERE deck_id = ?",
+                (new_position, row[0]),
+            )
+
+    ###########################################################################
+    # Aggregates (SQL, no decks in memory)
+    ###########################################################################
+    def totals(self):
+        """Summed counters over every deck, faction and warlord."""
+        row = self.conn.execute(f"SELECT {_STAT_SUMS} FROM counters c").fetchone()
+        return _stats(row)
+
+    def deck_totals(self):
+        """Yield (deck_name, stats) in deck order."""
+        for row in self.conn.execute(
+            f"SELECT d.deck_name, {_STAT_SUMS} FROM decks d"
+            " LEFT JOIN counters c USING (deck_id)"
+            " GROUP BY d.deck_id ORDER BY d.position"
+        ):
+            yield row[0], _stats(row)
+
+    def faction_totals(self):
+        """[(faction_name, stats)] summed across all decks."""
+        return [
+            (row[0], _stats(row))
+            for row in self.conn.execute(
+                f"SELECT f.faction_name, {_STAT_SUMS} FROM counters c"
+                " JOIN factions f USING (faction_id)"
+                " GROUP BY c.faction_id ORDER BY f.position"
+            )
+        ]
+
+    def warlord_totals(self):
+        """[(faction_name, warlord_name, stats)] summed across all decks."""
+        return [
+            (row[0], row[1], _stats(row))
+            for row in self.conn.execute(
+                f"SELECT f.faction_name, w.warlord_name, {_STAT_SUMS} FROM counters c"
+                " JOIN factions f USING (faction_id)"
+                " JOIN warlords w USING (warlord_id)"
+                " GROUP BY c.faction_id, c.warlord_id ORDER BY f.position, w.position"
+            )
+        ]
@@ -0,0 +1,76 @@
+import unittest
+from wf_game_tracker.aggregates import AggregateCache
+from wf_game_tracker.master_data import new_deck
+
+
+class TestAggregateCache(unittest.TestCase):
+
+    def setUp(self):
+        """Two decks with a few results, loaded into a fresh cache."""
+        self.deck_a = new_deck("Deck A")
+        self.deck_b = new_deck("Deck B")
+        self.deck_a["factions"][0]["warlords"][0]["off_wins"] = 3
+        self.deck_a["factions"][0]["warlords"][0]["def_losses"] = 1
+        self.deck_b["factions"][1]["warlords"][0]["def_wins"] = 1
+        self.deck_b["factions"][1]["warlords"][0]["off_losses"] = 1
+        self.cache = AggregateCache()
+        self.cache.rebuild([self.deck_a, self.deck_b])
+
+    def test_rebuild_totals(self):
+        """Totals are kept per deck, faction, warlord and overall."""
+        self.assertEqual(
+            self.cache.totals,
+            {"off_wins": 3, "off_losses": 1, "def_wins": 1, "def_losses": 1},
+        )
+        self.assertEqual(self.cache.deck_stats(self.deck_a)["off_wins"], 3)
+        self.assertEqual(self.cache.faction_totals["Orks (Goff Klan)"]["def_wins"], 1)
+        self.assertEqual(
+            self.cache.warlord_totals[("Ultramarines", "Marneus Calgar")]["def_losses"],
+            1,
+        )
+
+    def test_apply_matches_rebuild(self):
+        """Applying changes incrementally gives the same result as a rebuild."""
+        warlord = self.deck_b["factions"][0]["warlords"][2]
+        warlord["off_wins"] += 2
+        self.cache.apply(
+            self.deck_b, "Ultramarines", warlord["warlord_name"], "off_wins", 2
+        )
+
+        fresh = AggregateCache()
+        fresh.rebuild([self.deck_a, self.deck_b])
+        self.assertEqual(self.cache.totals, fresh.totals)
+        self.assertEqual(self.cache.faction_totals, fresh.faction_totals)
+        self.assertEqual(self.cache.warlord_totals, fresh.warlord_totals)
+        self.assertEqual(
+            self.cache.deck_stats(self.deck_b), fresh.deck_stats(self.deck_b)
+        )
+
+    def test_remove_deck(self):
+        """Removing a deck subtracts its counters everywhere."""
+        self.cache.remove_deck(self.deck_a)
+        self.assertEqual(
+            self.cache.totals,
+            {"off_wins": 0, "off_losses": 1, "def_wins": 1, "def_losses": 0},
+        )
+        self.assertEqual(self.cache.faction_totals["Ultramarines"]["off_wins"], 0)
+
+    def test_leaderboards(self):
+        """Leaderboards rank by win rate and skip entries without matches."""
+        warlords = self.cache.leaderboard("warlord")
+        self.assertEqual(
+            [e["name"] for e in warlords],
+            ["Marneus Calgar (Ultramarines)", "Ghazghkull Thraka (Orks (Goff Klan))"],
+        )
+        self.assertEqual(warlords[0]["win_rate"], 75.0)
+        self.assertEqual(warlords[0]["matches"], 4)
+
+        decks = self.cache.leaderboard("deck", limit=1)
+        self.assertEqual([e["name"] for e in decks], ["Deck A"])
+        self.assertEqual(len(self.cache.leaderboard("faction")), 2)
+        with self.assertRaises(ValueError):
+            self.cache.leaderboard("player")
+
+
+if __name__ == "__main__":
+    unittest.main()
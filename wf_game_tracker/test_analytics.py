@@ -0,0 +1,74 @@
+import subprocess
+import sys
+import unittest
+from wf_game_tracker.analytics import (
+    aggregate_store,
+    deck_totals,
+    faction_totals,
+    side_lines,
+    warlord_line,
+)
+from wf_game_tracker.master_data import new_deck
+from wf_game_tracker.stats_store import StatsStore
+
+
+class TestAnalytics(unittest.TestCase):
+
+    def setUp(self):
+        """Two decks with a few results."""
+        self.deck_a = new_deck("Deck A")
+        self.deck_b = new_deck("Deck B")
+        self.deck_a["factions"][0]["warlords"][0]["off_wins"] = 3
+        self.deck_a["factions"][0]["warlords"][1]["def_losses"] = 1
+        self.deck_b["factions"][1]["warlords"][0]["def_wins"] = 2
+
+    def test_warlord_line(self):
+        """A warlord line adds matches, totals and the win rate to its counters."""
+        line = warlord_line(
+            {"off_wins": 1, "off_losses": 1, "def_wins": 2, "def_losses": 0}
+        )
+        self.assertEqual(line["matches"], 4)
+        self.assertEqual(line["tot_wins"], 3)
+        self.assertEqual(line["tot_losses"], 1)
+        self.assertEqual(line["win_rate"], 75.0)
+        self.assertEqual(line["off_losses"], 1)
+
+    def test_deck_and_side_lines(self):
+        """Deck totals split into going first, going second and overall."""
+        lines = side_lines(deck_totals(self.deck_a))
+        self.assertEqual(lines["offense"]["win_rate"], 100.0)
+        self.assertEqual(lines["defense"]["losses"], 1)
+        self.assertEqual(lines["overall"]["matches"], 4)
+        self.assertEqual(faction_totals(self.deck_a)["Ultramarines"]["off_wins"], 3)
+        self.assertEqual(
+            side_lines(deck_totals(new_deck()))["overall"]["win_rate"], 0.0
+        )
+
+    def test_aggregate_store(self):
+        """Array slices of a StatsStore give the same totals as the decks."""
+        by_store = aggregate_store(StatsStore.from_decks([self.deck_a, self.deck_b]))
+        self.assertEqual(
+            by_store["decks"], [deck_totals(self.deck_a), deck_totals(self.deck_b)]
+        )
+        self.assertEqual(
+            by_store["factions"]["Ultramarines"],
+            faction_totals(self.deck_a)["Ultramarines"],
+        )
+        self.assertEqual(by_store["global"]["def_wins"], 2)
+        self.assertEqual(by_store["decks"][1]["def_wins"], 2)
+        self.assertEqual(by_store["factions"]["Orks (Goff Klan)"]["def_wins"], 2)
+        self.assertEqual(
+            by_store["warlords"][("Ultramarines", "Marneus Calgar")]["off_wins"], 3
+        )
+
+    def test_importable_without_tkinter(self):
+        """The module imports on a machine without tkinter."""
+        code = (
+            "import sys; sys.modules['tkinter'] = None; "
+            "import wf_game_tracker.analytics"
+        )
+        subprocess.run([sys.executable, "-c", code], check=True)
+
+
+if __name__ == "__main__":
+    unittest.main()
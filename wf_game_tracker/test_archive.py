@@ -0,0 +1,112 @@
+import os
+import tempfile
+import unittest
+from wf_game_tracker.aggregates import AggregateCache
+from wf_game_tracker.archive import (
+    ArchiveDeck,
+    ArchiveFormatError,
+    DeckArchive,
+    encode_archive,
+)
+from wf_game_tracker.master_data import new_deck
+from wf_game_tracker.save_pipeline import SnapshotCache
+from wf_game_tracker.storage import ArchiveStorage, JsonStorage, storage_for
+
+
+class TestArchive(unittest.TestCase):
+
+    def setUp(self):
+        """An archive of four decks with a few counters set."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.tmpdir.name, "decks.wfa")
+        self.decks = [new_deck(f"Deck {i}") for i in range(4)]
+        self.decks[1]["deck_name"] = "Über"
+        self.decks[0]["factions"][0]["warlords"][0]["off_wins"] = 5
+        self.decks[3]["factions"][2]["warlords"][1]["def_losses"] = 2
+        ArchiveStorage().write(self.filename, self.decks)
+        self.archive = DeckArchive(self.filename)
+
+    def tearDown(self):
+        """Close the archive and remove the temporary folder."""
+        self.archive.close()
+        self.tmpdir.cleanup()
+
+    def test_random_access(self):
+        """Any deck decodes on its own, names come from the index."""
+        self.assertIsInstance(storage_for("big.WFA"), ArchiveStorage)
+        self.assertEqual(len(self.archive), 4)
+        self.assertEqual(self.archive.deck_name(1), "Über")
+        self.assertEqual(self.archive.deck(3), self.decks[3])
+        self.assertEqual(self.archive.deck_totals(0)["off_wins"], 5)
+
+    def test_lazy_decks(self):
+        """ArchiveDecks are only decoded when more than the name is needed."""
+        decks = [
+            deck
+            for _i, deck, _d, _e in ArchiveStorage().iter_merged_decks(self.filename)
+        ]
+        self.assertEqual(decks[1]["deck_name"], "Über")
+        self.assertFalse(decks[1].decoded)
+        self.assertEqual(decks[3], self.decks[3])
+        self.assertTrue(decks[3].decoded)
+
+    def test_aggregates_match_decoded_decks(self):
+        """Archive decks give the same aggregates as plain decks, even when changed."""
+        lazy = [ArchiveDeck(self.archive, i) for i in range(4)]
+        # Changed before it was added (e.g. by a journal replay)
+        lazy[2]["factions"][0]["warlords"][0]["off_losses"] = 3
+        self.decks[2]["factions"][0]["warlords"][0]["off_losses"] = 3
+
+        cache = AggregateCache()
+        cache.rebuild(lazy[:3])
+        expected = AggregateCache()
+        expected.rebuild(self.decks[:3])
+        self.assertEqual(cache.totals, expected.totals)
+        self.assertEqual(cache.warlord_totals, expected.warlord_totals)
+        self.assertEqual(cache.deck_stats(lazy[0]), expected.deck_stats(self.decks[0]))
+        self.assertFalse(lazy[0].decoded)
+
+        cache.remove_deck(lazy[0])
+        cache.add_deck(lazy[0])
+        self.assertEqual(cache.faction_totals, expected.faction_totals)
+
+    def test_saving_keeps_decks_undecoded(self):
+        """Snapshots share undecoded decks and archives copy their rows."""
+        lazy = [ArchiveDeck(self.archive, i) for i in range(4)]
+        lazy[2]["deck_name"] = "Changed"
+        self.decks[2]["deck_name"] = "Changed"
+        snapshot = SnapshotCache().snapshot(lazy)
+
+        copy = os.path.join(self.tmpdir.name, "copy.wfa")
+        ArchiveStorage().write(copy, snapshot)
+        JsonStorage().write(os.path.join(self.tmpdir.name, "copy.json"), snapshot)
+        self.assertEqual([deck.decoded for deck in lazy], [False, False, True, False])
+        self.assertFalse(any(deck.decoded for deck in snapshot[:2]))
+        with open(copy, "rb") as f:
+            self.assertEqual(f.read(), encode_archive(self.decks))
+
+    def test_detach(self):
+        """A detached archive keeps its decks while the file is replaced."""
+        self.assertTrue(self.archive.maps(self.filename))
+        self.archive.detach()
+        self.assertFalse(self.archive.maps(self.filename))
+        ArchiveStorage().write(self.filename, [new_deck("Other")])
+        self.assertEqual(self.archive.deck(3), self.decks[3])
+
+        private = self.archive.private
+        self.archive.close()
+        self.assertFalse(os.path.exists(private))
+
+    def test_rejects_bad_files(self):
+        """Foreign and truncated files raise ArchiveFormatError."""
+        data = encode_archive(self.decks)
+        for index, bad in enumerate((b"", b"[]" * 40, data[:-4])):
+            path = os.path.join(self.tmpdir.name, f"bad{index}.wfa")
+            with open(path, "wb") as f:
+                f.write(bad)
+            with self.assertRaises(ArchiveFormatError):
+                DeckArchive(path)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+import csv
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+from wf_game_tracker.batch import expand_inputs, main, process_file, run_batch
+from wf_game_tracker.journal import MatchJournal, journal_path
+from wf_game_tracker.master_data import new_deck
+from wf_game_tracker.storage import SqliteStorage
+
+
+class TestBatch(unittest.TestCase):
+
+    def setUp(self):
+        """Three save files with one deck each (one also has a broken deck)."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.files = []
+        for i in range(3):
+            deck = new_deck(f"Deck {i}")
+            deck["factions"][0]["warlords"][0]["off_wins"] = i + 1
+            deck["factions"][0]["warlords"][0]["def_losses"] = 1
+            decks = [deck]
+            if i == 2:
+                decks.append({"deck_name": "Broken", "factions": "nope"})
+            filename = os.path.join(self.tmpdir.name, f"player{i}.json")
+            with open(filename, "w", encoding="utf-8") as f:
+                json.dump(decks, f)
+            self.files.append(filename)
+
+    def tearDown(self):
+        """Remove the temporary save files."""
+        self.tmpdir.cleanup()
+
+    def test_expand_inputs(self):
+        """Directories, globs and plain files expand to unique save files."""
+        pattern = os.path.join(self.tmpdir.name, "player[01].json")
+        self.assertEqual(expand_inputs([self.tmpdir.name]), self.files)
+        self.assertEqual(expand_inputs([pattern, self.files[0]]), self.files[:2])
+
+    def test_parallel_matches_serial(self):
+        """A process pool gives the same totals as running in-process."""
+        serial = run_batch(self.files, workers=1)
+        parallel = run_batch(self.files, workers=2)
+        self.assertEqual(serial, parallel)
+        self.assertEqual(serial["files"], 3)
+        self.assertEqual(len(serial["decks"]), 3)
+        self.assertEqual(serial["global"]["off_wins"], 6)
+        self.assertEqual(serial["factions"]["Ultramarines"]["def_losses"], 3)
+        self.assertEqual(len(serial["errors"]), 1)
+
+    def test_journal_is_replayed(self):
+        """Journal records next to a save file count like in the app."""
+        journal = MatchJournal()
+        journal.record_counter(0, "Ultramarines", "Marneus Calgar", "off_wins", 2)
+        journal.record_new_deck("Journal Deck")
+        journal.flush(journal_path(self.files[0]))
+
+        result = process_file(self.files[0])
+        self.assertEqual(
+            [name for name, _totals in result["decks"]], ["Deck 0", "Journal Deck"]
+        )
+        self.assertEqual(result["decks"][0][1]["off_wins"], 3)
+        self.assertEqual(result["errors"], [])
+
+    def test_database_uses_sql_aggregates(self):
+        """A .db file is aggregated by SQL and matches the same decks as JSON."""
+        database = os.path.join(self.tmpdir.name, "player0.db")
+        with open(self.files[0], encoding="utf-8") as f:
+            decks = json.load(f)
+        SqliteStorage().write(database, decks)
+
+        from_json = run_batch(self.files[:1], workers=1)
+        with patch("wf_game_tracker.batch.iter_load_steps") as load_steps:
+            from_database = run_batch([database], workers=1)
+        load_steps.assert_not_called()
+        self.assertEqual(from_database["global"], from_json["global"])
+        self.assertEqual(
+            [totals for _f, _name, totals in from_database["decks"]],
+            [totals for _f, _name, totals in from_json["decks"]],
+        )
+        self.assertEqual(
+            from_database["factions"]["Ultramarines"],
+            from_json["factions"]["Ultramarines"],
+        )
+
+    def test_json_and_csv_output(self):
+        """The CLI writes the aggregates as JSON or CSV."""
+        json_out = os.path.join(self.tmpdir.name, "report.out")
+        exit_code = main([self.tmpdir.name, "-j", "1", "-o", json_out])
+        self.assertEqual(exit_code, 1)  # the broken deck is reported
+        with open(json_out, encoding="utf-8") as f:
+            report = json.load(f)
+        self.assertEqual(report["global"]["matches"], 9)
+        self.assertEqual(report["global"]["win_rate"], 100.0 * 6 / 9)
+        self.assertEqual(report["deck"][2]["name"], "Deck 2")
+
+        csv_out = os.path.join(self.tmpdir.name, "report.csv.out")
+        main([self.files[0], "--format", "csv", "-o", csv_out])
+        with open(csv_out, encoding="utf-8") as f:
+            rows = list(csv.DictReader(f))
+        self.assertEqual(rows[0]["scope"], "global")
+        self.assertEqual(rows[0]["win_rate"], "50.0")
+        self.assertEqual(rows[-1]["file"], self.files[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+import unittest
+from wf_game_tracker.benchmark import (
+    BENCHMARKS,
+    compare,
+    merged_shape,
+    run_benchmarks,
+    synthetic_decks,
+)
+from wf_game_tracker.master_data import MASTER_TABLE, STAT_KEYS
+
+
+class TestBenchmark(unittest.TestCase):
+
+    def test_synthetic_decks(self):
+        """Decks have the requested shape, beyond the MASTER_TABLE if asked to."""
+        decks = synthetic_decks(3, factions=len(MASTER_TABLE) + 1, warlords=2)
+        self.assertEqual(len(decks), 3)
+        self.assertEqual(len(decks[0]["factions"]), len(MASTER_TABLE) + 1)
+        self.assertEqual(
+            decks[0]["factions"][-1]["faction_name"],
+            f"Synthetic Faction {len(MASTER_TABLE)}",
+        )
+        self.assertTrue(all(len(f["warlords"]) == 2 for f in decks[0]["factions"]))
+
+        counters = [
+            w[key]
+            for f in synthetic_decks(1, nonzero=0)[0]["factions"]
+            for w in f["warlords"]
+            for key in STAT_KEYS
+        ]
+        self.assertEqual(set(counters), {0})
+
+    def test_merged_shape(self):
+        """Factions and warlords beyond the MASTER_TABLE are counted as dropped."""
+        shape = merged_shape(synthetic_decks(1))
+        self.assertEqual(shape["dropped_factions"], 0)
+        self.assertEqual(shape["dropped_warlords"], 0)
+
+        wide = len(MASTER_TABLE[0]["warlords"]) + 1
+        shape = merged_shape(
+            synthetic_decks(1, factions=len(MASTER_TABLE) + 1, warlords=wide)
+        )
+        self.assertEqual(shape["dropped_factions"], 1)
+        self.assertGreater(shape["dropped_warlords"], wide)
+        self.assertEqual(
+            shape["tab_rows"], sum(len(f["warlords"]) for f in MASTER_TABLE)
+        )
+
+    def test_compare_uses_thresholds(self):
+        """Ratios are checked against the default or the per-benchmark limit."""
+        baseline = {
+            "benchmarks": {"load_data": {"median": 1.0}, "build_tabs": {"median": 1.0}},
+            "thresholds": {"build_tabs": 2.0},
+        }
+        results = {
+            "benchmarks": {
+                "load_data": {"median": 1.5},
+                "build_tabs": {"median": 1.5},
+                "write_data": {"median": 1.0},
+            }
+        }
+        rows = {row[0]: row for row in compare(results, baseline, threshold=1.25)}
+        self.assertEqual(set(rows), {"load_data", "build_tabs"})
+        self.assertGreater(rows["load_data"][3], rows["load_data"][4])
+        self.assertLess(rows["build_tabs"][3], rows["build_tabs"][4])
+
+    def test_run_benchmarks(self):
+        """A tiny run times every benchmark."""
+        results = run_benchmarks({"decks": 2, "nonzero": 0.5}, repeat=1)
+        self.assertEqual(set(results["benchmarks"]), set(BENCHMARKS))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+import json
+import os
+import struct
+import tempfile
+import unittest
+from wf_game_tracker.binary_format import (
+    FORMAT_VERSION,
+    MAGIC,
+    BinaryFormatError,
+    encode_decks,
+    iter_decks,
+)
+from wf_game_tracker.convert import convert_file, read_decks
+from wf_game_tracker.master_data import new_deck
+
+
+class TestBinaryFormat(unittest.TestCase):
+
+    def setUp(self):
+        """Merged decks with a few counters, including a negative one."""
+        self.decks = [new_deck(f"Deck {i}") for i in range(3)]
+        self.decks[0]["factions"][0]["warlords"][0]["off_wins"] = 7
+        self.decks[2]["factions"][1]["warlords"][1]["def_losses"] = -1
+
+    def test_round_trip(self):
+        """Decks read back exactly as written."""
+        self.assertEqual(list(iter_decks(encode_decks(self.decks))), self.decks)
+        self.assertEqual(list(iter_decks(encode_decks([]))), [])
+
+    def test_deck_without_factions(self):
+        """A deck without a "factions" key (the loader accepts one) encodes as empty."""
+        data = encode_decks([{"deck_name": "x"}])
+        self.assertEqual(list(iter_decks(data)), [{"deck_name": "x", "factions": []}])
+        with tempfile.TemporaryDirectory() as tmpdir:
+            source = os.path.join(tmpdir, "decks.json")
+            with open(source, "w", encoding="utf-8") as f:
+                json.dump([{"deck_name": "x"}], f)
+            self.assertEqual(convert_file(source, os.path.join(tmpdir, "d.wfd")), 1)
+            self.assertEqual(convert_file(source, os.path.join(tmpdir, "d.wfa")), 1)
+
+    def test_smaller_than_json(self):
+        """Names are stored once, so the file is a fraction of the JSON size."""
+        data = encode_decks(self.decks * 10)
+        self.assertLess(len(data) * 4, len(json.dumps(self.decks * 10, indent=2)))
+
+    def test_custom_layout_round_trip(self):
+        """Decks that do not follow the shared layout are kept as they are."""
+        partial = {
+            "deck_name": "Partial",
+            "factions": [
+                {
+                    "faction_name": "Orphans",
+                    "warlords": [
+                        {
+                            "warlord_name": "Lost",
+                            "off_wins": 1,
+                            "off_losses": 2,
+                            "def_wins": 3,
+                            "def_losses": 4,
+                        }
+                    ],
+                },
+                {"faction_name": "Empty", "warlords": []},
+            ],
+        }
+        decks = [self.decks[0], partial]
+        self.assertEqual(list(iter_decks(encode_decks(decks))), decks)
+
+    def test_rejects_bad_data(self):
+        """Foreign, newer and truncated files raise BinaryFormatError."""
+        data = encode_decks(self.decks)
+        newer = struct.pack("<4sHH", MAGIC, FORMAT_VERSION + 1, 0) + data[8:]
+        for bad in (b"[]", newer, data[:-3], data + b"\0"):
+            with self.assertRaises(BinaryFormatError):
+                list(iter_decks(bad))
+
+    def test_convert_json_and_back(self):
+        """JSON -> binary -> JSON gives the same decks."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            source = os.path.join(tmpdir, "decks.json")
+            with open(source, "w", encoding="utf-8") as f:
+                json.dump(self.decks, f, indent=2)
+            binary = os.path.join(tmpdir, "decks.wfd")
+            back = os.path.join(tmpdir, "back.json")
+            self.assertEqual(convert_file(source, binary), 3)
+            convert_file(binary, back)
+            self.assertEqual(read_decks(binary), self.decks)
+            with open(source, encoding="utf-8") as a, open(back, encoding="utf-8") as b:
+                self.assertEqual(a.read(), b.read())
+
+
+if __name__ == "__main__":
+    unittest.main()
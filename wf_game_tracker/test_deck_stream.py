@@ -0,0 +1,97 @@
+import io
+import json
+import unittest
+from wf_game_tracker.deck_stream import (
+    DeckStreamError,
+    iter_decks,
+    iter_merged_decks,
+)
+from wf_game_tracker.master_data import MASTER_TABLE, deep_copy_master_table
+
+
+class TestDeckStream(unittest.TestCase):
+
+    def setUp(self):
+        """Build a few full decks and their pretty-printed JSON document."""
+        self.decks = []
+        for i in range(3):
+            factions = deep_copy_master_table()
+            factions[0]["warlords"][0]["off_wins"] = i
+            self.decks.append({"deck_name": f"Deck {i}", "factions": factions})
+        self.text = json.dumps(self.decks, indent=2)
+
+    def test_reads_every_deck_across_small_chunks(self):
+        """Decks are decoded correctly even when split over many tiny chunks."""
+        for chunk_size in (1, 7, 4096):
+            results = list(iter_decks(io.StringIO(self.text), chunk_size=chunk_size))
+            self.assertEqual([r[1] for r in results], self.decks)
+            self.assertTrue(all(r[2] is None for r in results))
+
+    def test_empty_array(self):
+        """An empty array yields no decks."""
+        self.assertEqual(list(iter_decks(io.StringIO(" [ ] "))), [])
+
+    def test_not_an_array(self):
+        """A document that is not a deck array is rejected as a whole."""
+        with self.assertRaises(DeckStreamError):
+            list(iter_decks(io.StringIO('{"deck_name": "x"}')))
+
+    def test_truncated_file(self):
+        """A file cut in the middle of a deck raises after the complete decks."""
+        results = []
+        with self.assertRaises(DeckStreamError):
+            for result in iter_decks(io.StringIO(self.text[:-200]), chunk_size=64):
+                results.append(result)
+        self.assertEqual(len(results), 2)
+
+    def test_malformed_deck_is_reported_and_skipped(self):
+        """A syntax error inside one deck does not abort the others."""
+        text = '[{"deck_name": "A"}, {"deck_name": oops}, {"deck_name": "C"}]'
+        results = list(iter_decks(io.StringIO(text), chunk_size=5))
+
+        self.assertEqual(len(results), 3)
+        self.assertEqual(results[0][1], {"deck_name": "A"})
+        self.assertIsNone(results[1][1])
+        self.assertIsNotNone(results[1][2])
+        self.assertEqual(results[2][1], {"deck_name": "C"})
+
+    def test_invalid_deck_shape_is_reported(self):
+        """Decks with the wrong structure produce a per-deck error."""
+        text = json.dumps(
+            [
+                "not a deck",
+                {"deck_name": "Bad", "factions": {"faction_name": "x"}},
+                {
+                    "factions": [
+                        {
+                            "faction_name": "Ultramarines",
+                            "warlords": [{"warlord_name": "Marneus Calgar"}],
+                        }
+                    ]
+                },
+            ]
+        )
+        results = list(iter_decks(io.StringIO(text)))
+        self.assertEqual(len(results), 3)
+        self.assertTrue(all(deck is None for _i, deck, _e in results))
+        self.assertTrue(all(error for _i, _d, error in results))
+
+    def test_iter_merged_decks(self):
+        """Valid decks are merged with the MASTER_TABLE as they are read."""
+        text = '[{"deck_name": "A", "factions": []}, 42]'
+        results = list(iter_merged_decks(io.StringIO(text)))
+
+        index, merged, diff, error = results[0]
+        self.assertEqual(index, 0)
+        self.assertIsNone(error)
+        self.assertEqual(len(merged["factions"]), len(MASTER_TABLE))
+        self.assertEqual(len(diff["added_factions"]), len(MASTER_TABLE))
+
+        index, merged, diff, error = results[1]
+        self.assertEqual(index, 1)
+        self.assertIsNone(merged)
+        self.assertIsNotNone(error)
+
+
+if __name__ == "__main__":
+    unittest.main()
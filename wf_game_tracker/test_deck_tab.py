@@ -1,6 +1,8 @@
+import copy
 import unittest
 from unittest.mock import MagicMock, patch
 import tkinter as tk
+from wf_game_tracker.aggregates import AggregateCache
 from wf_game_tracker.deck_tab import DeckTab
 
 
@@ -28,6 +30,10 @@ class TestDeckTab(unittest.TestCase):
                 }
             ],
         }
+        # The faction cells read the app's matchup matrix
+        self.mock_app.aggregates = AggregateCache()
+        self.mock_app.aggregates.add_deck(self.sample_deck)
+        self.mock_app.on_counter_changed.side_effect = self.mock_app.aggregates.apply
 
         self.deck_tab = DeckTab(
             self.root, self.sample_deck, self.mock_app
@@ -57,6 +63,183 @@ class TestDeckTab(unittest.TestCase):
         # Ensure the value changed in the deck data
         self.assertEqual(warlord["off_wins"], initial_wins + 1)
 
+    def test_summary_rows_follow_clicks(self):
+        """Clicks adjust the running totals and the summary rows right away."""
+        warlord = self.sample_deck["factions"][0]["warlords"][0]
+
+        self.deck_tab.update_warlord_row(1, warlord, "def_wins", delta=2)
+        self.deck_tab.update_warlord_row(1, warlord, "off_losses", delta=1)
+        self.deck_tab.flush_render()
+
+        self.assertEqual(self.deck_tab.totals["def_wins"], 2)
+        self.assertEqual(self.deck_tab.summary_row_def["wins"].cget("text"), "2")
+        self.assertEqual(self.deck_tab.summary_row_off["losses"].cget("text"), "1")
+        self.assertEqual(self.deck_tab.summary_row_total["matches"].cget("text"), "3")
+        self.deck_tab.check_totals()
+
+    def test_check_totals_detects_drift(self):
+        """The consistency check fails if the deck changed behind the tab's back."""
+        self.sample_deck["factions"][0]["warlords"][0]["off_wins"] = 5
+        with self.assertRaises(AssertionError):
+            self.deck_tab.check_totals()
+
+    def test_lazy_tab_builds_on_demand(self):
+        """A lazy tab creates no grid until ensure_built is called."""
+        lazy_tab = DeckTab(self.root, self.sample_deck, self.mock_app, lazy=True)
+        self.assertFalse(lazy_tab.built)
+        self.assertIsNone(lazy_tab.canvas)
+        self.assertEqual(lazy_tab.label_refs, {})
+
+        lazy_tab.ensure_built()
+        self.assertTrue(lazy_tab.built)
+        self.assertIsNotNone(lazy_tab.canvas)
+        self.assertIn((1, "off_wins"), lazy_tab.label_refs)
+
+    def test_release_ui(self):
+        """Releasing a tab drops its widgets; rebuilding shows current data."""
+        warlord = self.sample_deck["factions"][0]["warlords"][0]
+        self.deck_tab.update_warlord_row(1, warlord, "off_wins", delta=1)
+
+        self.deck_tab.release_ui()
+        self.assertFalse(self.deck_tab.built)
+        self.assertEqual(self.deck_tab.winfo_children(), [])
+
+        self.deck_tab.ensure_built()
+        self.assertEqual(self.deck_tab.label_refs[(1, "off_wins")].cget("text"), "1")
+        self.assertEqual(self.deck_tab.totals["off_wins"], 1)
+
+    def test_faction_cell_shows_results_against_faction(self):
+        """The merged faction cell follows clicks on its warlords."""
+        label = self.deck_tab.faction_wr_labels["Ultramarines"]
+        self.assertIn("Matches: 0", label.cget("text"))
+
+        warlord = self.sample_deck["factions"][0]["warlords"][0]
+        self.deck_tab.update_warlord_row(1, warlord, "off_wins", delta=1)
+        self.deck_tab.update_warlord_row(1, warlord, "def_losses", delta=1)
+        self.deck_tab.flush_render()
+        self.assertEqual(
+            label.cget("text"),
+            "(vs Ultramarines)\nMatches: 2\nWins: 1\nLosses: 1\nWR: 50.0%",
+        )
+        self.deck_tab.check_totals()
+
+    def test_rebind_reuses_labels(self):
+        """Rebinding to a deck of the same layout repaints the existing labels."""
+        other = copy.deepcopy(self.sample_deck)
+        other["deck_name"] = "Other Deck"
+        warlord = other["factions"][0]["warlords"][0]
+        warlord["off_wins"] = 3
+        self.mock_app.aggregates.add_deck(other)
+        label = self.deck_tab.label_refs[(1, "off_wins")]
+
+        self.deck_tab.rebind(other)
+        self.deck_tab.flush_render()
+        self.assertIs(self.deck_tab.label_refs[(1, "off_wins")], label)
+        self.assertEqual(label.cget("text"), "3")
+        self.assertEqual(self.deck_tab.entry_title.get(), "Other Deck")
+        self.assertEqual(self.deck_tab.totals["off_wins"], 3)
+
+        # Clicks now change the new deck only
+        label.event_generate("<Button-1>")
+        self.deck_tab.flush_render()
+        self.assertEqual(warlord["off_wins"], 4)
+        self.assertEqual(self.sample_deck["factions"][0]["warlords"][0]["off_wins"], 0)
+
+    def test_rebind_other_layout_releases_ui(self):
+        """Rebinding to a deck with other warlords turns the tab into a placeholder."""
+        other = {"deck_name": "Empty", "factions": []}
+        self.deck_tab.rebind(other)
+        self.assertFalse(self.deck_tab.built)
+        self.assertIs(self.deck_tab.deck_obj, other)
+
+    def test_canvas_renderer(self):
+        """The canvas renderer shows the same data and reacts to clicks."""
+        canvas_tab = DeckTab(
+            self.root, self.sample_deck, self.mock_app, renderer="canvas"
+        )
+        self.assertEqual(canvas_tab.label_refs, {})
+        grid = canvas_tab.stats_grid
+
+        # Left-click the "Def. Wins" cell of the first warlord row
+        grid.on_click(1, 5, 1)
+        canvas_tab.flush_render()
+        self.assertEqual(self.sample_deck["factions"][0]["warlords"][0]["def_wins"], 1)
+        self.mock_app.on_counter_changed.assert_called_with(
+            self.sample_deck, "Ultramarines", "Marneus Calgar", "def_wins", 1
+        )
+
+        texts = [t for t, _bg, _fg in canvas_tab.grid_row_cells(1)]
+        self.assertEqual(
+            texts[:6],
+            ["Ultramarines vs: 1-0 (100.0%)", "Marneus Calgar", "1", "0", "0", "1"],
+        )
+        self.assertEqual(
+            grid.canvas.itemcget(grid.drawn_rows[1][0][1], "text"),
+            "Ultramarines vs: 1-0 (100.0%)",
+        )
+        _rect_id, text_id = grid.drawn_rows[1][5]
+        self.assertEqual(grid.canvas.itemcget(text_id, "text"), "1")
+
+        # TOTAL line follows the click; the Warlord column is not clickable
+        total = canvas_tab.grid_row_cells(canvas_tab.summary_start_row + 2)
+        self.assertEqual(total[2][0], "1")
+        grid.on_click(1, 1, 1)
+        self.assertEqual(canvas_tab.totals["def_wins"], 1)
+
+    def test_canvas_faction_record(self):
+        """The canvas renderer shows the record against a faction on its second row."""
+        warlords = self.sample_deck["factions"][0]["warlords"]
+        warlords.append(dict(warlords[0], warlord_name="Cato Sicarius", def_losses=1))
+        self.mock_app.aggregates.rebuild([self.sample_deck])
+        canvas_tab = DeckTab(
+            self.root, self.sample_deck, self.mock_app, renderer="canvas"
+        )
+        self.assertEqual(canvas_tab.grid_faction_text(1), "Ultramarines")
+        self.assertEqual(canvas_tab.grid_faction_text(2), "vs: 0-1 (0.0%)")
+
+        canvas_tab.on_grid_click(1, 3, 1)
+        canvas_tab.flush_render()
+        _rect_id, text_id = canvas_tab.stats_grid.drawn_rows[2][0]
+        self.assertEqual(
+            canvas_tab.stats_grid.canvas.itemcget(text_id, "text"), "vs: 1-1 (50.0%)"
+        )
+        canvas_tab.check_totals()
+
+    def test_click_burst_is_one_repaint(self):
+        """Many clicks queue a single repaint that only touches changed labels."""
+        warlord = self.sample_deck["factions"][0]["warlords"][0]
+        self.deck_tab.after_idle = MagicMock(return_value="job")
+        labels = self.deck_tab.label_refs
+        for key in ("off_wins", "def_wins", "matches"):
+            labels[(1, key)] = MagicMock()
+            self.deck_tab.shown_texts[labels[(1, key)]] = "0"
+
+        for _ in range(50):
+            self.deck_tab.update_warlord_row(1, warlord, "off_wins", delta=1)
+        self.deck_tab.after_idle.assert_called_once()
+        labels[(1, "off_wins")].config.assert_not_called()
+
+        self.deck_tab._on_idle_render()
+        labels[(1, "off_wins")].config.assert_called_once_with(text="50")
+        labels[(1, "matches")].config.assert_called_once_with(text="50")
+        labels[(1, "def_wins")].config.assert_not_called()
+        self.assertEqual(self.deck_tab.summary_row_off["wins"].cget("text"), "50")
+
+    def test_only_clicks_are_timed_as_clicks(self):
+        """Painting a new tab records no click samples; a real click records one."""
+        with patch("wf_game_tracker.instrumentation.PERF.enabled", True), patch(
+            "wf_game_tracker.instrumentation.PERF.record"
+        ) as record:
+            tab = DeckTab(self.root, self.sample_deck, self.mock_app)
+            recorded = [call.args[0] for call in record.call_args_list]
+            self.assertNotIn("click", recorded)
+
+            tab.on_counter_click(
+                1, self.sample_deck["factions"][0]["warlords"][0], "off_wins", 1
+            )
+            recorded = [call.args[0] for call in record.call_args_list]
+            self.assertEqual(recorded.count("click"), 1)
+
     def test_scrollable_frame_exists(self):
         """Ensure the scrollable frame structure is correctly initialized."""
         self.assertIsNotNone(self.deck_tab.canvas)
@@ -70,6 +253,7 @@ class TestDeckTab(unittest.TestCase):
 
         # Simulate incrementing off_wins
         self.deck_tab.update_warlord_row(1, warlord, "off_wins", delta=2)
+        self.deck_tab.flush_render()
 
         # Ensure label's text was updated
         self.deck_tab.label_refs[(1, "off_wins")].config.assert_called_with(text="2")
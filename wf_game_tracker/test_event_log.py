@@ -0,0 +1,142 @@
+import os
+import tempfile
+import unittest
+from wf_game_tracker.event_log import (
+    DEFENSE,
+    MAGIC,
+    OFFENSE,
+    _EVENT,
+    EventHistory,
+    EventLog,
+    RollingSeries,
+    decode_events,
+    encode_events,
+    event_for_counter,
+)
+
+
+def click(key, delta=1, timestamp=0.0, deck="Deck A", warlord="Marneus Calgar"):
+    return event_for_counter(deck, "Ultramarines", warlord, key, delta, timestamp)
+
+
+class TestEventLog(unittest.TestCase):
+
+    def test_event_for_counter(self):
+        """Counter keys map to a side and a result."""
+        event = click("def_losses")
+        self.assertEqual(event.side, DEFENSE)
+        self.assertFalse(event.won)
+        self.assertEqual(click("off_wins").side, OFFENSE)
+        self.assertTrue(click("off_wins").won)
+
+    def test_binary_round_trip(self):
+        """Events survive encoding; a torn trailing record is reported."""
+        events = [
+            click("off_wins", timestamp=1.5),
+            click("def_losses", delta=-1, timestamp=2.5, deck="Déck B"),
+        ]
+        data = MAGIC + encode_events(events) + encode_events(events[:1])
+        decoded, good_end = decode_events(data)
+        self.assertEqual(decoded, events + events[:1])
+        self.assertEqual(good_end, len(data))
+
+        # The torn event record starts one tag byte before the last _EVENT
+        decoded, good_end = decode_events(data[:-3])
+        self.assertEqual(decoded, events)
+        self.assertEqual(good_end, len(data) - 1 - _EVENT.size)
+
+        with self.assertRaises(ValueError):
+            decode_events(b"[]")
+
+    def test_rolling_windows(self):
+        """Window and since queries come from the prefix sums."""
+        series = RollingSeries()
+        for seq, won in enumerate([1, 1, 0, 1, 0, 0]):
+            series.append(seq, float(seq), won)
+        self.assertEqual(series.window(3), (1, 3))
+        self.assertEqual(series.window(100), (3, 6))
+        self.assertEqual(series.since(2.0), (1, 4))
+        self.assertAlmostEqual(series.win_rate(4), 25.0)
+        self.assertEqual(RollingSeries().win_rate(5), 0.0)
+
+        series.remove(1)
+        self.assertEqual(list(series.win_prefix), [0, 1, 1, 2, 2, 2])
+
+    def test_history_slices_and_retractions(self):
+        """Series exist per deck/side and overall; decrements take a game back."""
+        history = EventHistory(
+            [
+                click("off_wins", timestamp=1.0),
+                click("def_losses", timestamp=2.0, deck="Deck B"),
+                click("def_wins", timestamp=3.0),
+                click("off_wins", delta=-1, timestamp=4.0),
+            ]
+        )
+        self.assertEqual(
+            history.get("Ultramarines", "Marneus Calgar").window(10), (1, 2)
+        )
+        deck_a = history.get("Ultramarines", "Marneus Calgar", deck_name="Deck A")
+        self.assertEqual(deck_a.window(10), (1, 1))
+        self.assertEqual(
+            history.get("Ultramarines", "Marneus Calgar", side=OFFENSE).window(10),
+            (0, 0),
+        )
+        self.assertEqual(
+            history.win_rate_last(1, "Ultramarines", "Marneus Calgar", side=DEFENSE),
+            100.0,
+        )
+
+    def test_flush_appends_batches(self):
+        """Each flush appends a batch; history reloads stored and pending events."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "decks.json.events")
+            log = EventLog()
+            log.record_counter(
+                "Deck A", "Ultramarines", "Marneus Calgar", "off_wins", 1
+            )
+            self.assertEqual(log.flush(), 0)  # not attached yet
+
+            log.attach(path)
+            self.assertEqual(log.flush(), 1)
+            log.record_counter(
+                "Deck A", "Ultramarines", "Marneus Calgar", "off_wins", 1
+            )
+            log.flush()
+
+            fresh = EventLog()
+            fresh.attach(path)
+            fresh.record_counter(
+                "Deck A", "Ultramarines", "Marneus Calgar", "off_losses", 1
+            )
+            series = fresh.history().get("Ultramarines", "Marneus Calgar")
+            self.assertEqual(series.window(10), (2, 3))
+
+    def test_append_after_torn_tail(self):
+        """A record torn by a crash is cut off before the next batch is appended."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "decks.json.events")
+            log = EventLog()
+            log.attach(path)
+            log.record_counter(
+                "Deck A", "Ultramarines", "Marneus Calgar", "off_wins", 1
+            )
+            log.flush()
+            with open(path, "ab") as f:
+                f.write(encode_events([click("def_wins")])[:-2])  # the crash
+
+            log = EventLog()
+            log.attach(path)
+            log.record_counter(
+                "Deck A", "Ultramarines", "Marneus Calgar", "off_wins", 1
+            )
+            log.flush()
+
+            with open(path, "rb") as f:
+                data = f.read()
+            events, good_end = decode_events(data)
+            self.assertEqual(good_end, len(data))
+            self.assertEqual([(e.side, e.won) for e in events], [(OFFENSE, True)] * 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+import json
+import os
+import tempfile
+import unittest
+from wf_game_tracker.instrumentation import (
+    PERF,
+    Histogram,
+    Instrumentation,
+    timed,
+)
+
+
+@timed("test.square")
+def square(x):
+    return x * x
+
+
+class TestInstrumentation(unittest.TestCase):
+
+    def tearDown(self):
+        """Leave the shared instrumentation switched off and empty."""
+        PERF.configure(enabled=False, output=None)
+        PERF.reset()
+
+    def test_histogram(self):
+        """Latencies land in buckets; percentiles are bucket upper bounds."""
+        histogram = Histogram()
+        for seconds in (0.0002, 0.0003, 0.004, 3.0):
+            histogram.record(seconds)
+        stats = histogram.as_dict()
+        self.assertEqual(stats["count"], 4)
+        self.assertEqual(
+            stats["buckets_ms"], {"<=0.25": 1, "<=0.5": 1, "<=5": 1, ">2500": 1}
+        )
+        self.assertEqual(histogram.percentile(50), 0.5)
+        self.assertEqual(histogram.percentile(100), 3000.0)
+
+    def test_timed_is_opt_in(self):
+        """Nothing is recorded until instrumentation is enabled."""
+        self.assertEqual(square(3), 9)
+        self.assertEqual(PERF.histograms, {})
+        PERF.configure(output=None)
+        square(4)
+        square(5)
+        self.assertEqual(PERF.histograms["test.square"].count, 2)
+        self.assertIn("test.square: 2x", PERF.report())
+
+    def test_capture_once(self):
+        """The captured operation is profiled on its first call only."""
+        PERF.configure(output=None, capture="test.square")
+        square(2)
+        square(3)
+        self.assertIn("square", PERF.captures["test.square"])
+        self.assertEqual(PERF.histograms["test.square"].count, 2)
+
+    def test_configure_from_env_and_dump(self):
+        """Environment settings enable timing; dump writes the report as JSON."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            output = os.path.join(tmpdir, "perf.json")
+            perf = Instrumentation()
+            perf.configure_from_env({})
+            self.assertFalse(perf.enabled)
+            perf.configure_from_env(
+                {
+                    "WF_TRACKER_PROFILE_OUT": output,
+                    "WF_TRACKER_CAPTURE": "load:tracemalloc",
+                }
+            )
+            self.assertTrue(perf.enabled)
+            self.assertEqual((perf.capture, perf.capture_mode), ("load", "tracemalloc"))
+
+            perf.record("click", 0.001)
+            perf.dump({"startup": {"first_paint": 0.1}})
+            with open(output, encoding="utf-8") as f:
+                document = json.load(f)
+            self.assertEqual(document["operations"]["click"]["count"], 1)
+            self.assertEqual(document["startup"], {"first_paint": 0.1})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+import os
+import tempfile
+import unittest
+from wf_game_tracker.journal import (
+    JournalReplay,
+    MatchJournal,
+    journal_path,
+    read_journal,
+)
+from wf_game_tracker.master_data import deep_copy_master_table
+
+
+class TestMatchJournal(unittest.TestCase):
+
+    def setUp(self):
+        """Create a temporary journal file path and a fresh deck."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = journal_path(os.path.join(self.tmpdir.name, "decks.json"))
+        self.deck = {"deck_name": "Deck", "factions": deep_copy_master_table()}
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_journal_path(self):
+        """The journal lives next to its snapshot."""
+        self.assertEqual(journal_path("decks.json"), "decks.json.journal")
+
+    def test_flush_appends_compact_records(self):
+        """Each flush appends one line per pending record and clears the buffer."""
+        journal = MatchJournal()
+        journal.record_counter(0, "Ultramarines", "Marneus Calgar", "off_wins", 1)
+        self.assertEqual(journal.flush(self.path), 1)
+        journal.record_counter(0, "Ultramarines", "Marneus Calgar", "def_wins", -1)
+        self.assertEqual(journal.flush(self.path), 1)
+        self.assertEqual(journal.pending, [])
+
+        with open(self.path, encoding="utf-8") as f:
+            lines = f.read().splitlines()
+        self.assertEqual(
+            lines,
+            [
+                '["c",0,"Ultramarines","Marneus Calgar","off_wins",1]',
+                '["c",0,"Ultramarines","Marneus Calgar","def_wins",-1]',
+            ],
+        )
+
+    def test_consecutive_renames_are_coalesced(self):
+        """Renaming a deck key by key keeps only the final name."""
+        journal = MatchJournal()
+        for name in ("D", "De", "Dec"):
+            journal.record_rename(2, name)
+        self.assertEqual(journal.pending, [["r", 2, "Dec"]])
+
+    def test_replay_applies_records(self):
+        """Replaying the journal reproduces counters, renames and new decks."""
+        journal = MatchJournal()
+        journal.record_counter(0, "Ultramarines", "Marneus Calgar", "off_wins", 2)
+        journal.record_rename(0, "Renamed")
+        journal.record_new_deck("Added")
+        journal.record_counter(1, "Ultramarines", "Uriel Ventris", "def_losses", 1)
+        journal.flush(self.path)
+
+        replay = read_journal(self.path)
+        replay.apply(0, self.deck)
+        new_decks = replay.new_decks(first_index=1)
+
+        self.assertEqual(self.deck["deck_name"], "Renamed")
+        self.assertEqual(self.deck["factions"][0]["warlords"][0]["off_wins"], 2)
+        self.assertEqual(len(new_decks), 1)
+        self.assertEqual(new_decks[0]["deck_name"], "Added")
+        uriel = new_decks[0]["factions"][0]["warlords"][4]
+        self.assertEqual(uriel["warlord_name"], "Uriel Ventris")
+        self.assertEqual(uriel["def_losses"], 1)
+        self.assertEqual(replay.bad_records, 0)
+
+    def test_torn_and_unknown_records_are_counted(self):
+        """Undecodable lines and unknown warlords are skipped and counted."""
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write('["c",0,"Ultramarines","Marneus Calgar","off_wins",1]\n')
+            f.write('["c",0,"Ultramarines","Nobody","off_wins",1]\n')
+            f.write('["x"]\n')
+            f.write('["c",0,"Ultram')
+
+        replay = read_journal(self.path)
+        replay.apply(0, self.deck)
+
+        self.assertEqual(self.deck["factions"][0]["warlords"][0]["off_wins"], 1)
+        self.assertEqual(replay.bad_records, 3)
+
+    def test_empty_replay(self):
+        """A replay without records leaves decks untouched."""
+        replay = JournalReplay()
+        replay.apply(0, self.deck)
+        self.assertEqual(self.deck["factions"], deep_copy_master_table())
+        self.assertEqual(replay.new_decks(1), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
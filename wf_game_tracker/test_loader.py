@@ -0,0 +1,56 @@
+import json
+import os
+import tempfile
+import unittest
+from wf_game_tracker.loader import (
+    DECK,
+    DONE,
+    ERROR,
+    FAILED,
+    START,
+    BackgroundLoad,
+    iter_load_steps,
+)
+
+
+class TestLoader(unittest.TestCase):
+
+    def setUp(self):
+        """A save file with two good decks around a broken one."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.tmpdir.name, "decks.json")
+        decks = [
+            {"deck_name": "A", "factions": []},
+            {"deck_name": "Broken", "factions": "nope"},
+            {"deck_name": "B", "factions": []},
+        ]
+        with open(self.filename, "w", encoding="utf-8") as f:
+            json.dump(decks, f)
+
+    def tearDown(self):
+        """Remove the temporary save file."""
+        self.tmpdir.cleanup()
+
+    def test_load_steps(self):
+        """START comes first, then decks and errors in file order."""
+        kinds = [step[0] for step in iter_load_steps(self.filename)]
+        self.assertEqual(kinds, [START, DECK, ERROR, DECK])
+
+    def test_background_load(self):
+        """The worker queues the same steps followed by DONE."""
+        load = BackgroundLoad(self.filename)
+        load.thread.join()
+        steps = load.take(2) + load.take(100)
+        self.assertEqual([step[0] for step in steps], [START, DECK, ERROR, DECK, DONE])
+        self.assertEqual(steps[3][1]["deck_name"], "B")
+
+    def test_background_load_failure(self):
+        """A file that cannot be read is reported as FAILED, then DONE."""
+        load = BackgroundLoad(os.path.join(self.tmpdir.name, "missing.json"))
+        load.thread.join()
+        steps = load.take(10)
+        self.assertEqual([step[0] for step in steps], [FAILED, DONE])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,8 +1,17 @@
 import unittest
-from unittest.mock import patch, mock_open
+from unittest.mock import MagicMock, patch, mock_open
 import json
+import os
+import tempfile
 import tkinter as tk
-from wf_game_tracker.main_app import DeckTrackerApp
+from wf_game_tracker.instrumentation import PERF
+from wf_game_tracker.main_app import (
+    AUTOSAVE_QUIET_S,
+    MAX_BUILT_TABS,
+    MAX_POOLED_TABS,
+    DeckTrackerApp,
+)
+from wf_game_tracker.master_data import MASTER_TABLE
 
 
 class TestDeckTrackerApp(unittest.TestCase):
@@ -28,6 +37,12 @@ class TestDeckTrackerApp(unittest.TestCase):
         self.assertEqual(len(self.app.decks), 1)
         self.assertEqual(self.app.decks[0]["deck_name"], "New Deck")
 
+    def test_create_new_deck_button_adds_tab_at_once(self):
+        """The button adds the deck and its tab together, not on a later idle."""
+        self.app.handle_add_new_deck()
+        self.assertEqual(len(self.app.deck_tabs), len(self.app.decks))
+        self.assertIs(self.app.deck_tabs[0].deck_obj, self.app.decks[0])
+
     def test_merge_with_master_table(self):
         """Test merging loaded deck data with MASTER_TABLE to include new factions/warlords."""
         sample_loaded_deck = [
@@ -54,6 +69,9 @@ class TestDeckTrackerApp(unittest.TestCase):
 
         # Ensure original warlord data is retained
         self.assertEqual(merged_decks[0]["factions"][0]["warlords"][0]["off_wins"], 2)
+        # Only counts are kept of the merge
+        self.assertEqual(self.app.last_merge_report["kept_warlords"], 1)
+        self.assertEqual(self.app.last_merge_report["kept_factions"], 1)
 
     @patch("tkinter.filedialog.askopenfilename", return_value="test_file.json")
     @patch(
@@ -67,27 +85,332 @@ class TestDeckTrackerApp(unittest.TestCase):
         self.assertEqual(len(self.app.decks), 1)
         self.assertEqual(self.app.decks[0]["deck_name"], "Test Deck")
 
-    @patch("tkinter.filedialog.asksaveasfilename", return_value="test_file.json")
-    @patch("builtins.open", new_callable=mock_open)
+    @patch("tkinter.messagebox.showwarning")
+    @patch(
+        "builtins.open",
+        new_callable=mock_open,
+        read_data='[{"deck_name": "Good", "factions": []}, {"deck_name": oops}]',
+    )
+    def test_load_data_skips_malformed_decks(self, mock_open, mock_warning):
+        """Test that a malformed deck is reported without aborting the load."""
+        self.app.load_data("test_file.json")
+        self.assertEqual(len(self.app.decks), 1)
+        self.assertEqual(self.app.decks[0]["deck_name"], "Good")
+        self.assertEqual(len(self.app.deck_tabs), 1)
+        self.assertEqual(self.app.last_merge_report["kept_factions"], 0)
+        self.assertEqual(
+            self.app.last_merge_report["added_factions"], len(MASTER_TABLE)
+        )
+        mock_warning.assert_called_once()
+
+    @patch("tkinter.filedialog.asksaveasfilename")
     @patch("tkinter.messagebox.showinfo")  # <-- Mock the pop-up
-    def test_save_file_as(self, mock_messagebox, mock_open, mock_filedialog):
+    def test_save_file_as(self, mock_messagebox, mock_filedialog):
         """Test saving deck data to a JSON file without showing a messagebox."""
-        self.app.create_new_deck()
-        self.app.save_file_as()
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filename = os.path.join(tmpdir, "test_file.json")
+            mock_filedialog.return_value = filename
+            self.app.create_new_deck()
+            self.app.save_file_as()
 
-        # Ensure file was written
-        mock_open.assert_called_once_with("test_file.json", "w", encoding="utf-8")
+            # The snapshot is written in the background
+            self.app.wait_for_save()
+            with open(filename, encoding="utf-8") as f:
+                json_content = json.load(f)
+            self.assertEqual(json_content[0]["deck_name"], "New Deck")
+            self.assertEqual(os.listdir(tmpdir), ["test_file.json"])
 
-        # Get the mock file handle and the written data
-        handle = mock_open()
-        written_data = "".join(call.args[0] for call in handle.write.call_args_list)
+        # Ensure no real pop-up appears
+        mock_messagebox.assert_called_with("Saved", f"Data saved to {filename}")
 
-        # Ensure JSON data is valid
-        json_content = json.loads(written_data)
-        self.assertEqual(json_content[0]["deck_name"], "New Deck")
+    @patch("tkinter.messagebox.showinfo")
+    def test_overlapping_saves_are_coalesced(self, mock_messagebox):
+        """Test that saves requested during a save become one follow-up save."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filename = os.path.join(tmpdir, "decks.json")
+            self.app.create_new_deck()
+            self.app.write_data(filename)
+            self.app.decks[0]["deck_name"] = "Renamed"
+            self.app.on_deck_renamed(self.app.decks[0])
+            self.app.write_data(filename)
+            self.app.write_data(filename)
+            self.assertEqual(self.app.pending_save, (filename, True))
 
-        # Ensure no real pop-up appears
-        mock_messagebox.assert_called_with("Saved", "Data saved to test_file.json")
+            self.app.wait_for_save()
+            self.assertEqual(mock_messagebox.call_count, 2)
+            with open(filename, encoding="utf-8") as f:
+                self.assertEqual(json.load(f)[0]["deck_name"], "Renamed")
+
+    @patch("tkinter.messagebox.showinfo")
+    def test_autosave_writes_changes_quietly(self, mock_messagebox):
+        """Test that a change schedules one silent autosave of the current file."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filename = os.path.join(tmpdir, "decks.json")
+            self.app.create_new_deck()
+            self.app.write_data(filename)
+            self.app.wait_for_save()
+            self.assertFalse(self.app.unsaved_changes)
+            mock_messagebox.reset_mock()
+
+            deck = self.app.decks[0]
+            warlord = deck["factions"][0]["warlords"][0]
+            for _ in range(3):
+                warlord["off_losses"] += 1
+                self.app.on_counter_changed(
+                    deck, "Ultramarines", warlord["warlord_name"], "off_losses", 1
+                )
+            self.assertTrue(self.app.unsaved_changes)
+            self.assertIsNotNone(self.app.autosave_job)
+
+            self.app.autosave()
+            self.app.wait_for_save()
+            self.assertFalse(self.app.unsaved_changes)
+            mock_messagebox.assert_not_called()
+            with open(filename, encoding="utf-8") as f:
+                saved = json.load(f)[0]["factions"][0]["warlords"][0]
+            self.assertEqual(saved["off_losses"], 3)
+
+            # Nothing changed since: the next autosave writes nothing
+            os.remove(filename)
+            self.app.autosave()
+            self.app.wait_for_save()
+            self.assertFalse(os.path.exists(filename))
+
+    @patch("tkinter.messagebox.askyesnocancel")
+    def test_quit_saves_pending_changes(self, mock_ask):
+        """Quitting writes changes the autosave had not got to yet."""
+        self.app.quit = MagicMock()
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filename = os.path.join(tmpdir, "decks.json")
+            deck = self.app.add_new_deck()
+            self.app.write_data(filename, notify=False)
+            self.app.wait_for_save()
+            self.app.rename_deck(deck, "Renamed")
+
+            self.app.exit_app()
+            mock_ask.assert_not_called()
+            self.app.quit.assert_called_once()
+            with open(filename, encoding="utf-8") as f:
+                self.assertEqual(json.load(f)[0]["deck_name"], "Renamed")
+
+    @patch("tkinter.messagebox.askyesnocancel")
+    def test_quit_asks_without_autosave(self, mock_ask):
+        """Without a file to autosave to, quitting asks first."""
+        self.app.quit = MagicMock()
+        self.app.add_new_deck()
+        mock_ask.return_value = None
+        self.app.exit_app()
+        self.app.quit.assert_not_called()
+
+        mock_ask.return_value = False
+        self.app.exit_app()
+        self.app.quit.assert_called_once()
+
+    def test_autosave_waits_for_clicks_to_pause(self):
+        """Every change pushes the pending autosave back by the quiet period."""
+        self.app.add_new_deck()
+        self.app.last_autosave -= self.app.autosave_interval  # not throttled
+        self.app.after = MagicMock(side_effect=["job1", "job2"])
+        self.app.after_cancel = MagicMock()
+
+        deck = self.app.decks[0]
+        self.app.rename_deck(deck, "A")
+        self.app.rename_deck(deck, "AB")
+        self.app.after_cancel.assert_called_with("job1")
+        self.assertEqual(self.app.autosave_job, "job2")
+        delay, callback = self.app.after.call_args.args
+        self.assertEqual(delay, AUTOSAVE_QUIET_S * 1000)
+        self.assertEqual(callback, self.app.autosave)
+
+    @patch("tkinter.messagebox.showinfo")
+    @patch("tkinter.messagebox.showwarning")
+    def test_no_autosave_after_skipped_decks(self, mock_warning, mock_info):
+        """After a load that skipped decks, only an explicit save rewrites the file."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filename = os.path.join(tmpdir, "decks.json")
+            with open(filename, "w", encoding="utf-8") as f:
+                f.write('[{"deck_name": "Good", "factions": []}, {"deck_name": oops}]')
+            with open(filename, encoding="utf-8") as f:
+                original = f.read()
+
+            self.app.load_data(filename)
+            mock_warning.assert_called_once()
+            deck = self.app.decks[0]
+            self.app.rename_deck(deck, "Renamed")
+            self.assertIsNone(self.app.autosave_job)
+            self.app.autosave()
+            self.app.wait_for_save()
+            with open(filename, encoding="utf-8") as f:
+                self.assertEqual(f.read(), original)
+
+            self.app.save_file()
+            self.app.wait_for_save()
+            self.assertFalse(self.app.autosave_suspended)
+            with open(filename, encoding="utf-8") as f:
+                self.assertEqual(json.load(f)[0]["deck_name"], "Renamed")
+
+    @patch("tkinter.messagebox.showerror")
+    def test_failed_load_never_overwrites_the_file(self, mock_error):
+        """A load that stops part-way leaves the file to an explicit save."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filename = os.path.join(tmpdir, "decks.json")
+            with open(filename, "w", encoding="utf-8") as f:
+                f.write('[{"deck_name": "Good", "factions": []}, 5, {"x": [1, 2}]')
+            with open(filename, encoding="utf-8") as f:
+                original = f.read()
+
+            self.app.load_data(filename)
+            mock_error.assert_called_once()
+            self.assertEqual(len(self.app.decks), 1)
+            self.app.rename_deck(self.app.decks[0], "Renamed")
+            self.assertIsNone(self.app.autosave_job)
+            self.app.autosave()
+            self.app.wait_for_save()
+            with open(filename, encoding="utf-8") as f:
+                self.assertEqual(f.read(), original)
+
+            # Same for a background load that was cancelled before a failing one
+            self.app.autosave_suspended = False
+            self.app.load_data_in_background(filename)
+            self.app.load_data(os.path.join(tmpdir, "missing.json"))
+            self.app.autosave()
+            self.app.wait_for_save()
+            with open(filename, encoding="utf-8") as f:
+                self.assertEqual(f.read(), original)
+
+    @patch("tkinter.messagebox.showinfo")
+    def test_journal_save_and_replay(self, mock_messagebox):
+        """Test that journal saves append changes that are replayed on load."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filename = os.path.join(tmpdir, "decks.json")
+            self.app.create_new_deck()
+            self.app.write_data(filename)
+            self.app.wait_for_save()
+            self.app.journal_saves.set(True)
+
+            deck = self.app.decks[0]
+            warlord = deck["factions"][0]["warlords"][0]
+            warlord["off_wins"] += 3
+            self.app.on_counter_changed(
+                deck, "Ultramarines", warlord["warlord_name"], "off_wins", 3
+            )
+            self.app.save_file()
+            self.assertTrue(os.path.exists(filename + ".journal"))
+            self.assertTrue(os.path.exists(filename + ".events"))
+
+            self.app.load_data(filename)
+            warlord = self.app.decks[0]["factions"][0]["warlords"][0]
+            self.assertEqual(warlord["off_wins"], 3)
+            series = self.app.events.history().get("Ultramarines", "Marneus Calgar")
+            self.assertEqual(series.window(10), (3, 3))
+
+            self.app.compact_journal()
+            self.app.wait_for_save()
+            self.assertFalse(os.path.exists(filename + ".journal"))
+
+    @patch("tkinter.messagebox.showinfo")
+    def test_sqlite_storage_persists_clicks(self, mock_messagebox):
+        """Test that clicks are written straight to an attached SQLite file."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filename = os.path.join(tmpdir, "decks.db")
+            self.app.create_new_deck()
+            self.app.write_data(filename)
+            self.app.wait_for_save()
+            self.assertTrue(self.app.storage.live)
+
+            deck = self.app.decks[0]
+            warlord = deck["factions"][0]["warlords"][0]
+            warlord["def_wins"] += 2
+            self.app.on_counter_changed(
+                deck, "Ultramarines", warlord["warlord_name"], "def_wins", 2
+            )
+
+            self.app.load_data(filename)
+            warlord = self.app.decks[0]["factions"][0]["warlords"][0]
+            self.assertEqual(warlord["def_wins"], 2)
+            self.app.storage.close()
+
+    @patch("tkinter.messagebox.showinfo")
+    def test_save_as_database_keeps_later_edits(self, mock_messagebox):
+        """Test that edits right after a Save As to SQLite reach the database."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filename = os.path.join(tmpdir, "decks.db")
+            first = self.app.add_new_deck()
+            self.app.add_new_deck()
+            self.app.write_data(filename)
+            self.assertTrue(self.app.storage.live)
+            self.app.rename_deck(first, "After")
+            self.app.delete_deck(self.app.decks[1])
+            self.app.wait_for_save()
+            self.app.storage.close()
+
+            self.app.load_data(filename)
+            self.assertEqual([d["deck_name"] for d in self.app.decks], ["After"])
+            self.app.storage.close()
+
+    @patch("tkinter.messagebox.showinfo")
+    def test_archive_opens_lazily(self, mock_messagebox):
+        """Test that opening an archive only decodes the decks that are shown."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filename = os.path.join(tmpdir, "decks.wfa")
+            for _ in range(3):
+                self.app.create_new_deck()
+            self.app.decks[2]["factions"][0]["warlords"][0]["def_wins"] = 4
+            self.app.write_data(filename)
+            self.app.wait_for_save()
+
+            self.app.load_data(filename)
+            self.assertEqual(len(self.app.decks), 3)
+            self.assertFalse(self.app.decks[2].decoded)
+            self.assertEqual(self.app.aggregates.totals["def_wins"], 4)
+
+            self.app.show_deck_tab(self.app.deck_tabs[0])
+            self.assertTrue(self.app.decks[0].decoded)
+            self.assertFalse(self.app.decks[1].decoded)
+
+    @patch("tkinter.messagebox.showinfo")
+    def test_save_over_open_archive(self, mock_messagebox):
+        """Test that saving over the open archive neither decodes nor replaces the mapped file."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filename = os.path.join(tmpdir, "decks.wfa")
+            for _ in range(3):
+                self.app.create_new_deck()
+            self.app.decks[2]["factions"][0]["warlords"][0]["def_wins"] = 4
+            self.app.write_data(filename)
+            self.app.wait_for_save()
+            self.app.load_data(filename)
+            archive = self.app.decks[2].archive
+
+            self.app.write_data(filename)
+            self.app.wait_for_save()
+            self.assertFalse(self.app.decks[2].decoded)
+            self.assertFalse(archive.maps(filename))
+            self.assertEqual(archive.deck_totals(2)["def_wins"], 4)
+            private = archive.private
+
+            self.app.load_data(filename)
+            self.assertTrue(archive.map.closed)
+            self.assertFalse(os.path.exists(private))
+            self.assertEqual(self.app.aggregates.totals["def_wins"], 4)
+            self.app.clear_decks()
+
+    @patch("tkinter.messagebox.showinfo")
+    def test_performance_dialog(self, mock_messagebox):
+        """Test that Help -> Performance lists the timed operations."""
+        self.app.show_performance()
+        self.assertIn("timings are off", mock_messagebox.call_args[0][1])
+
+        PERF.configure(output=None)
+        try:
+            self.app.create_new_deck()
+            self.app.build_tabs()
+            self.app.show_performance()
+        finally:
+            PERF.configure(enabled=False, output=None)
+            PERF.reset()
+        message = mock_messagebox.call_args[0][1]
+        self.assertIn("tabs.rebuild: 1x", message)
+        self.assertIn("tab.build: 1x", message)
 
     @patch("tkinter.messagebox.showinfo")
     def test_show_overall_summary(self, mock_messagebox):
@@ -122,6 +445,207 @@ class TestDeckTrackerApp(unittest.TestCase):
         )
         mock_messagebox.assert_called_with("Overall Summary", expected_message)
 
+    @patch("tkinter.messagebox.showinfo")
+    def test_summary_follows_counter_changes(self, mock_messagebox):
+        """Test that the overall summary and leaderboards use live totals."""
+        self.app.create_new_deck()
+        deck = self.app.decks[0]
+        warlord = deck["factions"][0]["warlords"][0]
+        warlord["off_wins"] += 1
+        self.app.on_counter_changed(
+            deck, "Ultramarines", warlord["warlord_name"], "off_wins", 1
+        )
+
+        self.app.show_overall_summary()
+        mock_messagebox.assert_called_with(
+            "Overall Summary",
+            "Overall Matches: 1\n"
+            "Overall Wins: 1\n"
+            "Overall Losses: 0\n"
+            "Overall Win Rate: 100.0%\n",
+        )
+
+        self.app.show_leaderboards()
+        title, message = mock_messagebox.call_args.args
+        self.assertEqual(title, "Leaderboards")
+        self.assertIn("1. Marneus Calgar (Ultramarines) - 100.0% (1W/0L)", message)
+
+    def test_deck_operations_update_one_tab(self):
+        """Duplicate, move, rename and delete keep decks and tabs in step."""
+
+        def tab_names():
+            return [self.app.notebook.tab(tab, "text") for tab in self.app.deck_tabs]
+
+        first, second = self.app.add_new_deck(), self.app.add_new_deck()
+        warlord = first["factions"][0]["warlords"][0]
+        warlord["off_wins"] += 2
+        self.app.on_counter_changed(
+            first, "Ultramarines", warlord["warlord_name"], "off_wins", 2
+        )
+        tabs = list(self.app.deck_tabs)
+        self.assertFalse(self.app.journal_needs_snapshot)
+
+        copy = self.app.duplicate_deck(first)
+        self.assertEqual(self.app.decks, [first, copy, second])
+        self.assertEqual(copy["factions"][0]["warlords"][0]["off_wins"], 2)
+        self.assertEqual(self.app.aggregates.totals["off_wins"], 4)
+        self.assertEqual(self.app.deck_tabs[0::2], tabs)
+        self.assertTrue(self.app.journal_needs_snapshot)
+
+        self.app.move_deck(second, 0)
+        self.assertEqual(self.app.decks, [second, first, copy])
+        self.app.rename_deck(copy, "Copy")
+        self.assertEqual(tab_names(), ["New Deck", "New Deck", "Copy"])
+        self.assertEqual(
+            [str(tab) for tab in self.app.deck_tabs], list(self.app.notebook.tabs())
+        )
+        self.assertEqual([tab.deck_obj for tab in self.app.deck_tabs], self.app.decks)
+
+        self.app.delete_deck(first)
+        self.assertEqual(self.app.decks, [second, copy])
+        self.assertNotIn(tabs[0], self.app.deck_tabs)
+        self.assertEqual(self.app.aggregates.totals["off_wins"], 2)
+        self.assertEqual(len(self.app.notebook.tabs()), 2)
+
+    def test_deck_position_follows_reordering(self):
+        """Cached deck positions stay right across moves and deletes."""
+        first, second, third = (self.app.add_new_deck() for _ in range(3))
+        self.assertEqual(self.app.deck_position(third), 2)
+        self.assertEqual(self.app.deck_positions[id(third)], 2)
+
+        self.app.move_deck(third, 0)
+        self.assertEqual(
+            [self.app.deck_position(d) for d in (first, second, third)], [1, 2, 0]
+        )
+        self.app.delete_deck(first)
+        self.assertEqual(self.app.deck_position(second), 1)
+        with self.assertRaises(ValueError):
+            self.app.deck_position(first)
+
+    def test_matchup_report(self):
+        """Decks are ranked by their results against the chosen opponent."""
+        first, second = self.app.add_new_deck(), self.app.add_new_deck()
+        self.app.rename_deck(second, "Second")
+        warlord_name = first["factions"][0]["warlords"][0]["warlord_name"]
+        for deck, key, delta in (
+            (first, "off_wins", 1),
+            (first, "def_losses", 1),
+            (second, "def_wins", 2),
+        ):
+            deck["factions"][0]["warlords"][0][key] += delta
+            self.app.on_counter_changed(deck, "Ultramarines", warlord_name, key, delta)
+
+        self.assertEqual(
+            self.app.matchup_report("Ultramarines"),
+            "Decks against Ultramarines:\n"
+            "  1. Second - 100.0% (2W/0L); going first 0W/0L, going second 2W/0L\n"
+            "  2. New Deck - 50.0% (1W/1L); going first 1W/0L, going second 0W/1L",
+        )
+        self.assertEqual(
+            self.app.matchup_report("Tau Empire"), "No results against Tau Empire."
+        )
+        self.app.show_matchups().destroy()
+
+    def test_tabs_are_built_lazily(self):
+        """Test that only viewed tabs get a grid, up to MAX_BUILT_TABS of them."""
+        for _ in range(MAX_BUILT_TABS + 2):
+            self.app.add_new_deck()
+
+        built = [tab for tab in self.app.deck_tabs if tab.built]
+        self.assertEqual(built, [self.app.deck_tabs[0]])
+
+        for tab in self.app.deck_tabs:
+            self.app.show_deck_tab(tab)
+        built = [tab for tab in self.app.deck_tabs if tab.built]
+        self.assertEqual(built, self.app.deck_tabs[-MAX_BUILT_TABS:])
+
+    @patch("tkinter.messagebox.showwarning")
+    def test_reopening_reuses_tabs(self, mock_warning):
+        """Reopening a file reuses pooled tabs instead of piling up widgets."""
+
+        def count_widgets(widget):
+            return 1 + sum(count_widgets(w) for w in widget.winfo_children())
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filename = os.path.join(tmpdir, "decks.json")
+            decks = [
+                {"deck_name": f"Deck {i}", "factions": []}
+                for i in range(MAX_POOLED_TABS + 4)
+            ]
+            with open(filename, "w", encoding="utf-8") as f:
+                json.dump(decks, f)
+
+            self.app.load_data(filename)
+            first_tab = self.app.deck_tabs[0]
+            self.assertTrue(first_tab.built)
+            widgets = count_widgets(self.app.notebook)
+            for _ in range(3):
+                self.app.load_data(filename)
+                self.assertEqual(count_widgets(self.app.notebook), widgets)
+
+        # The built tab was reused for the first deck; the pool stays capped
+        self.assertIs(self.app.deck_tabs[0], first_tab)
+        self.assertIs(first_tab.deck_obj, self.app.decks[0])
+        self.assertEqual(
+            len(self.app.notebook.winfo_children()),
+            len(self.app.deck_tabs) + len(self.app.tab_pool),
+        )
+        self.app.decks = self.app.decks[:2]
+        self.app.build_tabs()
+        self.assertEqual(len(self.app.deck_tabs), 2)
+        self.assertEqual(len(self.app.tab_pool), MAX_POOLED_TABS)
+        self.assertEqual(len(self.app.notebook.winfo_children()), 2 + MAX_POOLED_TABS)
+
+    @patch("tkinter.messagebox.showwarning")
+    def test_background_load(self, mock_warning):
+        """Test that a background load adds every deck and records timings."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filename = os.path.join(tmpdir, "default_decks.json")
+            decks = [{"deck_name": f"Deck {i}", "factions": []} for i in range(60)]
+            decks.append({"deck_name": "Broken", "factions": "nope"})
+            with open(filename, "w", encoding="utf-8") as f:
+                json.dump(decks, f)
+
+            self.app.load_data_in_background(filename)
+            self.assertIsNotNone(self.app.load_status)
+            self.app.background_load.thread.join()
+            while self.app.background_load is not None:
+                self.app.poll_background_load()
+
+        self.assertEqual(len(self.app.decks), 60)
+        self.assertEqual(len(self.app.deck_tabs), 60)
+        self.assertEqual(self.app.current_file, filename)
+        self.assertIsNone(self.app.load_status)
+        self.assertIn("interactive", self.app.startup_timings)
+        mock_warning.assert_called_once()
+
+    @patch("tkinter.messagebox.showinfo")
+    def test_save_waits_for_background_load(self, mock_info):
+        """A save requested mid-load runs once every deck has arrived."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filename = os.path.join(tmpdir, "decks.json")
+            decks = [{"deck_name": f"Deck {i}", "factions": []} for i in range(60)]
+            with open(filename, "w", encoding="utf-8") as f:
+                json.dump(decks, f)
+
+            self.app.load_data_in_background(filename)
+            self.app.background_load.thread.join()
+            self.app.poll_background_load()
+            self.assertLess(len(self.app.decks), 60)
+
+            self.app.save_file(notify=False)
+            self.assertEqual(self.app.pending_save, (filename, False))
+            self.assertFalse(self.app.save_pipeline.busy)
+
+            while self.app.background_load is not None:
+                self.app.poll_background_load()
+            self.app.wait_for_save()
+            with open(filename, encoding="utf-8") as f:
+                saved = json.load(f)
+
+        self.assertEqual(len(saved), 60)
+        self.assertIsNone(self.app.pending_save)
+
 
 if __name__ == "__main__":
     unittest.main()
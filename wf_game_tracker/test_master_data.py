@@ -1,5 +1,10 @@
 import unittest
-from wf_game_tracker.master_data import MASTER_TABLE, deep_copy_master_table
+from wf_game_tracker.master_data import (
+    MASTER_TABLE,
+    compile_deck_template,
+    deep_copy_master_table,
+    new_deck,
+)
 
 
 class TestMasterData(unittest.TestCase):
@@ -17,6 +22,45 @@ class TestMasterData(unittest.TestCase):
         self.assertNotEqual(copy_table, MASTER_TABLE)
         self.assertEqual(MASTER_TABLE[0]["warlords"][0]["off_wins"], 0)
 
+    def test_copies_share_nothing(self):
+        """Test that two copies never share a faction, warlord or list object"""
+        first = deep_copy_master_table()
+        second = deep_copy_master_table()
+        first[1]["warlords"][2]["def_losses"] = 4
+        first[1]["warlords"].pop()
+
+        self.assertEqual(second, MASTER_TABLE)
+
+    def test_compile_deck_template(self):
+        """Test that a compiled template builds copies of the given table"""
+        table = [
+            {
+                "faction_name": "Squats",
+                "warlords": [
+                    {
+                        "warlord_name": "Kâhl",
+                        "off_wins": 0,
+                        "off_losses": 0,
+                        "def_wins": 0,
+                        "def_losses": 0,
+                    }
+                ],
+            }
+        ]
+        new_factions = compile_deck_template(table)
+        factions = new_factions()
+        self.assertEqual(factions, table)
+        factions[0]["warlords"][0]["off_wins"] = 1
+        self.assertEqual(table[0]["warlords"][0]["off_wins"], 0)
+        self.assertEqual(new_factions()[0]["warlords"][0]["off_wins"], 0)
+
+    def test_new_deck(self):
+        """Test that new_deck names the deck and copies MASTER_TABLE"""
+        deck = new_deck("League")
+        self.assertEqual(deck["deck_name"], "League")
+        self.assertEqual(deck["factions"], MASTER_TABLE)
+        self.assertEqual(new_deck()["deck_name"], "New Deck")
+
     def test_master_table_structure(self):
         """Test if MASTER_TABLE follows expected structure"""
         self.assertIsInstance(MASTER_TABLE, list)
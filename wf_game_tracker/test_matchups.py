@@ -0,0 +1,87 @@
+import os
+import tempfile
+import unittest
+from wf_game_tracker.archive import ArchiveDeck, DeckArchive, encode_archive
+from wf_game_tracker.master_data import new_deck
+from wf_game_tracker.matchups import MatchupMatrix
+
+
+class TestMatchupMatrix(unittest.TestCase):
+
+    def setUp(self):
+        """Two decks with results against two warlords, one of them shared."""
+        self.deck_a = new_deck("Deck A")
+        self.deck_b = new_deck("Deck B")
+        self.deck_a["factions"][0]["warlords"][0]["off_wins"] = 3
+        self.deck_a["factions"][0]["warlords"][1]["def_losses"] = 1
+        self.deck_b["factions"][0]["warlords"][0]["def_wins"] = 2
+        self.matrix = MatchupMatrix()
+        self.matrix.add_deck(self.deck_a)
+        self.matrix.add_deck(self.deck_b)
+
+    def test_only_played_matchups_are_stored(self):
+        """Cells exist for (deck, warlord) pairs with results only."""
+        self.assertEqual(self.matrix.cell_count(), 3)
+        self.assertEqual(list(self.matrix.factions), ["Ultramarines"])
+
+    def test_deck_vs_faction(self):
+        """Deck-vs-faction sums cover every warlord of the faction."""
+        stats = self.matrix.deck_vs_faction(self.deck_a, "Ultramarines")
+        self.assertEqual(
+            stats, {"off_wins": 3, "off_losses": 0, "def_wins": 0, "def_losses": 1}
+        )
+        self.assertEqual(
+            self.matrix.deck_vs_faction(self.deck_a, "Tau Empire")["off_wins"], 0
+        )
+
+    def test_apply_and_remove(self):
+        """Changes are applied incrementally; zeroed cells and decks disappear."""
+        warlord = self.deck_a["factions"][0]["warlords"][1]
+        warlord["def_losses"] -= 1
+        self.matrix.apply(
+            self.deck_a, "Ultramarines", warlord["warlord_name"], "def_losses", -1
+        )
+        self.assertEqual(self.matrix.cell_count(), 2)
+
+        self.matrix.remove_deck(self.deck_a)
+        name = (
+            "Ultramarines",
+            self.deck_a["factions"][0]["warlords"][0]["warlord_name"],
+        )
+        self.assertEqual(
+            self.matrix.results_against(*name),
+            [
+                (
+                    self.deck_b,
+                    {"off_wins": 0, "off_losses": 0, "def_wins": 2, "def_losses": 0},
+                )
+            ],
+        )
+        self.matrix.remove_deck(self.deck_b)
+        self.assertEqual(self.matrix.warlords, {})
+        self.assertEqual(self.matrix.factions, {})
+
+    def test_archive_decks_are_indexed_on_demand(self):
+        """Undecoded archive decks are only read when a query needs them."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filename = os.path.join(tmpdir, "decks.wfa")
+            with open(filename, "wb") as f:
+                f.write(encode_archive([self.deck_a, self.deck_b]))
+            archive = DeckArchive(filename)
+            try:
+                decks = [ArchiveDeck(archive, index) for index in range(len(archive))]
+                matrix = MatchupMatrix()
+                for deck in decks:
+                    matrix.add_deck(deck, lazy=True)
+                self.assertEqual(matrix.cell_count(), 0)
+                self.assertFalse(decks[0].decoded)
+
+                results = matrix.results_against("Ultramarines")
+                self.assertEqual(len(results), 2)
+                self.assertEqual(matrix.cell_count(), 3)
+            finally:
+                archive.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
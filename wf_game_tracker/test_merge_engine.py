@@ -0,0 +1,99 @@
+import unittest
+from wf_game_tracker.master_data import MASTER_TABLE
+from wf_game_tracker.merge_engine import (
+    add_to_summary,
+    merge_deck,
+    merge_decks,
+    summarize_diffs,
+)
+
+
+class TestMergeEngine(unittest.TestCase):
+
+    def setUp(self):
+        """Build a loaded deck with one known warlord plus orphaned entries."""
+        self.loaded_deck = {
+            "deck_name": "Test Deck",
+            "factions": [
+                {
+                    "faction_name": "Ultramarines",
+                    "warlords": [
+                        {
+                            "warlord_name": "Marneus Calgar",
+                            "off_wins": 2,
+                            "off_losses": 1,
+                            "def_wins": 1,
+                            "def_losses": 1,
+                        },
+                        {
+                            "warlord_name": "Retired Captain",
+                            "off_wins": 1,
+                            "off_losses": 0,
+                            "def_wins": 0,
+                            "def_losses": 0,
+                        },
+                    ],
+                },
+                {"faction_name": "Squats", "warlords": []},
+            ],
+        }
+
+    def test_merge_follows_master_table_order(self):
+        """Merged decks contain every MASTER_TABLE faction and warlord, in order."""
+        merged, _diff = merge_deck(self.loaded_deck)
+
+        self.assertEqual(
+            [f["faction_name"] for f in merged["factions"]],
+            [f["faction_name"] for f in MASTER_TABLE],
+        )
+        for merged_faction, master_faction in zip(merged["factions"], MASTER_TABLE):
+            self.assertEqual(
+                [w["warlord_name"] for w in merged_faction["warlords"]],
+                [w["warlord_name"] for w in master_faction["warlords"]],
+            )
+
+    def test_merge_keeps_loaded_stats(self):
+        """Existing warlord stats are retained."""
+        merged, _diff = merge_deck(self.loaded_deck)
+        self.assertEqual(merged["factions"][0]["warlords"][0]["off_wins"], 2)
+
+    def test_added_entries_do_not_alias_master_table(self):
+        """Added factions/warlords are fresh copies, never MASTER_TABLE itself."""
+        merged, _diff = merge_deck(self.loaded_deck)
+        merged["factions"][0]["warlords"][1]["off_wins"] += 1
+        merged["factions"][1]["warlords"][0]["def_wins"] += 1
+
+        self.assertEqual(MASTER_TABLE[0]["warlords"][1]["off_wins"], 0)
+        self.assertEqual(MASTER_TABLE[1]["warlords"][0]["def_wins"], 0)
+
+    def test_diff_reports_added_kept_orphaned(self):
+        """The diff lists added, kept and orphaned factions and warlords."""
+        _merged, diff = merge_deck(self.loaded_deck)
+
+        self.assertEqual(diff["deck_name"], "Test Deck")
+        self.assertEqual(diff["kept_factions"], ["Ultramarines"])
+        self.assertEqual(diff["orphaned_factions"], ["Squats"])
+        self.assertEqual(len(diff["added_factions"]), len(MASTER_TABLE) - 1)
+        self.assertEqual(diff["kept_warlords"], [("Ultramarines", "Marneus Calgar")])
+        self.assertIn(("Ultramarines", "Retired Captain"), diff["orphaned_warlords"])
+        self.assertIn(("Ultramarines", "Uriel Ventris"), diff["added_warlords"])
+
+    def test_merge_decks_and_summary(self):
+        """merge_decks returns one diff per deck and summarize_diffs counts them."""
+        merged, diffs = merge_decks([self.loaded_deck, {"deck_name": "Empty"}])
+
+        self.assertEqual(len(merged), 2)
+        self.assertEqual(len(diffs), 2)
+        summary = summarize_diffs(diffs)
+        self.assertEqual(summary["kept_factions"], 1)
+        self.assertEqual(summary["orphaned_factions"], 1)
+        self.assertEqual(summary["added_factions"], 2 * len(MASTER_TABLE) - 1)
+
+        running = {}
+        for diff in diffs:
+            add_to_summary(running, diff)
+        self.assertEqual(running, summary)
+
+
+if __name__ == "__main__":
+    unittest.main()
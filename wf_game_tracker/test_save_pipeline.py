@@ -0,0 +1,48 @@
+import unittest
+from wf_game_tracker.master_data import new_deck
+from wf_game_tracker.save_pipeline import SnapshotCache
+
+
+class TestSnapshotCache(unittest.TestCase):
+
+    def setUp(self):
+        """Two fresh decks and an empty cache."""
+        self.decks = [new_deck("A"), new_deck("B")]
+        self.cache = SnapshotCache()
+
+    def test_clean_decks_reuse_their_copy(self):
+        """Only decks marked dirty are copied again."""
+        first = self.cache.snapshot(self.decks)
+        self.decks[1]["factions"][0]["warlords"][0]["off_wins"] = 4
+        self.cache.mark_dirty(self.decks[1])
+        second = self.cache.snapshot(self.decks)
+
+        self.assertIs(second[0], first[0])
+        self.assertIsNot(second[1], first[1])
+        self.assertEqual(first[1]["factions"][0]["warlords"][0]["off_wins"], 0)
+        self.assertEqual(second[1]["factions"][0]["warlords"][0]["off_wins"], 4)
+
+    def test_snapshot_follows_the_deck_list(self):
+        """New decks are copied and removed decks are dropped from the cache."""
+        self.cache.snapshot(self.decks)
+        self.decks.pop(0)
+        self.decks.append(new_deck("C"))
+        snapshot = self.cache.snapshot(self.decks)
+        self.assertEqual([deck["deck_name"] for deck in snapshot], ["B", "C"])
+        self.assertEqual(len(self.cache.copies), 2)
+
+    def test_fragments_follow_the_snapshot(self):
+        """Clean decks keep their encoded JSON; dirty decks are encoded again."""
+        first = self.cache.snapshot(self.decks)
+        encoded = [self.cache.fragments.encode(deck) for deck in first]
+        self.decks[0]["deck_name"] = "Renamed"
+        self.cache.mark_dirty(self.decks[0])
+        second = self.cache.snapshot(self.decks)
+
+        self.assertEqual(list(self.cache.fragments.entries), [id(first[1])])
+        self.assertIs(self.cache.fragments.encode(second[1]), encoded[1])
+        self.assertIn('"Renamed"', self.cache.fragments.encode(second[0]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+import unittest
+from unittest.mock import MagicMock
+import tkinter as tk
+from wf_game_tracker.stats_grid import ROW_HEIGHT, StatsGrid
+
+
+class TestStatsGrid(unittest.TestCase):
+
+    def setUp(self):
+        """A 1000-row, 3-column grid whose cells show their coordinates."""
+        self.root = tk.Tk()
+        self.values = {}
+        self.on_click = MagicMock()
+        self.grid = StatsGrid(
+            self.root, [100, 50, 50], 1000, self.row_cells, on_click=self.on_click
+        )
+
+    def tearDown(self):
+        """Destroy the Tkinter root after each test."""
+        self.root.destroy()
+
+    def row_cells(self, row):
+        return [
+            (self.values.get((row, col), f"{row},{col}"), "#fff", "black")
+            for col in range(3)
+        ]
+
+    def test_only_visible_rows_are_drawn(self):
+        """Rows outside the viewport have no canvas items."""
+        drawn = self.grid.drawn_rows
+        self.assertIn(0, drawn)
+        self.assertLess(len(drawn), 100)
+        self.assertNotIn(999, drawn)
+        self.assertEqual(len(self.grid.canvas.find_all()), 2 * 3 * len(drawn))
+
+    def test_cell_at(self):
+        """Coordinates map to (row, col); outside the grid gives None."""
+        self.assertEqual(self.grid.cell_at(10, 5), (0, 0))
+        self.assertEqual(self.grid.cell_at(120, 3 * ROW_HEIGHT + 1), (3, 1))
+        self.assertEqual(self.grid.cell_at(199, 0), (0, 2))
+        self.assertIsNone(self.grid.cell_at(200, 0))
+        self.assertIsNone(self.grid.cell_at(0, 1000 * ROW_HEIGHT))
+
+    def test_click_is_hit_tested(self):
+        """Left/right clicks report the cell under the pointer."""
+        event = MagicMock(x=160, y=2 * ROW_HEIGHT + 3)
+        self.grid._click(event, 1)
+        self.grid._click(event, -1)
+        self.on_click.assert_any_call(2, 2, 1)
+        self.on_click.assert_called_with(2, 2, -1)
+
+    def test_refresh_row(self):
+        """refresh_row redraws the texts of a visible row in place."""
+        self.values[(1, 2)] = "changed"
+        self.grid.refresh_row(1)
+        _rect_id, text_id = self.grid.drawn_rows[1][2]
+        self.assertEqual(self.grid.canvas.itemcget(text_id, "text"), "changed")
+
+        # Rows out of view are simply drawn with current data later
+        self.grid.refresh_row(999)
+        self.assertNotIn(999, self.grid.drawn_rows)
+
+
+if __name__ == "__main__":
+    unittest.main()
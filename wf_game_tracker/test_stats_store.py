@@ -0,0 +1,96 @@
+import json
+import unittest
+from wf_game_tracker.master_data import MASTER_TABLE, deep_copy_master_table
+from wf_game_tracker.stats_store import StatsStore, warlord_ordinals
+
+
+class TestStatsStore(unittest.TestCase):
+
+    def setUp(self):
+        """Two decks with a few counters set, in the nested dict shape."""
+        self.decks = []
+        for i in range(2):
+            factions = deep_copy_master_table()
+            factions[0]["warlords"][0]["off_wins"] = i + 1
+            factions[1]["warlords"][1]["def_losses"] = 2
+            self.decks.append({"deck_name": f"Deck {i}", "factions": factions})
+        self.store = StatsStore.from_decks(self.decks)
+
+    def test_ordinals_follow_master_table(self):
+        """Ordinals number every warlord of MASTER_TABLE in order."""
+        ordinals = warlord_ordinals()
+        self.assertEqual(len(ordinals), sum(len(f["warlords"]) for f in MASTER_TABLE))
+        self.assertEqual(ordinals[("Ultramarines", "Marneus Calgar")], 0)
+
+    def test_round_trip_to_dicts(self):
+        """Decks convert back to exactly the same nested dicts."""
+        self.assertEqual(self.store.to_decks(), self.decks)
+        json.dumps(self.store.to_decks())
+
+    def test_new_deck_is_zeroed(self):
+        """add_deck appends a deck with all counters at zero."""
+        index = self.store.add_deck("Fresh")
+        self.assertEqual(
+            self.store.deck_dict(index),
+            {"deck_name": "Fresh", "factions": deep_copy_master_table()},
+        )
+
+    def test_views_write_through(self):
+        """Changing a WarlordView updates the underlying arrays."""
+        view = self.store.deck_view(1)
+        warlord = view["factions"][0]["warlords"][0]
+        warlord["off_wins"] += 3
+
+        self.assertEqual(warlord["warlord_name"], "Marneus Calgar")
+        self.assertEqual(self.store.get(1, 0, "off_wins"), 5)
+        self.assertEqual(
+            self.store.deck_dict(0)["factions"][0]["warlords"][0],
+            {
+                "warlord_name": "Marneus Calgar",
+                "off_wins": 1,
+                "off_losses": 0,
+                "def_wins": 0,
+                "def_losses": 0,
+            },
+        )
+        with self.assertRaises(KeyError):
+            warlord["warlord_name"] = "Someone else"
+
+    def test_aggregates(self):
+        """Totals per deck, faction, warlord and overall are array sums."""
+        self.assertEqual(
+            self.store.totals(),
+            {"off_wins": 3, "off_losses": 0, "def_wins": 0, "def_losses": 4},
+        )
+        self.assertEqual(self.store.deck_totals(1)["off_wins"], 2)
+        self.assertEqual(self.store.faction_totals("Ultramarines")["off_wins"], 3)
+        self.assertEqual(
+            self.store.faction_totals("Orks (Goff Klan)", deck_index=0)["def_losses"], 2
+        )
+        self.assertEqual(self.store.warlord_totals(0)["off_wins"], 3)
+
+    def test_unknown_warlords_are_ignored(self):
+        """Warlords missing from the MASTER_TABLE are not stored."""
+        deck = {
+            "deck_name": "Odd",
+            "factions": [
+                {
+                    "faction_name": "Squats",
+                    "warlords": [
+                        {
+                            "warlord_name": "Nobody",
+                            "off_wins": 9,
+                            "off_losses": 0,
+                            "def_wins": 0,
+                            "def_losses": 0,
+                        }
+                    ],
+                }
+            ],
+        }
+        index = self.store.add_deck_dict(deck)
+        self.assertEqual(self.store.deck_totals(index)["off_wins"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,170 @@
+import json
+import os
+import tempfile
+import unittest
+from wf_game_tracker.master_data import deep_copy_master_table
+from wf_game_tracker.storage import (
+    BinaryStorage,
+    FragmentCache,
+    JsonStorage,
+    SqliteStorage,
+    atomic_write_text,
+    storage_for,
+)
+
+
+def _load(storage, filename):
+    return [deck for _i, deck, _diff, _error in storage.iter_merged_decks(filename)]
+
+
+class TestStorage(unittest.TestCase):
+
+    def setUp(self):
+        """Create two decks with a few non-zero counters in a temporary folder."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.decks = []
+        for i in range(2):
+            factions = deep_copy_master_table()
+            factions[0]["warlords"][0]["off_wins"] = i + 1
+            factions[1]["warlords"][2]["def_losses"] = 3
+            self.decks.append({"deck_name": f"Deck {i}", "factions": factions})
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def path(self, name):
+        return os.path.join(self.tmpdir.name, name)
+
+    def test_storage_for_extension(self):
+        """SQLite extensions pick the SQLite backend, anything else JSON."""
+        self.assertIsInstance(storage_for("decks.json"), JsonStorage)
+        self.assertIsInstance(storage_for("decks.DB"), SqliteStorage)
+        self.assertIsInstance(storage_for("decks.sqlite3"), SqliteStorage)
+        self.assertIsInstance(storage_for("decks.WFD"), BinaryStorage)
+
+    def test_binary_round_trip(self):
+        """Binary storage writes and reads back the same merged decks."""
+        storage = BinaryStorage()
+        storage.write(self.path("decks.wfd"), self.decks)
+        self.assertEqual(_load(storage, self.path("decks.wfd")), self.decks)
+
+    def test_json_round_trip(self):
+        """JSON storage writes and streams back the same decks."""
+        storage = JsonStorage()
+        storage.write(self.path("decks.json"), self.decks)
+        self.assertEqual(_load(storage, self.path("decks.json")), self.decks)
+
+    def test_json_fragments_match_json_dump(self):
+        """Stitched deck fragments give the same file as json.dump(indent=2)."""
+        filename = self.path("decks.json")
+        for decks in ([], self.decks):
+            JsonStorage(FragmentCache()).write(filename, decks)
+            with open(filename, encoding="utf-8") as f:
+                self.assertEqual(f.read(), json.dumps(decks, indent=2))
+
+    def test_fragment_cache_reuses_encoded_decks(self):
+        """Decks are encoded once; retain drops the fragments of other decks."""
+        fragments = FragmentCache()
+        first = fragments.encode(self.decks[0])
+        self.assertIs(fragments.encode(self.decks[0]), first)
+        fragments.encode(self.decks[1])
+        fragments.retain(self.decks[1:])
+        self.assertEqual(list(fragments.entries), [id(self.decks[1])])
+
+    def test_atomic_write_keeps_old_file_on_failure(self):
+        """A write that fails halfway leaves the previous file and no temp file."""
+        filename = self.path("decks.json")
+        JsonStorage().write(filename, self.decks)
+
+        def fail(f):
+            f.write("[{")
+            raise OSError("disk full")
+
+        with self.assertRaises(OSError):
+            atomic_write_text(filename, fail)
+        self.assertEqual(_load(JsonStorage(), filename), self.decks)
+        self.assertEqual(os.listdir(self.tmpdir.name), ["decks.json"])
+
+    def test_sqlite_round_trip(self):
+        """SQLite storage writes and reads back the same decks, in order."""
+        storage = SqliteStorage()
+        storage.write(self.path("decks.db"), self.decks)
+        self.assertEqual(_load(SqliteStorage(), self.path("decks.db")), self.decks)
+
+        # Writing again replaces the previous contents
+        storage.write(self.path("decks.db"), self.decks[:1])
+        self.assertEqual(_load(SqliteStorage(), self.path("decks.db")), self.decks[:1])
+
+    def test_sqlite_missing_file(self):
+        """Loading a database that does not exist fails instead of creating it."""
+        with self.assertRaises(FileNotFoundError):
+            _load(SqliteStorage(), self.path("missing.db"))
+        self.assertFalse(os.path.exists(self.path("missing.db")))
+
+    def test_sqlite_live_updates(self):
+        """Once attached, counter changes, renames and new decks are persisted."""
+        filename = self.path("decks.db")
+        storage = SqliteStorage()
+        storage.write(filename, self.decks)
+        storage.attach(filename)
+
+        storage.record_counter(1, "Ultramarines", "Marneus Calgar", "off_wins", 5)
+        storage.record_rename(0, "Renamed")
+        new_deck = {"deck_name": "New Deck", "factions": deep_copy_master_table()}
+        storage.record_new_deck(2, new_deck)
+        storage.close()
+
+        decks = _load(SqliteStorage(), filename)
+        self.assertEqual(len(decks), 3)
+        self.assertEqual(decks[0]["deck_name"], "Renamed")
+        self.assertEqual(decks[1]["factions"][0]["warlords"][0]["off_wins"], 7)
+        self.assertEqual(decks[2], new_deck)
+
+    def test_sqlite_structural_updates(self):
+        """Inserted, deleted and moved decks keep the stored deck order."""
+        filename = self.path("decks.db")
+        storage = SqliteStorage()
+        storage.write(filename, self.decks)
+        storage.attach(filename)
+
+        decks = list(self.decks)
+        for position, name in ((0, "First"), (2, "Middle"), (4, "Last")):
+            deck = {"deck_name": name, "factions": deep_copy_master_table()}
+            decks.insert(position, deck)
+            storage.record_new_deck(position, deck)
+        storage.record_delete_deck(1)
+        del decks[1]
+        for old, new in ((0, 3), (3, 1), (2, 2)):
+            decks.insert(new, decks.pop(old))
+            storage.record_move_deck(old, new)
+        storage.record_counter(0, "Ultramarines", "Marneus Calgar", "off_wins", 1)
+        decks[0]["factions"][0]["warlords"][0]["off_wins"] += 1
+        storage.close()
+
+        self.assertEqual(_load(SqliteStorage(), filename), decks)
+
+    def test_sqlite_aggregates(self):
+        """Cross-deck aggregates are answered by SQL queries."""
+        filename = self.path("decks.db")
+        storage = SqliteStorage()
+        storage.write(filename, self.decks)
+        storage.attach(filename)
+
+        self.assertEqual(
+            storage.totals(),
+            {"off_wins": 3, "off_losses": 0, "def_wins": 0, "def_losses": 6},
+        )
+        self.assertEqual(
+            [(name, stats["off_wins"]) for name, stats in storage.deck_totals()],
+            [("Deck 0", 1), ("Deck 1", 2)],
+        )
+        factions = dict(storage.faction_totals())
+        self.assertEqual(factions["Ultramarines"]["off_wins"], 3)
+        self.assertEqual(factions["Orks (Goff Klan)"]["def_losses"], 6)
+        warlords = {(f, w): stats for f, w, stats in storage.warlord_totals()}
+        self.assertEqual(warlords[("Ultramarines", "Marneus Calgar")]["off_wins"], 3)
+        storage.close()
+
+
+if __name__ == "__main__":
+    unittest.main()